@@ -0,0 +1,375 @@
+"""
+Mjerenje performansi python_api ruta i internih dijelova DuneClienta
+
+Rute se mjere preko HTTP-a (uvicorn) prema lokalnoj zamjeni za Dune API
+(mock_dune_server.py), s hladnom (prazna priručna memorija i evidencija) i
+toplom priručnom memorijom. Lokalni indeksi blokova i transakcija se ne
+prazne, pa su rute koje ih koriste označene s "index_warm". Mikro-mjerenja pokrivaju execute_query, parsere
+redaka i izradu Pydantic modela.
+
+Pokretanje:
+
+    python benchmark.py --output benchmark-results.json
+    python benchmark.py --baseline benchmark-results.json --output novo.json
+
+Rezultati se spremaju kao JSON; s --baseline se ispisuje omjer prema
+prethodnom mjerenju (p50, p99 i propusnost).
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+import httpx
+
+from dune_queries import BITCOIN_PRICE_QUERY_ID, BITCOIN_STATUS_QUERY_ID
+from mock_dune_server import MockDuneServer, load_config, run_in_background, serve_in_background
+
+PERCENTILES = (50, 90, 95, 99)
+
+# Zadani profil zamjenskog servera: brzo izvršavanje da dominira ponašanje klijenta
+DEFAULT_MOCK_PROFILE = {"execution_time": 0.05}
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Percentil (nearest-rank) iz sortiranih vrijednosti"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(latencies: List[float], errors: int = 0, elapsed: Optional[float] = None) -> Dict[str, Any]:
+    """Statistika latencija (u milisekundama) i propusnost (zahtjeva u sekundi)"""
+    values = sorted(latencies)
+    summary = {
+        "count": len(values),
+        "errors": errors,
+        "mean_ms": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        "max_ms": round(values[-1] * 1000, 3) if values else 0.0,
+    }
+    for p in PERCENTILES:
+        summary[f"p{p}_ms"] = round(percentile(values, p) * 1000, 3)
+    if elapsed:
+        summary["throughput_rps"] = round(len(values) / elapsed, 2)
+    return summary
+
+
+@contextlib.contextmanager
+def quiet():
+    """Isključuje ispis DuneClienta tijekom mjerenja"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+# Rute
+
+# Rute koje se poslužuju iz lokalnih indeksa blokova i transakcija: indeksi se ne
+# prazne između hladnih zahtjeva (ponovna izgradnja traje minutama), pa je za
+# njih "hladno" samo bez priručne memorije, s toplim indeksom
+INDEX_BACKED_ROUTES = {
+    "bitcoin_address_transactions", "bitcoin_transaction", "bitcoin_blocks", "bitcoin_block", "bitcoin_address", "batch",
+}
+# Najdulje čekanje da indeksi dosegnu vrh lanca prije mjerenja (sekunde)
+INDEX_SYNC_TIMEOUT = 300
+
+
+def route_cases(synthetic) -> List[Tuple[str, str, str, Optional[Dict[str, Any]]]]:
+    """(ime, metoda, putanja, tijelo) za svaku rutu u main.py"""
+    transaction = synthetic.transactions(limit=1)[0]
+    address = transaction["sender"]
+    eth_address = "0x742d35Cc6634C0532925a3b844Bc454e4438f44e"
+    return [
+        ("root", "GET", "/", None),
+        ("token_balances", "GET", f"/api/token-balances/{eth_address}", None),
+        ("transactions", "GET", f"/api/transactions/{eth_address}", None),
+        ("ethereum_status", "GET", "/api/ethereum-status", None),
+        ("bitcoin_status", "GET", "/api/bitcoin/status", None),
+        ("bitcoin_transactions", "GET", "/api/bitcoin/transactions?limit=10", None),
+        ("bitcoin_address_transactions", "GET", f"/api/bitcoin/transactions/{address}?limit=10", None),
+        ("bitcoin_address_stream", "GET", f"/api/bitcoin/transactions/{address}/stream?limit=1000", None),
+        ("dune_query_results", "GET", f"/api/dune/query/{BITCOIN_STATUS_QUERY_ID}/results", None),
+        ("bitcoin_transaction", "GET", f"/api/bitcoin/transaction/{transaction['txid']}", None),
+        ("bitcoin_blocks", "GET", "/api/bitcoin/blocks?limit=5", None),
+        ("bitcoin_block", "GET", f"/api/bitcoin/block/{synthetic.tip_height - 10}", None),
+        ("bitcoin_address", "GET", f"/api/bitcoin/address/{address}", None),
+        ("bitcoin_price_history", "GET", "/api/bitcoin/price-history?days=7", None),
+        ("batch", "POST", "/api/batch", {"requests": [
+            {"id": "btc", "type": "bitcoin_status"},
+            {"id": "eth", "type": "ethereum_status"},
+            {"id": "blocks", "type": "bitcoin_blocks", "params": {"limit": 5}},
+            {"id": "tx", "type": "bitcoin_transaction", "params": {"txid": transaction["txid"]}},
+        ]}),
+    ]
+
+
+async def _timed_request(client: httpx.AsyncClient, method: str, path: str, body: Optional[Dict[str, Any]]) -> Tuple[float, bool]:
+    start = time.perf_counter()
+    response = await client.request(method, path, json=body)
+    await response.aread()
+    return time.perf_counter() - start, response.status_code < 400
+
+
+async def measure_route(
+    client: httpx.AsyncClient,
+    case: Tuple[str, str, str, Optional[Dict[str, Any]]],
+    reset_cache: Callable[[], None],
+    cold_requests: int,
+    warm_requests: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    _, method, path, body = case
+
+    # Hladno: svaki zahtjev počinje s praznom priručnom memorijom (jedan po jedan)
+    cold, cold_errors = [], 0
+    for _ in range(cold_requests):
+        reset_cache()
+        latency, ok = await _timed_request(client, method, path, body)
+        cold.append(latency)
+        cold_errors += not ok
+
+    # Toplo: priručna memorija je napunjena, zahtjevi idu istovremeno
+    await _timed_request(client, method, path, body)
+    semaphore = asyncio.Semaphore(concurrency)
+    warm, warm_errors = [], 0
+
+    async def one():
+        nonlocal warm_errors
+        async with semaphore:
+            latency, ok = await _timed_request(client, method, path, body)
+        warm.append(latency)
+        warm_errors += not ok
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(warm_requests)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "cold": summarize(cold, cold_errors),
+        "warm": summarize(warm, warm_errors, elapsed),
+    }
+
+
+def run_route_benchmarks(args: argparse.Namespace, mock: MockDuneServer) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as data_dir, run_in_background(mock) as dune_url:
+        # main.py čita postavke pri importu pa ih postavljamo prije
+        os.environ.update({
+            "DUNE_API_BASE_URL": dune_url,
+            "PYTHON_API_DATA_DIR": data_dir,
+            "DUNE_BACKGROUND_REFRESH": "0",
+            "SYNTHETIC_LIVE": "0",
+            # Hladna mjerenja pokreću mnogo izvršavanja; limiter ne smije mjeriti sam sebe
+            "DUNE_EXECUTIONS_PER_MINUTE": os.getenv("DUNE_EXECUTIONS_PER_MINUTE", "1000000"),
+            "DUNE_EXECUTION_BURST": os.getenv("DUNE_EXECUTION_BURST", "1000000"),
+        })
+        import main
+
+        with serve_in_background(main.app, lifespan="on") as api_url:
+            state = main.app.state
+
+            def reset_cache():
+                state.result_cache.clear()
+                main.response_cache.clear()
+                state.last_good_parts.clear()
+                if state.execution_ledger is not None:
+                    state.execution_ledger.prune(older_than=0)
+
+            def wait_for_indexes():
+                tip = state.dune_client.synthetic.tip_height
+                deadline = time.time() + INDEX_SYNC_TIMEOUT
+                for index in (state.block_index, state.tx_index):
+                    while index is not None and (index.tip_height or -1) < tip and time.time() < deadline:
+                        time.sleep(0.05)
+
+            async def run():
+                limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+                async with httpx.AsyncClient(base_url=api_url, timeout=120, limits=limits) as client:
+                    wait_for_indexes()
+                    results = {}
+                    for case in route_cases(state.dune_client.synthetic):
+                        if args.routes and case[0] not in args.routes:
+                            continue
+                        with quiet():
+                            results[case[0]] = await measure_route(
+                                client, case, reset_cache, args.cold_requests, args.requests, args.concurrency
+                            )
+                        results[case[0]]["index_warm"] = case[0] in INDEX_BACKED_ROUTES and state.block_index is not None
+                        warm = results[case[0]]["warm"]
+                        print(f"{case[0]:32} hladno p50 {results[case[0]]['cold']['p50_ms']:9.2f} ms   "
+                              f"toplo p50 {warm['p50_ms']:8.2f} ms  p99 {warm['p99_ms']:8.2f} ms  {warm.get('throughput_rps', 0):8.1f} req/s"
+                              f"{'  (indeks topao)' if results[case[0]]['index_warm'] else ''}")
+                    return results
+
+            return asyncio.run(run())
+
+
+# Mikro-mjerenja
+
+def bench(fn: Callable[[], Any], iterations: int) -> Dict[str, Any]:
+    """Vrijeme jednog poziva (mikrosekunde)"""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {
+        "iterations": iterations,
+        "mean_us": round(sum(timings) / iterations * 1e6, 3),
+        "p50_us": round(percentile(timings, 50) * 1e6, 3),
+        "p99_us": round(percentile(timings, 99) * 1e6, 3),
+    }
+
+
+def run_micro_benchmarks(args: argparse.Namespace, mock: MockDuneServer) -> Dict[str, Any]:
+    from dune_cache import ResultCache
+    from dune_client import DuneClient, _DuneClientBase
+    from dune_results import to_columnar
+    from synthetic_data import SyntheticChain
+    from json_response import dumps, validate
+    from bloom_filter import BloomFilter
+    import main
+
+    iterations = args.iterations
+    results = {}
+    synthetic = SyntheticChain(seed=args.seed)
+
+    with run_in_background(mock) as dune_url, quiet():
+        cache = ResultCache()
+        client = DuneClient("benchmark", base_url=dune_url, cache=cache, executions_per_minute=1e6, execution_burst=10 ** 6)
+        try:
+            # Hladno: izvršavanje, provjere statusa i dohvat rezultata prema zamjenskom serveru
+            def cold():
+                cache.clear()
+                client.execute_query(BITCOIN_STATUS_QUERY_ID)
+
+            results["execute_query_cold"] = bench(cold, max(1, args.cold_requests))
+            results["execute_query_warm"] = bench(lambda: client.execute_query(BITCOIN_STATUS_QUERY_ID), iterations)
+            status_result = client.execute_query(BITCOIN_STATUS_QUERY_ID)
+            price_result = client.execute_query(BITCOIN_PRICE_QUERY_ID)
+        finally:
+            client.close()
+
+        results["parse_bitcoin_status"] = bench(lambda: _DuneClientBase._parse_bitcoin_status(status_result), iterations)
+        results["parse_bitcoin_price"] = bench(lambda: _DuneClientBase._parse_bitcoin_price(price_result), iterations)
+
+        raw_rows = {"result": {"rows": synthetic.transactions(limit=1000)}}
+        results["to_columnar_1000_rows"] = bench(lambda: to_columnar(raw_rows), max(1, iterations // 100))
+
+    transactions = synthetic.transactions(limit=100)
+    blocks = synthetic.blocks(10)
+    status = {"price": 67890.0, "last_block": 840000, "fee_rate": 25.0, "transactions_count": 350000,
+              "difficulty": 78.3e12, "hashrate": 650.2e18}
+    results["model_bitcoin_transaction_x100"] = bench(
+        lambda: [main.BitcoinTransaction(**tx) for tx in transactions], max(1, iterations // 10)
+    )
+    results["model_bitcoin_block_x10"] = bench(lambda: [main.BitcoinBlock(**b) for b in blocks], iterations)
+    results["model_bitcoin_status"] = bench(lambda: main.BitcoinStatus(**status), iterations)
+    # Validacija (jednom) i kodiranje velike liste kao u rutama
+    transactions_1000 = synthetic.transactions(limit=1000)
+    results["encode_bitcoin_transactions_1000"] = bench(
+        lambda: dumps(validate(List[main.BitcoinTransaction], transactions_1000)), max(1, iterations // 100)
+    )
+    # Nepoznati txid odbija Bloom filtar (put odgovora 404)
+    txid_filter = BloomFilter(len(transactions_1000))
+    txid_filter.update(tx["txid"] for tx in transactions_1000)
+    results["txid_filter_miss"] = bench(lambda: "0" * 64 in txid_filter, iterations)
+    results["synthetic_transactions_1000"] = bench(
+        lambda: SyntheticChain(seed=args.seed, live=False).transactions(limit=1000), max(1, iterations // 100)
+    )
+
+    for name, stats in results.items():
+        print(f"{name:32} mean {stats['mean_us']:12.2f} us   p99 {stats['p99_us']:12.2f} us")
+    return results
+
+
+# Usporedba s prethodnim mjerenjem
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> None:
+    print("\nUsporedba s prethodnim mjerenjem (novo / staro):")
+    for name, phases in current.get("routes", {}).items():
+        old = baseline.get("routes", {}).get(name)
+        if not old:
+            continue
+        for phase in ("cold", "warm"):
+            for metric in ("p50_ms", "p99_ms", "throughput_rps"):
+                new_value, old_value = phases[phase].get(metric), old[phase].get(metric)
+                if new_value is not None and old_value:
+                    print(f"  {name}.{phase}.{metric}: {new_value / old_value:.2f}x")
+    for name, stats in current.get("micro", {}).items():
+        old = baseline.get("micro", {}).get(name)
+        if old and old.get("mean_us"):
+            print(f"  {name}.mean_us: {stats['mean_us'] / old['mean_us']:.2f}x")
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description="Mjerenje performansi python_api")
+    parser.add_argument("--output", default="benchmark-results.json", help="JSON datoteka s rezultatima")
+    parser.add_argument("--baseline", help="Prethodni rezultati za usporedbu")
+    parser.add_argument("--requests", type=int, default=200, help="Broj toplih zahtjeva po ruti")
+    parser.add_argument("--cold-requests", type=int, default=5, help="Broj hladnih zahtjeva po ruti")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=2000, help="Broj ponavljanja mikro-mjerenja")
+    parser.add_argument("--routes", nargs="*", help="Mjeri samo navedene rute (imena iz route_cases)")
+    parser.add_argument("--skip-routes", action="store_true")
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--profiles", help="Profili zamjenskog Dune servera (JSON datoteka ili tekst)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = {"default": dict(DEFAULT_MOCK_PROFILE)}
+    config.update(load_config(args.profiles))
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "git_revision": git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "settings": {
+                "requests": args.requests,
+                "cold_requests": args.cold_requests,
+                "concurrency": args.concurrency,
+                "iterations": args.iterations,
+                "seed": args.seed,
+                "mock_profiles": config,
+            },
+        },
+    }
+
+    if not args.skip_routes:
+        mock = MockDuneServer.from_config(config, seed=args.seed)
+        report["routes"] = run_route_benchmarks(args, mock)
+        report["mock_stats"] = mock.stats
+    if not args.skip_micro:
+        report["micro"] = run_micro_benchmarks(args, MockDuneServer.from_config(config, seed=args.seed))
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nRezultati spremljeni u {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main_cli()
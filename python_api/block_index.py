@@ -0,0 +1,286 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Any, List, Optional
+
+from json_response import dumps, loads
+
+# Koliko blokova ispod vrha se indeksira pri prvoj sinkronizaciji (jedno razdoblje težine)
+DEFAULT_INITIAL_DEPTH = 2016
+# Broj blokova po dohvatu i po transakciji pri sinkronizaciji
+DEFAULT_SYNC_BATCH = 500
+# Koliko duboko se traži zajednički blok nakon reorganizacije lanca
+MAX_REORG_DEPTH = 100
+
+BlockFetcher = Callable[[int, Optional[int]], Awaitable[List[Dict[str, Any]]]]
+
+
+class BlockIndex:
+    """
+    Lokalni indeks Bitcoin blokova (SQLite)
+
+    Svaki blok se sprema kao već validiran JSON pa se liste blokova i
+    pretraga po visini ili hashu poslužuju s diska bez ponovnog kodiranja.
+    Indeks se puni postupno, od zadnjeg indeksiranog bloka prema vrhu lanca
+    (vidi sync).
+    """
+
+    def __init__(self, path: str, initial_depth: int = DEFAULT_INITIAL_DEPTH, batch_size: int = DEFAULT_SYNC_BATCH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.initial_depth = initial_depth
+        self.batch_size = batch_size
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS blocks (
+                height INTEGER PRIMARY KEY,
+                hash TEXT NOT NULL UNIQUE,
+                timestamp INTEGER NOT NULL,
+                data BLOB NOT NULL
+            )
+            """
+        )
+        self._tip: Optional[int] = self._query_tip()
+        self.last_sync: Optional[float] = None
+        self.synced_blocks = 0
+        self.reorgs = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _query_tip(self) -> Optional[int]:
+        with self._lock:
+            return self._conn.execute("SELECT MAX(height) FROM blocks").fetchone()[0]
+
+    @property
+    def tip_height(self) -> Optional[int]:
+        """Najviši indeksirani blok (None ako je indeks prazan)"""
+        return self._tip
+
+    def add_blocks(self, blocks: List[Dict[str, Any]]) -> int:
+        """Sprema blokove u jednoj transakciji (postojeća visina se zamjenjuje)"""
+        if not blocks:
+            return 0
+        rows = [(block["height"], block["hash"], block["timestamp"], dumps(block)) for block in blocks]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                # Blok s istim hashem na drugoj visini (nakon reorganizacije) se uklanja
+                self._conn.executemany("DELETE FROM blocks WHERE hash = ? AND height != ?", [(r[1], r[0]) for r in rows])
+                self._conn.executemany("INSERT OR REPLACE INTO blocks VALUES (?, ?, ?, ?)", rows)
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+        top = max(row[0] for row in rows)
+        self._tip = top if self._tip is None else max(self._tip, top)
+        return len(rows)
+
+    def remove_above(self, height: int) -> int:
+        """Briše blokove iznad zadane visine (reorganizacija lanca)"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM blocks WHERE height > ?", (height,))
+        self._tip = self._query_tip()
+        return cursor.rowcount
+
+    # Čitanje
+
+    def latest_raw(self, limit: int = 5, before: Optional[int] = None) -> List[bytes]:
+        """Kodirani blokovi od vrha (ili ispod visine before) prema nižim visinama"""
+        with self._lock:
+            if before is None:
+                rows = self._conn.execute("SELECT data FROM blocks ORDER BY height DESC LIMIT ?", (limit,)).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT data FROM blocks WHERE height < ? ORDER BY height DESC LIMIT ?", (before, limit)
+                ).fetchall()
+        return [row[0] for row in rows]
+
+    def latest_json(self, limit: int = 5, before: Optional[int] = None) -> bytes:
+        """Kodirani JSON niz blokova, bez dekodiranja pojedinih blokova"""
+        return b"[" + b",".join(self.latest_raw(limit, before)) + b"]"
+
+    def latest(self, limit: int = 5, before: Optional[int] = None) -> List[Dict[str, Any]]:
+        return [loads(data) for data in self.latest_raw(limit, before)]
+
+    def by_height_raw(self, height: int) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM blocks WHERE height = ?", (height,)).fetchone()
+        return row[0] if row else None
+
+    def by_hash_raw(self, block_hash: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM blocks WHERE hash = ?", (block_hash.lower(),)).fetchone()
+        return row[0] if row else None
+
+    def hash_at(self, height: int) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT hash FROM blocks WHERE height = ?", (height,)).fetchone()
+        return row[0] if row else None
+
+    def covers(self, height: int) -> bool:
+        """Je li visina unutar indeksiranog raspona (ispod vrha indeksa)"""
+        with self._lock:
+            row = self._conn.execute("SELECT MIN(height) FROM blocks").fetchone()
+        return row[0] is not None and row[0] <= height <= self._tip
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count, lowest = self._conn.execute("SELECT COUNT(*), MIN(height) FROM blocks").fetchone()
+        return {
+            "blocks": count,
+            "lowest_height": lowest,
+            "tip_height": self._tip,
+            "synced_blocks": self.synced_blocks,
+            "reorgs": self.reorgs,
+            "last_sync": self.last_sync,
+        }
+
+    # Sinkronizacija
+
+    async def sync(self, fetch: BlockFetcher, normalize: Optional[Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]] = None) -> int:
+        """
+        Dodaje blokove od zadnjeg indeksiranog do vrha lanca
+
+        fetch(limit, start_height) vraća blokove od start_height (None = vrh)
+        prema nižim visinama, a normalize po potrebi validira blokove prije
+        spremanja. Reorganizacija se prepoznaje bez dodatnih dohvata: prvi
+        novi blok mora nastavljati zadnji indeksirani (previous_block_hash),
+        a ako lanac nije narastao, blok na vrhu lanca mora biti jednak
+        indeksiranom. Inače se blokovi iznad zajedničkog bloka ponovno
+        indeksiraju. Vraća broj novih blokova.
+        """
+        latest = await fetch(1, None)
+        if not latest:
+            return 0
+        chain_tip = latest[0]["height"]
+
+        if self._tip is not None and chain_tip <= self._tip and latest[0]["hash"] != self.hash_at(chain_tip):
+            await self._rewind_to_common(fetch)
+        start = self._start_height(chain_tip)
+
+        added = 0
+        while start <= chain_tip:
+            end = min(chain_tip, start + self.batch_size - 1)
+            blocks = await fetch(end - start + 1, end)
+            if normalize is not None:
+                blocks = normalize(blocks)
+            # Blokovi dolaze od najvišeg prema nižim, pa je zadnji prvi novi blok
+            if (
+                blocks and self._tip is not None and blocks[-1]["height"] == self._tip + 1
+                and blocks[-1]["previous_block_hash"] != self.hash_at(self._tip)
+                and await self._rewind_to_common(fetch)
+            ):
+                start = self._start_height(chain_tip)
+                continue
+            added += self.add_blocks(blocks)
+            start = end + 1
+            # Ustupi event loop između dijelova
+            await asyncio.sleep(0)
+
+        self.synced_blocks += added
+        self.last_sync = time.time()
+        return added
+
+    def _start_height(self, chain_tip: int) -> int:
+        return max(0, chain_tip - self.initial_depth + 1) if self._tip is None else self._tip + 1
+
+    async def _rewind_to_common(self, fetch: BlockFetcher) -> bool:
+        """Briše blokove iznad zadnjeg bloka jednakog izvoru; vraća je li indeks promijenjen"""
+        height = self._tip
+        lowest = max(0, height - MAX_REORG_DEPTH)
+        while height >= lowest:
+            source = await fetch(1, height)
+            if source and source[0]["height"] == height and source[0]["hash"] == self.hash_at(height):
+                break
+            height -= 1
+        if height == self._tip:
+            return False
+        print(f"Reorganizacija lanca: indeks se vraća na blok {height}")
+        self.reorgs += 1
+        self.remove_above(height)
+        return True
+
+
+class BlockIndexSyncer:
+    """
+    Periodična sinkronizacija indeksa blokova u pozadini (i na zahtjev)
+
+    Nakon svake sinkronizacije pozivaju se followers (npr. indeks transakcija
+    koji obrađuje nove blokove).
+    """
+
+    def __init__(
+        self,
+        index: BlockIndex,
+        fetch: BlockFetcher,
+        normalize=None,
+        interval: float = 30.0,
+        followers: Optional[List[Callable[[], Awaitable[Any]]]] = None,
+    ):
+        self.index = index
+        self.fetch = fetch
+        self.normalize = normalize
+        self.interval = interval
+        self.followers = list(followers or [])
+        self._task: Optional[asyncio.Task] = None
+        self._sync_task: Optional[asyncio.Task] = None
+
+    async def _sync_all(self) -> int:
+        added = await self.index.sync(self.fetch, self.normalize)
+        for follower in self.followers:
+            await follower()
+        return added
+
+    async def sync(self) -> int:
+        """Jedna sinkronizacija (istovremeni pozivi čekaju istu)"""
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.create_task(self._sync_all())
+        return await asyncio.shield(self._sync_task)
+
+    def sync_soon(self) -> None:
+        """Pokreće sinkronizaciju u pozadini ako već ne traje"""
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.create_task(self._sync_all())
+            self._sync_task.add_done_callback(self._sync_done)
+
+    @staticmethod
+    def _sync_done(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Greška pri sinkronizaciji indeksa blokova: {task.exception()}")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        for task in (self._task, self._sync_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._task = None
+        self._sync_task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                added = await self.sync()
+                if added:
+                    print(f"Indeks blokova: dodano {added} blokova (vrh {self.index.tip_height})")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Greška pri sinkronizaciji indeksa blokova: {str(e)}")
+            await asyncio.sleep(self.interval)
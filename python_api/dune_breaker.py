@@ -0,0 +1,114 @@
+import threading
+import time
+from typing import Dict, Any, Hashable
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Prekidač za jedan Dune upit (endpoint query/{id})
+
+    Nakon failure_threshold uzastopnih neuspjeha prekidač se otvara i pozivi
+    odmah vraćaju grešku (bez čekanja na timeout). Nakon reset_timeout
+    sekundi propušta se jedan probni poziv (half-open): uspjeh zatvara
+    prekidač, a neuspjeh ga ponovno otvara s dvostruko duljim čekanjem
+    (najviše max_reset_timeout).
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, max_reset_timeout: float = 300.0):
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.reset_timeout = reset_timeout
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+        self.opens = 0
+        self.short_circuited = 0
+
+    def allow(self) -> bool:
+        """Smije li se pozvati Dune (u half-open stanju samo jedan probni poziv)"""
+        with self._lock:
+            if self.state == BREAKER_CLOSED:
+                return True
+            if self.state == BREAKER_OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = BREAKER_HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == BREAKER_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.short_circuited += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = BREAKER_CLOSED
+            self.failures = 0
+            self.reset_timeout = self.base_reset_timeout
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == BREAKER_HALF_OPEN:
+                # Probni poziv nije uspio: dulje čekanje do sljedeće probe
+                self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+                self._open()
+            elif self.state == BREAKER_CLOSED and self.failures >= self.failure_threshold:
+                self._open()
+
+    def abandon(self) -> None:
+        """Poziv je prekinut (npr. otkazan) bez ishoda: oslobađa mjesto probnog poziva"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _open(self) -> None:
+        self.state = BREAKER_OPEN
+        self.opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self.opens += 1
+
+    def retry_in(self) -> float:
+        """Sekunde do sljedećeg probnog poziva (0 ako prekidač nije otvoren)"""
+        if self.state != BREAKER_OPEN:
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "opens": self.opens,
+            "short_circuited": self.short_circuited,
+            "retry_in": round(self.retry_in(), 3),
+        }
+
+
+class CircuitBreakers:
+    """Prekidači po upitu, s istim postavkama"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, max_reset_timeout: float = 300.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self._breakers: Dict[Hashable, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> CircuitBreaker:
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    key, CircuitBreaker(self.failure_threshold, self.reset_timeout, self.max_reset_timeout)
+                )
+        return breaker
+
+    def stats(self) -> Dict[Hashable, Dict[str, Any]]:
+        return {key: breaker.stats() for key, breaker in list(self._breakers.items())}
@@ -0,0 +1,159 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+
+from dune_queries import (
+    ETHEREUM_PRICE_QUERY_ID, ETHEREUM_STATUS_QUERY_ID,
+    BITCOIN_PRICE_QUERY_ID, BITCOIN_PRICE_ALT_QUERY_ID, BITCOIN_STATUS_QUERY_ID
+)
+
+# Zadani TTL (u sekundama) po Dune upitu
+DEFAULT_QUERY_TTLS = {
+    BITCOIN_PRICE_QUERY_ID: 60,
+    ETHEREUM_PRICE_QUERY_ID: 60,
+    BITCOIN_PRICE_ALT_QUERY_ID: 60,
+    ETHEREUM_STATUS_QUERY_ID: 30,
+    BITCOIN_STATUS_QUERY_ID: 30,
+}
+
+CacheKey = Tuple[int, str]
+
+
+def cache_key(query_id: int, params: Optional[Dict[str, Any]] = None) -> CacheKey:
+    """Ključ priručne memorije: ID upita + parametri u kanonskom obliku"""
+    return (int(query_id), json.dumps(params, sort_keys=True, default=str) if params else "")
+
+
+@dataclass
+class CacheEntry:
+    value: Dict[str, Any]
+    fetched_at: float
+    expires_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+class ResultCache:
+    """
+    Priručna memorija rezultata Dune upita s TTL-om po upitu i LRU izbacivanjem
+
+    Sigurna za korištenje iz više dretvi i iz event loopa (operacije su kratke
+    i ne čekaju na mrežu).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        default_ttl: float = 60,
+        ttls: Optional[Dict[int, float]] = None,
+        max_stale: float = 3600,
+    ):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        # Koliko dugo nakon isteka TTL-a se zapis još smije poslužiti kao zastarjeli
+        self.max_stale = max_stale
+        self.ttls = dict(DEFAULT_QUERY_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ttl_for(self, query_id: int) -> float:
+        return self.ttls.get(int(query_id), self.default_ttl)
+
+    def get(self, query_id: int, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Vraća svježi rezultat ili None (i bilježi hit/miss)"""
+        key = cache_key(query_id, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.fresh:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def lookup(self, query_id: int, params: Optional[Dict[str, Any]] = None) -> Optional[CacheEntry]:
+        """
+        Vraća zapis i kad mu je istekao TTL (stale-while-revalidate)
+
+        Zapisi stariji od TTL + max_stale tretiraju se kao da ne postoje.
+        """
+        key = cache_key(query_id, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() > entry.expires_at + self.max_stale:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if entry.fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+            return entry
+
+    def peek(self, query_id: int, params: Optional[Dict[str, Any]] = None) -> Optional[CacheEntry]:
+        """Vraća zapis bez utjecaja na statistiku i LRU redoslijed"""
+        with self._lock:
+            return self._entries.get(cache_key(query_id, params))
+
+    def set(
+        self,
+        query_id: int,
+        params: Optional[Dict[str, Any]],
+        value: Dict[str, Any],
+        ttl: Optional[float] = None,
+        fetched_at: Optional[float] = None,
+    ) -> CacheEntry:
+        """Sprema rezultat i po potrebi izbacuje najdavnije korištene zapise"""
+        key = cache_key(query_id, params)
+        fetched_at = fetched_at if fetched_at is not None else time.time()
+        entry = CacheEntry(
+            value=value,
+            fetched_at=fetched_at,
+            expires_at=fetched_at + (ttl if ttl is not None else self.ttl_for(query_id)),
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def invalidate(self, query_id: int, params: Optional[Dict[str, Any]] = None) -> None:
+        with self._lock:
+            self._entries.pop(cache_key(query_id, params), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
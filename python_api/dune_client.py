@@ -1,374 +1,438 @@
-import requests
+import asyncio
+import httpx
+import json
 import os
 import time
-import random
 import re
 from dotenv import load_dotenv
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Iterator, AsyncIterator
+from dune_cache import ResultCache, CacheKey, cache_key
+from dune_queries import (
+    ETHEREUM_PRICE_QUERY_ID, ETHEREUM_STATUS_QUERY_ID,
+    BITCOIN_PRICE_QUERY_ID, BITCOIN_PRICE_ALT_QUERY_ID, BITCOIN_STATUS_QUERY_ID
+)
+from dune_singleflight import SingleFlight, AsyncSingleFlight
+from dune_polling import PollingPolicy, DEFAULT_POLLING_POLICY, DEFAULT_QUERY_POLLING
+from dune_ledger import ExecutionLedger
+from dune_store import ResultStore
+from dune_results import ColumnarResult, to_columnar
+from synthetic_data import SyntheticChain
+from metrics import DuneMetrics
+from tracing import span
+from dune_breaker import CircuitBreakers
+from dune_ratelimit import (
+    RateLimiter, AsyncRateLimiter, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND,
+    priority_for, parse_retry_after
+)
 
 # Učitaj varijable iz .env datoteke
 load_dotenv()
 
-class DuneClient:
+DUNE_BASE_URL = os.getenv("DUNE_API_BASE_URL", "https://api.dune.com/v1")
+
+# HTTP/2 je dostupan samo ako je instaliran paket h2 (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Stanja izvršavanja upita na Dune API-ju
+QUERY_STATE_COMPLETED = "QUERY_STATE_COMPLETED"
+QUERY_STATE_EXPIRED = "QUERY_STATE_EXPIRED"
+QUERY_STATE_FINAL_ERRORS = ("QUERY_STATE_FAILED", "QUERY_STATE_CANCELLED", QUERY_STATE_EXPIRED)
+
+# Broj redaka po stranici pri postupnom dohvaćanju velikih rezultata
+DEFAULT_PAGE_SIZE = 1000
+
+# Zadane vrijednosti kad Dune ne vrati podatke
+ETHEREUM_STATUS_DEFAULTS = {
+    "last_block": 22417536,
+    "gas_price": 30,
+    "transactions_count": 1500
+}
+
+BITCOIN_STATUS_DEFAULTS = {
+    "last_block": 840000,
+    "fee_rate": 25,  # sat/vB
+    "transactions_count": 350000,
+    "difficulty": 78.3e12,
+    "hashrate": 650.2e18
+}
+
+BITCOIN_PRICE_ALT_FALLBACK = 62345.78
+
+# Ponavljanja GET zahtjeva nakon odgovora 429 i najdulja pauza koju poštujemo
+RATE_LIMIT_RETRIES = 2
+MAX_RETRY_AFTER = 60.0
+
+# Vremenski odsječci poziva Dune API-ja (Server-Timing)
+DUNE_CALL_SPANS = {"execute": "submit", "status": "poll", "results": "results"}
+
+
+class DuneQueryError(Exception):
+    """Izvršavanje upita nije uspjelo (koristi se kod postupnog dohvaćanja rezultata)"""
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _result_rows(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Vraća retke iz odgovora execution/{id}/results"""
+    return result.get("result", {}).get("rows", [])
+
+
+def _result_table(result: Dict[str, Any]) -> ColumnarResult:
+    """Vraća retke iz odgovora kao stupčani rezultat"""
+    rows = _result_rows(result)
+    return rows if isinstance(rows, ColumnarResult) else ColumnarResult.from_rows(rows)
+
+
+class _DuneClientBase:
     """
-    Klijent za komunikaciju s Dune Analytics API-jem
+    Zajednička konfiguracija, parsiranje rezultata i simulirani podaci
+    za sinkroni i asinkroni Dune klijent
     """
-    
-    def __init__(self, api_key: Optional[str] = None):
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        http2: Optional[bool] = None,
+        cache: Optional[ResultCache] = None,
+        polling: Optional[Dict[int, PollingPolicy]] = None,
+        default_polling: Optional[PollingPolicy] = None,
+        ledger: Optional[ExecutionLedger] = None,
+        store: Optional[ResultStore] = None,
+        synthetic: Optional[SyntheticChain] = None,
+        metrics: Optional[DuneMetrics] = None,
+        executions_per_minute: Optional[float] = None,
+        execution_burst: Optional[int] = None,
+        breakers: Optional[CircuitBreakers] = None,
+    ):
         self.api_key = api_key or os.getenv("DUNE_API_KEY", "")
-        self.base_url = "https://api.dune.com/v1"
+        self.base_url = base_url or DUNE_BASE_URL
         self.headers = {
             "x-dune-api-key": self.api_key,
             "Content-Type": "application/json"
         }
-    
-    def _make_request(self, method: str, endpoint: str, params: Dict[str, Any] = None, data: Dict[str, Any] = None) -> Dict[str, Any]:
+        self.timeout = httpx.Timeout(
+            read_timeout if read_timeout is not None else _env_float("DUNE_READ_TIMEOUT", 30.0),
+            connect=connect_timeout if connect_timeout is not None else _env_float("DUNE_CONNECT_TIMEOUT", 5.0),
+        )
+        self.limits = httpx.Limits(
+            max_connections=max_connections or _env_int("DUNE_MAX_CONNECTIONS", 20),
+            max_keepalive_connections=max_keepalive_connections or _env_int("DUNE_MAX_KEEPALIVE", 10),
+        )
+        self.http2 = HTTP2_AVAILABLE if http2 is None else (http2 and HTTP2_AVAILABLE)
+
+        # Strategija provjere statusa po upitu (razmaci, backoff, ukupni rok)
+        self.default_polling = default_polling or DEFAULT_POLLING_POLICY
+        self.polling = dict(DEFAULT_QUERY_POLLING)
+        if polling:
+            self.polling.update(polling)
+        # Broj izvršavanja i provjera statusa po upitu
+        self.poll_stats: Dict[int, Dict[str, int]] = {}
+
+        # Rezultati uspješnih izvršavanja (dijeljeno među klijentima ako se proslijedi isti objekt)
+        self.cache = cache
+
+        # Trajna evidencija izvršavanja i spremljeni rezultati (preživljavaju restart procesa)
+        self.ledger = ledger
+        self.store = store
+
+        # Izvor simuliranih podataka (isti seed daje iste podatke)
+        self.synthetic = synthetic or SyntheticChain.from_env()
+
+        # Prometheus metrike poziva i izvršavanja (None = ne bilježi se)
+        self.metrics = metrics
+
+        # Ograničenje broja pokrenutih izvršavanja (krediti i rate limit Dune API-ja)
+        self.execution_rate = (executions_per_minute or _env_float("DUNE_EXECUTIONS_PER_MINUTE", 40.0)) / 60
+        self.execution_burst = execution_burst or _env_int("DUNE_EXECUTION_BURST", 10)
+
+        # Prekidač po upitu: nakon uzastopnih neuspjeha odmah se vraća zadnji dobar rezultat
+        self.breakers = breakers or CircuitBreakers(
+            failure_threshold=_env_int("DUNE_BREAKER_FAILURES", 5),
+            reset_timeout=_env_float("DUNE_BREAKER_RESET_TIMEOUT", 30.0),
+            max_reset_timeout=_env_float("DUNE_BREAKER_MAX_RESET_TIMEOUT", 300.0),
+        )
+
+    def _reuse_max_age(self, query_id: int) -> float:
+        return self.cache.ttl_for(query_id) if self.cache is not None else 60
+
+    def _ledger_lookup(self, query_id: int, params: Optional[Dict[str, Any]]) -> Tuple[Optional[str], bool]:
         """
-        Izvršava HTTP zahtjev prema Dune API-ju
+        Vraća (execution_id, završeno) za izvršavanje koje se može ponovno iskoristiti
         """
-        url = f"{self.base_url}/{endpoint}"
-        
-        try:
-            if method.lower() == "get":
-                response = requests.get(url, headers=self.headers, params=params)
-            elif method.lower() == "post":
-                response = requests.post(url, headers=self.headers, json=data)
-            else:
-                raise ValueError(f"Nepodržana HTTP metoda: {method}")
-            
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"Greška pri komunikaciji s Dune API-jem: {str(e)}")
-            # Vraćamo prazni rječnik u slučaju greške
-            return {}
-    
-    def execute_query(self, query_id: int) -> Dict[str, Any]:
+        if self.ledger is None:
+            return None, False
+        completed = self.ledger.find_completed(query_id, params, self._reuse_max_age(query_id))
+        if completed:
+            return completed, True
+        return self.ledger.find_pending(query_id, params), False
+
+    def _ledger_submitted(self, execution_id: str, query_id: int, params: Optional[Dict[str, Any]]) -> None:
+        if self.ledger is not None:
+            self.ledger.record_submitted(execution_id, query_id, params)
+
+    def _ledger_state(self, execution_id: str, state: str) -> None:
+        if self.ledger is not None:
+            self.ledger.update_state(execution_id, state)
+
+    def _resumable_queries(self) -> List[Tuple[int, Optional[Dict[str, Any]]]]:
+        """Upiti čije se izvršavanje iz evidencije može nastaviti ili ponovno iskoristiti"""
+        if self.ledger is None:
+            return []
+        if self.cache is not None:
+            max_age = max([self.cache.default_ttl, *self.cache.ttls.values()])
+        else:
+            max_age = self._reuse_max_age(0)
+        queries = []
+        for query_id, params_key in self.ledger.resumable(max_age):
+            params = json.loads(params_key) if params_key else None
+            if self._ledger_lookup(query_id, params)[0]:
+                queries.append((query_id, params))
+        return queries
+
+    def polling_policy(self, query_id: int) -> PollingPolicy:
+        return self.polling.get(int(query_id), self.default_polling)
+
+    def _finish_polling(self, query_id: int, polls: int, outcome: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Bilježi broj provjera statusa i dodaje ga u rezultat"""
+        stats = self.poll_stats.setdefault(int(query_id), {"executions": 0, "polls": 0, "last_polls": 0, "timeouts": 0})
+        stats["executions"] += 1
+        stats["polls"] += polls
+        stats["last_polls"] = polls
+        if outcome == "TIMEOUT":
+            stats["timeouts"] += 1
+        if self.metrics is not None:
+            self.metrics.record_execution(query_id, outcome, polls)
+        if result:
+            result["poll_count"] = polls
+        return result
+
+    def _on_rate_limited(self, response: httpx.Response) -> float:
+        """Odgovor 429: nova izvršavanja čekaju koliko kaže Retry-After"""
+        retry_after = min(parse_retry_after(response.headers.get("Retry-After")), MAX_RETRY_AFTER)
+        print(f"Dune API rate limit (429), nova izvršavanja čekaju {retry_after:.1f} s")
+        self.limiter.pause(retry_after)
+        return retry_after
+
+    @staticmethod
+    def _span_name(endpoint: str) -> str:
+        """Ime vremenskog odsječka (Server-Timing) za poziv Dune API-ja"""
+        return DUNE_CALL_SPANS.get(DuneMetrics.call_kind(endpoint), "dune")
+
+    def _record_call(self, endpoint: str, ok: bool) -> None:
+        if self.metrics is not None:
+            self.metrics.record_call(endpoint, ok)
+
+    def _record_duration(self, query_id: int, started: float) -> None:
+        if self.metrics is not None:
+            self.metrics.duration.observe(time.monotonic() - started, query_id=int(query_id))
+
+    def _cached_result(self, query_id: int, params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if self.cache is None:
+            return None
+        return self.cache.get(query_id, params)
+
+    def _store_result(self, query_id: int, params: Optional[Dict[str, Any]], result: Dict[str, Any]) -> None:
+        # Greške i prazni odgovori se ne spremaju
+        if not result or "error" in result:
+            return
+        fetched_at = time.time()
+        if self.cache is not None:
+            self.cache.set(query_id, params, result, fetched_at=fetched_at)
+        if self.store is not None:
+            self.store.save(query_id, params, result, fetched_at)
+
+    def _last_known_good(self, query_id: int, params: Optional[Dict[str, Any]], result: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Izvršava postojeći upit na Dune Analytics
+        Zadnji uspješan rezultat upita (bilo koje starosti) umjesto greške
+
+        Rezultat nosi starost u sekundama (stale_age). Ako uspješnog rezultata
+        nema, vraća se sama greška.
         """
-        # Pokreni izvršavanje upita
-        execution_response = self._make_request(
-            "post", 
-            f"query/{query_id}/execute"
-        )
-        
-        execution_id = execution_response.get("execution_id")
-        if not execution_id:
-            return {"error": "Nije moguće pokrenuti upit"}
-        
-        # Provjeri status izvršavanja
-        max_attempts = 10
-        attempt = 0
-        
-        while attempt < max_attempts:
-            status_response = self._make_request(
-                "get",
-                f"execution/{execution_id}/status"
-            )
-            
-            state = status_response.get("state")
-            
-            if state == "QUERY_STATE_COMPLETED":
-                # Dohvati rezultate
-                results = self._make_request(
-                    "get",
-                    f"execution/{execution_id}/results"
-                )
-                return results
-            
-            elif state in ["QUERY_STATE_FAILED", "QUERY_STATE_CANCELLED"]:
-                return {"error": f"Upit nije uspješno izvršen. Status: {state}"}
-            
-            # Pričekaj prije sljedeće provjere
-            time.sleep(2)
-            attempt += 1
-        
-        return {"error": "Isteklo vrijeme za izvršavanje upita"}
-    
-    def get_bitcoin_price(self) -> float:
-        """Dohvaća trenutnu cijenu Bitcoina s Dune API-ja."""
-        # Dohvaćamo cijenu Bitcoina s Dune API-ja koristeći query ID 5132855
-        current_price = 0.0
-        
-        print("Dohvaćanje cijene Bitcoina s Dune API-ja (Query ID: 5132855)...")
-        result = self.execute_query(5132855)
-        
-        if "error" in result:
-            return 0.0
-        
-        try:
-            rows = result.get("result", {}).get("rows", [])
-            if rows:
-                return float(rows[0].get("price", 0.0))
-        except (ValueError, IndexError, KeyError):
-            pass
-        
-        return 0.0
-        
-    def get_ethereum_price(self) -> float:
+        entry = self.cache.peek(query_id, params) if self.cache is not None else None
+        if entry is None:
+            return result
+        return {**entry.value, "stale_age": round(entry.age, 1)}
+
+    def _circuit_open(self, query_id: int, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        retry_in = self.breakers.get(query_id).retry_in()
+        print(f"Prekidač za upit {query_id} je otvoren, Dune se ne poziva (sljedeći pokušaj za {retry_in:.0f} s)")
+        return self._last_known_good(query_id, params, {"error": "Dune API nedostupan (prekidač otvoren)", "circuit_open": True})
+
+    def _finish_execution(self, query_id: int, params: Optional[Dict[str, Any]], result: Dict[str, Any]) -> Dict[str, Any]:
+        """Bilježi ishod u prekidaču; uspješan rezultat se sprema, a umjesto greške vraća zadnji dobar"""
+        breaker = self.breakers.get(query_id)
+        if result and result.get("rate_limited"):
+            # Upit nije ni poslan (čekanje na limiter je isteklo): to nije kvar Dune-a
+            breaker.abandon()
+            return self._last_known_good(query_id, params, result)
+        if not result or "error" in result:
+            breaker.record_failure()
+            return self._last_known_good(query_id, params, result)
+        breaker.record_success()
+        self._store_result(query_id, params, result)
+        return result
+
+    def data_age(self, query_id: int, params: Optional[Dict[str, Any]] = None) -> Optional[float]:
         """
-        Dohvaća trenutnu cijenu Ethereuma
-        Koristi upit ID 2309365 - Ethereum cijena
+        Starost podataka upita u sekundama ako im je istekao TTL
+
+        None znači da su podaci svježi ili da ih nema (vidi has_data).
         """
-        result = self.execute_query(2309365)
-        
+        entry = self.cache.peek(query_id, params) if self.cache is not None else None
+        if entry is None or entry.fresh:
+            return None
+        return round(entry.age, 1)
+
+    def has_data(self, query_id: int, params: Optional[Dict[str, Any]] = None) -> bool:
+        """Postoji li uspješan rezultat upita (inače se koriste zadane vrijednosti)"""
+        return self.cache is not None and self.cache.peek(query_id, params) is not None
+
+    @staticmethod
+    def _execute_payload(params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        return {"query_parameters": params} if params else None
+
+    def _session_options(self) -> Dict[str, Any]:
+        return {
+            "base_url": self.base_url,
+            "headers": self.headers,
+            "timeout": self.timeout,
+            "limits": self.limits,
+            "http2": self.http2,
+        }
+
+    @staticmethod
+    def _check_method(method: str) -> str:
+        method = method.lower()
+        if method not in ("get", "post"):
+            raise ValueError(f"Nepodržana HTTP metoda: {method}")
+        return method
+
+    # Parsiranje rezultata upita
+
+    @staticmethod
+    def _parse_ethereum_price(result: Dict[str, Any]) -> float:
         if "error" in result:
             return 0.0
-        
+
         try:
-            rows = result.get("result", {}).get("rows", [])
-            if rows:
-                return float(rows[0].get("price", 0.0))
-        except (ValueError, IndexError, KeyError):
+            return float(_result_table(result).first("price", 0.0))
+        except (ValueError, TypeError):
             pass
-        
+
         return 0.0
-        
-    def get_bitcoin_price(self) -> float:
-        """
-        Dohvaća trenutnu cijenu Bitcoina
-        Koristi upit ID 5132855 - Bitcoin cijena
-        """
-        print(f"Dohvaćanje cijene Bitcoina preko Dune API-ja (query ID: 5132855)...")
-        result = self.execute_query(5132855)
-        
+
+    @staticmethod
+    def _parse_bitcoin_price(result: Dict[str, Any]) -> float:
         if "error" in result:
             print(f"Greška pri dohvaćanju cijene Bitcoina: {result.get('error')}")
             return 0.0
-        
+
+        table = None
         try:
-            rows = result.get("result", {}).get("rows", [])
-            if rows:
+            table = _result_table(result)
+            if len(table):
                 # Pokušavamo dohvatiti cijenu iz različitih polja u odgovoru
                 price = None
-                if "price_usd" in rows[0]:
-                    price = float(rows[0]["price_usd"])
-                elif "price" in rows[0]:
-                    price = float(rows[0]["price"])
-                elif "current_price" in rows[0]:
-                    price = float(rows[0]["current_price"])
-                
+                for name in ("price_usd", "price", "current_price"):
+                    value = table.first(name)
+                    if value is not None:
+                        price = float(value)
+                        break
+
                 if price:
                     print(f"Uspješno dohvaćena cijena Bitcoina: ${price:,.2f}")
                     return price
                 else:
-                    print(f"Cijena nije pronađena u odgovoru. Dostupna polja: {list(rows[0].keys())}")
-        except (ValueError, IndexError, KeyError) as e:
+                    print(f"Cijena nije pronađena u odgovoru. Dostupna polja: {list(table.schema.names)}")
+        except (ValueError, TypeError) as e:
             print(f"Greška pri parsiranju cijene Bitcoina: {str(e)}")
-            print(f"Sadržaj odgovora: {rows[0] if rows else 'Nema redova'}")
-        
-        
+            print(f"Sadržaj odgovora: {table[0] if table else 'Nema redova'}")
+
         return 0.0
-        
-    def get_bitcoin_status(self) -> Dict[str, Any]:
-        """
-        Dohvaća trenutno stanje Bitcoin mreže
-        Koristi upit ID 5132856 - Bitcoin status (zadnji blok, fee rate, broj transakcija)
-        """
-        print("Dohvaćanje statusa Bitcoin mreže...")
-        # Pokušavamo dohvatiti podatke preko Dune API-ja
+
+    @staticmethod
+    def _parse_bitcoin_price_alt(result: Dict[str, Any]) -> float:
+        if "error" in result:
+            print("Greška pri dohvaćanju cijene Bitcoina, koristi se fallback vrijednost")
+            return BITCOIN_PRICE_ALT_FALLBACK
+
         try:
-            # Ovdje bi trebao biti poziv na Dune API, ali za sada koristimo simulirane podatke
-            # result = self.execute_query(5132856)
-            return {
-                "last_block": 840000,
-                "fee_rate": 25.5,
-                "transactions_count": 350000,
-                "difficulty": 78.3e12,
-                "hashrate": 650.2e18
-            }
-        except Exception as e:
-            print(f"Greška pri dohvaćanju statusa Bitcoin mreže: {str(e)}")
-            # Fallback na simulirane podatke
-            return {
-                "last_block": 840000,
-                "fee_rate": 25.5,
-                "transactions_count": 350000,
-                "difficulty": 78.3e12,
-                "hashrate": 650.2e18
-            }
-        
-    def get_bitcoin_transactions(self, address: str = None, limit: int = 10) -> List[Dict[str, Any]]:
-        """
-        Dohvaća zadnje Bitcoin transakcije ili transakcije za određenu adresu
-        """
-        # Za sada vraćamo simulirane podatke
-        # U stvarnoj implementaciji bi se koristio upit na Dune
-        current_timestamp = int(time.time())
-        transactions = []
-        
-        for i in range(limit):
-            tx_time = current_timestamp - i * 600  # Svaka transakcija je 10 minuta starija
-            tx_hash = ''.join(random.choices('0123456789abcdef', k=64))
-            sender = f"bc1{''.join(random.choices('0123456789abcdef', k=40))}"
-            recipient = f"bc1{''.join(random.choices('0123456789abcdef', k=40))}"
-            
-            if address:
-                # Ako je adresa specificirana, postavljamo je kao primatelja ili pošiljatelja
-                if i % 2 == 0:
-                    sender = address
-                else:
-                    recipient = address
-            
-            transactions.append({
-                "txid": tx_hash,
-                "block_height": 840000 - i,
-                "timestamp": tx_time,
-                "sender": sender,
-                "recipient": recipient,
-                "value": str(random.uniform(0.01, 2.5)),
-                "fee": str(random.uniform(0.00001, 0.0005)),
-                "confirmations": i + 1
-            })
-        
-        return transactions
-    
-    def get_bitcoin_transaction(self, txid: str) -> Optional[Dict[str, Any]]:
-        """
-        Dohvaća detalje Bitcoin transakcije prema hash-u
-        """
-        # Za sada vraćamo simulirane podatke
-        # U stvarnoj implementaciji bi se koristio upit na Dune
-        if not re.match(r'^[0-9a-f]{64}$', txid, re.IGNORECASE):
-            return None
-        
-        current_timestamp = int(time.time())
-        sender = f"bc1{''.join(random.choices('0123456789abcdef', k=40))}"
-        recipient = f"bc1{''.join(random.choices('0123456789abcdef', k=40))}"
-        
-        return {
-            "txid": txid,
-            "block_height": 840000,
-            "timestamp": current_timestamp - 3600,  # 1 sat prije
-            "sender": sender,
-            "recipient": recipient,
-            "value": str(random.uniform(0.01, 2.5)),
-            "fee": str(random.uniform(0.00001, 0.0005)),
-            "confirmations": 10
-        }
-    
-    def get_bitcoin_blocks(self, limit: int = 5) -> List[Dict[str, Any]]:
-        """
-        Dohvaća zadnje Bitcoin blokove
-        """
-        # Za sada vraćamo simulirane podatke
-        # U stvarnoj implementaciji bi se koristio upit na Dune
-        current_timestamp = int(time.time())
-        blocks = []
-        
-        for i in range(limit):
-            block_time = current_timestamp - i * 600  # Svaki blok je 10 minuta stariji
-            block_hash = ''.join(random.choices('0123456789abcdef', k=64))
-            merkle_root = ''.join(random.choices('0123456789abcdef', k=64))
-            prev_hash = ''.join(random.choices('0123456789abcdef', k=64)) if i < limit - 1 else None
-            
-            blocks.append({
-                "height": 840000 - i,
-                "hash": block_hash,
-                "timestamp": block_time,
-                "size": random.randint(500000, 2000000),
-                "tx_count": random.randint(1000, 3000),
-                "miner": "Unknown",
-                "difficulty": "72.33T",
-                "weight": random.randint(2000000, 8000000),
-                "version": "0x20000000",
-                "merkle_root": merkle_root,
-                "bits": "386604799",
-                "nonce": random.randint(0, 4294967295),
-                "previous_block_hash": prev_hash
-            })
-        
-        return blocks
-    
-    def get_bitcoin_address_info(self, address: str) -> Optional[Dict[str, Any]]:
-        """
-        Dohvaća informacije o Bitcoin adresi
-        """
-        # Za sada vraćamo simulirane podatke
-        # U stvarnoj implementaciji bi se koristio upit na Dune
-        if not re.match(r'^(1|3|bc1)[a-zA-Z0-9]{25,42}$', address):
-            return None
-        
-        current_timestamp = int(time.time())
-        first_seen = current_timestamp - 30 * 24 * 3600  # 30 dana prije
-        
-        return {
-            "address": address,
-            "balance": str(random.uniform(0.1, 10.0)),
-            "tx_count": random.randint(10, 100),
-            "total_received": str(random.uniform(1.0, 20.0)),
-            "total_sent": str(random.uniform(0.5, 10.0)),
-            "first_seen": first_seen,
-            "last_seen": current_timestamp - 24 * 3600  # 1 dan prije
-        }
-    
-    def get_bitcoin_price_history(self, days: int = 7) -> List[Dict[str, Any]]:
-        """
-        Dohvaća povijest cijene Bitcoina
-        """
-        # Za sada vraćamo simulirane podatke
-        # U stvarnoj implementaciji bi se koristio upit na Dune
-        current_timestamp = int(time.time())
-        history = []
-        current_price = 53000.0  # Početna cijena
-        
-        for i in range(days):
-            day_timestamp = current_timestamp - (days - i - 1) * 24 * 3600
-            date_str = time.strftime("%Y-%m-%d", time.localtime(day_timestamp))
-            
-            # Simuliramo male promjene cijene
-            price_change = random.uniform(-0.05, 0.05)  # -5% do +5%
-            current_price = current_price * (1 + price_change)
-            
-            history.append({
-                "date": date_str,
-                "price": current_price
-            })
-        
-        return history
-    
-    def get_ethereum_status(self) -> Dict[str, Any]:
-        """
-        Dohvaća trenutno stanje Ethereum mreže
-        Koristi upit ID 2309366 - Ethereum status
-        """
-        result = self.execute_query(2309366)
-        
+            table = _result_table(result)
+            if len(table):
+                price = float(table.first("price", BITCOIN_PRICE_ALT_FALLBACK))
+                print(f"Uspješno dohvaćena cijena Bitcoina: ${price}")
+                return price
+        except (ValueError, TypeError) as e:
+            print(f"Greška pri parsiranju cijene Bitcoina: {e}")
+
+        print("Koristi se fallback vrijednost za cijenu Bitcoina")
+        return BITCOIN_PRICE_ALT_FALLBACK
+
+    @staticmethod
+    def _parse_ethereum_status(result: Dict[str, Any]) -> Dict[str, Any]:
         if "error" in result:
-            return {
-                "last_block": 22417536,
-                "gas_price": 30,
-                "transactions_count": 1500
-            }
-        
+            return dict(ETHEREUM_STATUS_DEFAULTS)
+
         try:
-            rows = result.get("result", {}).get("rows", [])
-            if rows:
+            table = _result_table(result)
+            if len(table):
                 return {
-                    "last_block": int(rows[0].get("last_block", 22417536)),
-                    "gas_price": int(rows[0].get("gas_price", 30)),
-                    "transactions_count": int(rows[0].get("transactions_count", 1500))
+                    "last_block": int(table.first("last_block", 22417536)),
+                    "gas_price": int(table.first("gas_price", 30)),
+                    "transactions_count": int(table.first("transactions_count", 1500))
                 }
-        except (ValueError, IndexError, KeyError):
+        except (ValueError, TypeError):
             pass
-        
-        return {
-            "last_block": 22417536,
-            "gas_price": 30,
-            "transactions_count": 1500
-        }
-    
-    def get_token_balances(self, address: str) -> List[Dict[str, Any]]:
-        """
-        Dohvaća stanja tokena za određenu adresu
-        Koristi upit ID 2309367 - Token balances
-        """
-        # U stvarnoj implementaciji bi se koristio parametrizirani upit
-        # Za sada vraćamo simulirane podatke
-        
+
+        return dict(ETHEREUM_STATUS_DEFAULTS)
+
+    @staticmethod
+    def _parse_bitcoin_status(result: Dict[str, Any]) -> Dict[str, Any]:
+        if "error" in result:
+            return dict(BITCOIN_STATUS_DEFAULTS)
+
+        try:
+            table = _result_table(result)
+            if len(table):
+                return {
+                    "last_block": int(table.first("last_block", 840000)),
+                    "fee_rate": float(table.first("fee_rate", 25)),
+                    "transactions_count": int(table.first("transactions_count", 350000)),
+                    "difficulty": float(table.first("difficulty", 78.3e12)),
+                    "hashrate": float(table.first("hashrate", 650.2e18))
+                }
+        except (ValueError, TypeError):
+            pass
+
+        return dict(BITCOIN_STATUS_DEFAULTS)
+
+    # Simulirani podaci (dok ne postoje parametrizirani upiti na Dune)
+
+    @staticmethod
+    def _simulated_token_balances(address: str) -> List[Dict[str, Any]]:
         eth_balance = "1000000000000000000"  # 1 ETH
-        
+
         return [
             {
                 "symbol": "ETH",
@@ -395,17 +459,11 @@ class DuneClient:
                 "logo": "https://cryptologos.cc/logos/chainlink-link-logo.png"
             }
         ]
-    
-    def get_transactions(self, address: str) -> List[Dict[str, Any]]:
-        """
-        Dohvaća transakcije za određenu adresu
-        Koristi upit ID 2309368 - Transactions
-        """
-        # U stvarnoj implementaciji bi se koristio parametrizirani upit
-        # Za sada vraćamo simulirane podatke
-        
+
+    @staticmethod
+    def _simulated_transactions(address: str) -> List[Dict[str, Any]]:
         current_timestamp = int(time.time())
-        
+
         return [
             {
                 "hash": "0x1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef",
@@ -435,265 +493,789 @@ class DuneClient:
                 "gasUsed": "21000"
             }
         ]
-        
-    # Bitcoin metode
-    def get_bitcoin_price_alt(self) -> float:
+
+    # Simulirani Bitcoin podaci dolaze iz determinističkog sintetičkog lanca
+
+    def _simulated_bitcoin_transactions(
+        self, address: str = None, limit: int = 10, offset: int = 0, before_height: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        return self.synthetic.transactions(address, limit, offset, before_height)
+
+    def _simulated_bitcoin_block_transactions(self, height: int) -> List[Dict[str, Any]]:
+        if self.synthetic.block(height) is None:
+            return []
+        return list(self.synthetic.iter_block_transactions(height))
+
+    def _simulated_bitcoin_transaction(self, txid: str) -> Optional[Dict[str, Any]]:
+        # Provjeri je li txid validan (64 znaka dug heksadecimalni string)
+        if not re.match(r'^[0-9a-fA-F]{64}$', txid):
+            return None
+        return self.synthetic.transaction(txid)
+
+    def _simulated_bitcoin_blocks(self, limit: int = 5, start_height: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self.synthetic.blocks(limit, start_height)
+
+    def _simulated_bitcoin_block(self, block_id: str) -> Optional[Dict[str, Any]]:
+        # Hash bloka (64 znaka dug heksadecimalni string) ili visina
+        if re.match(r'^[0-9a-fA-F]{64}$', block_id):
+            return self.synthetic.block_by_hash(block_id.lower())
+        if block_id.isdigit():
+            return self.synthetic.block(int(block_id))
+        return None
+
+    def _simulated_bitcoin_address_info(self, address: str) -> Dict[str, Any]:
+        return self.synthetic.address_info(address)
+
+    def _simulated_bitcoin_price_history(self, days: int = 7) -> List[Dict[str, Any]]:
+        return self.synthetic.price_history(days)
+
+
+class DuneClient(_DuneClientBase):
+    """
+    Klijent za komunikaciju s Dune Analytics API-jem
+
+    Klijent drži jednu HTTP sesiju s poolom keep-alive konekcija pa ga treba
+    kreirati jednom (npr. u lifespanu aplikacije) i zatvoriti s close().
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        singleflight: Optional[SingleFlight] = None,
+        limiter: Optional[RateLimiter] = None,
+        **options
+    ):
+        super().__init__(api_key, **options)
+        self.session = httpx.Client(**self._session_options())
+        self.limiter = limiter or RateLimiter(self.execution_rate, self.execution_burst)
+
+        # Istovremeni pozivi istog upita čekaju na jedno izvršavanje
+        self.singleflight = singleflight or SingleFlight()
+
+    def close(self) -> None:
+        """Zatvara HTTP sesiju i sve otvorene konekcije"""
+        self.session.close()
+
+    def __enter__(self) -> "DuneClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _make_request(self, method: str, endpoint: str, params: Dict[str, Any] = None, data: Dict[str, Any] = None) -> Dict[str, Any]:
         """
-        Alternativni način dohvaćanja cijene Bitcoina
-        Koristi upit ID 2309370 - Bitcoin cijena (alternativni upit)
+        Izvršava HTTP zahtjev prema Dune API-ju
         """
-        result = self.execute_query(2309370)
-        
-        if "error" in result:
-            print("Greška pri dohvaćanju cijene Bitcoina, koristi se fallback vrijednost")
-            return 62345.78  # Fallback vrijednost
-        
-        try:
-            rows = result.get("result", {}).get("rows", [])
-            if rows:
-                price = float(rows[0].get("price", current_price))
-                print(f"Uspješno dohvaćena cijena Bitcoina: ${price}")
-                return price
-        except (ValueError, IndexError, KeyError) as e:
-            print(f"Greška pri parsiranju cijene Bitcoina: {e}")
-            pass
-        
-        print("Koristi se fallback vrijednost za cijenu Bitcoina")
-        return current_price  # Fallback vrijednost
-    
-    def get_bitcoin_status(self) -> Dict[str, Any]:
+        method = self._check_method(method)
+
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            try:
+                with span(self._span_name(endpoint)):
+                    if method == "get":
+                        response = self.session.get(endpoint, params=params)
+                    else:
+                        response = self.session.post(endpoint, json=data)
+
+                if response.status_code == 429:
+                    retry_after = self._on_rate_limited(response)
+                    # Provjere statusa i rezultati se ponavljaju nakon Retry-After (izvršavanja ponavlja _submit)
+                    if method == "get" and attempt < RATE_LIMIT_RETRIES:
+                        with span("rate_limit_wait"):
+                            time.sleep(retry_after)
+                        continue
+                response.raise_for_status()
+                with span("parse"):
+                    body = response.json()
+                self._record_call(endpoint, True)
+                return body
+            except (httpx.HTTPError, ValueError) as e:
+                self._record_call(endpoint, False)
+                print(f"Greška pri komunikaciji s Dune API-jem: {str(e)}")
+                # Vraćamo prazni rječnik u slučaju greške
+                return {}
+
+    def execute_query(self, query_id: int, params: Optional[Dict[str, Any]] = None, priority: Optional[int] = None) -> Dict[str, Any]:
         """
-        Dohvaća trenutno stanje Bitcoin mreže
-        Koristi upit ID 2309371 - Bitcoin status
+        Izvršava postojeći upit na Dune Analytics
+
+        Svježi rezultat iz priručne memorije vraća se bez novog (plaćenog) izvršavanja.
+        Prioritet određuje redoslijed čekanja na limiter (zadano prema vrsti upita).
         """
-        result = self.execute_query(2309371)
-        
-        if "error" in result:
-            return {
-                "last_block": 840000,
-                "fee_rate": 25,  # sat/vB
-                "transactions_count": 350000,
-                "difficulty": 78.3e12,
-                "hashrate": 650.2e18
-            }
-        
+        cached = self._cached_result(query_id, params)
+        if cached is not None:
+            return cached
+
+        key = cache_key(query_id, params)
+        priority = priority_for(query_id) if priority is None else priority
+        # Izvršavanje koje već čeka s nižim prioritetom preuzima prioritet ovog poziva
+        self.limiter.promote(key, priority)
+        return self.singleflight.do(key, self._execute_and_store, query_id, params, priority)
+
+    def resume_from_ledger(self) -> List[Dict[str, Any]]:
+        """
+        Nastavlja nedovršena izvršavanja iz evidencije i preuzima svježe završene rezultate
+        """
+        return [self.execute_query(query_id, params, PRIORITY_BACKGROUND) for query_id, params in self._resumable_queries()]
+
+    def _execute_and_store(self, query_id: int, params: Optional[Dict[str, Any]], priority: int = PRIORITY_INTERACTIVE) -> Dict[str, Any]:
+        # Rezultat je možda spremio pozivatelj koji je upravo završio
+        entry = self.cache.peek(query_id, params) if self.cache is not None else None
+        if entry is not None and entry.fresh:
+            return entry.value
+
+        breaker = self.breakers.get(query_id)
+        if not breaker.allow():
+            return self._circuit_open(query_id, params)
+        started = time.monotonic()
         try:
-            rows = result.get("result", {}).get("rows", [])
-            if rows:
-                return {
-                    "last_block": int(rows[0].get("last_block", 840000)),
-                    "fee_rate": float(rows[0].get("fee_rate", 25)),
-                    "transactions_count": int(rows[0].get("transactions_count", 350000)),
-                    "difficulty": float(rows[0].get("difficulty", 78.3e12)),
-                    "hashrate": float(rows[0].get("hashrate", 650.2e18))
-                }
-        except (ValueError, IndexError, KeyError):
-            pass
-        
-        return {
-            "last_block": 840000,
-            "fee_rate": 25,  # sat/vB
-            "transactions_count": 350000,
-            "difficulty": 78.3e12,
-            "hashrate": 650.2e18
-        }
-    
-    def get_bitcoin_transactions(self, address: str = None, limit: int = 10) -> List[Dict[str, Any]]:
+            result = self._execute(query_id, params, priority)
+        except BaseException:
+            breaker.abandon()
+            raise
+        self._record_duration(query_id, started)
+        return self._finish_execution(query_id, params, result)
+
+    def _execute(self, query_id: int, params: Optional[Dict[str, Any]] = None, priority: int = PRIORITY_INTERACTIVE) -> Dict[str, Any]:
         """
-        Dohvaća Bitcoin transakcije za određenu adresu ili zadnje transakcije
-        Koristi upit ID 2309372 - Bitcoin transakcije
+        Pokreće novo izvršavanje upita i čeka na rezultate
         """
-        # U stvarnoj implementaciji bi se koristio parametrizirani upit
-        # Za sada vraćamo simulirane podatke
-        
-        current_timestamp = int(time.time())
-        transactions = []
-        
-        for i in range(limit):
-            # Generiraj slučajni txid
-            txid = "".join([random.choice("0123456789abcdef") for _ in range(64)])
-            
-            # Slučajno vrijeme transakcije (unutar zadnjih 24 sata)
-            timestamp = current_timestamp - random.randint(60, 86400)
-            
-            # Slučajna vrijednost u BTC (između 0.001 i 2 BTC)
-            value = round(random.uniform(0.001, 2), 8)
-            
-            # Slučajna naknada (između 0.00001 i 0.001 BTC)
-            fee = round(random.uniform(0.00001, 0.001), 8)
-            
-            # Generiraj slučajne adrese
-            sender = f"bc1{''.join([random.choice('0123456789abcdefghijklmnopqrstuvwxyz') for _ in range(30)])}"
-            recipient = f"bc1{''.join([random.choice('0123456789abcdefghijklmnopqrstuvwxyz') for _ in range(30)])}"
-            
-            # Ako je adresa specificirana, postavi je kao pošiljatelja ili primatelja
-            if address:
-                if random.choice([True, False]):
-                    sender = address
-                else:
-                    recipient = address
-            
-            transaction = {
-                "txid": txid,
-                "block_height": 840000 - i,
-                "timestamp": timestamp,
-                "sender": sender,
-                "recipient": recipient,
-                "value": str(value),
-                "fee": str(fee),
-                "confirmations": i + 1
-            }
-            
-            transactions.append(transaction)
-        
-        return transactions
-        
-    def get_bitcoin_transaction(self, txid: str) -> Dict[str, Any]:
+        execution_id, polls, error = self._wait_for_execution(query_id, params, priority)
+        if error is not None:
+            return error
+
+        # Dohvati rezultate
+        results = self._make_request(
+            "get",
+            f"execution/{execution_id}/results"
+        )
+        if not results and polls == 0:
+            # Rezultati ponovno iskorištenog izvršavanja više nisu dostupni, pokreni novo
+            self._ledger_state(execution_id, QUERY_STATE_EXPIRED)
+            return self._execute(query_id, params, priority)
+        with span("parse"):
+            results = to_columnar(results)
+        return self._finish_polling(query_id, polls, QUERY_STATE_COMPLETED, results)
+
+    def _wait_for_execution(self, query_id: int, params: Optional[Dict[str, Any]], priority: int = PRIORITY_INTERACTIVE) -> Tuple[Optional[str], int, Optional[Dict[str, Any]]]:
         """
-        Dohvaća detalje Bitcoin transakcije prema hash-u
-        Koristi upit ID 2309376 - Bitcoin transakcija detalji
+        Pokreće (ili nastavlja) izvršavanje i čeka da završi
+
+        Vraća (execution_id, broj provjera, greška); greška je None kad su rezultati spremni.
         """
-        # U stvarnoj implementaciji bi se koristio parametrizirani upit
+        policy = self.polling_policy(query_id)
+        deadline = time.monotonic() + policy.deadline
+
+        # Izvršavanje iz evidencije (npr. pokrenuto prije restarta) se ne plaća ponovno
+        execution_id, completed = self._ledger_lookup(query_id, params)
+        if completed:
+            return execution_id, 0, None
+
+        if not execution_id:
+            # Pokreni izvršavanje upita (kad limiter dopusti)
+            execution_id, queued_out = self._submit(query_id, params, priority, deadline)
+            if not execution_id:
+                return None, 0, {"error": "Nije moguće pokrenuti upit", "rate_limited": queued_out}
+            self._ledger_submitted(execution_id, query_id, params)
+
+        # Provjeri status izvršavanja (kratka prva provjera, zatim backoff do roka)
+        polls = 0
+
+        for delay in policy.delays():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            with span("poll_wait"):
+                time.sleep(min(delay, remaining))
+
+            status_response = self._make_request(
+                "get",
+                f"execution/{execution_id}/status"
+            )
+            polls += 1
+
+            state = status_response.get("state")
+
+            if state == QUERY_STATE_COMPLETED:
+                self._ledger_state(execution_id, state)
+                return execution_id, polls, None
+
+            elif state in QUERY_STATE_FINAL_ERRORS:
+                self._ledger_state(execution_id, state)
+                return execution_id, polls, self._finish_polling(query_id, polls, state, {"error": f"Upit nije uspješno izvršen. Status: {state}"})
+
+        return execution_id, polls, self._finish_polling(query_id, polls, "TIMEOUT", {"error": "Isteklo vrijeme za izvršavanje upita"})
+
+    def _submit(self, query_id: int, params: Optional[Dict[str, Any]], priority: int, deadline: float) -> Tuple[Optional[str], bool]:
+        """
+        Pokreće izvršavanje kad limiter dopusti; nakon odgovora 429 pokušava ponovno do roka
+
+        Vraća (execution_id, je li isteklo čekanje na limiter); bez execution_id
+        i bez isteka čekanja Dune nije pokrenuo izvršavanje.
+        """
+        key = cache_key(query_id, params)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.limiter.acquire(priority, key, remaining):
+                print(f"Isteklo vrijeme čekanja na pokretanje upita {query_id} (rate limit)")
+                return None, True
+
+            rate_limited = self.limiter.rate_limited
+            execution_response = self._make_request(
+                "post",
+                f"query/{query_id}/execute",
+                data=self._execute_payload(params)
+            )
+            execution_id = execution_response.get("execution_id")
+            if execution_id or self.limiter.rate_limited == rate_limited:
+                return execution_id, False
+
+    def iter_result_pages(self, execution_id: str, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Dohvaća rezultate izvršavanja stranicu po stranicu (limit/offset)
+        """
+        offset = 0
+        while True:
+            page = self._make_request(
+                "get",
+                f"execution/{execution_id}/results",
+                params={"limit": page_size, "offset": offset}
+            )
+            if not page or "error" in page:
+                raise DuneQueryError(f"Greška pri dohvaćanju rezultata izvršavanja {execution_id} (offset {offset})")
+
+            rows = _result_rows(page)
+            if rows:
+                yield rows
+
+            next_offset = page.get("next_offset")
+            if next_offset is None or not rows:
+                return
+            offset = next_offset
+
+    def iter_query_pages(self, query_id: int, params: Optional[Dict[str, Any]] = None, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Izvršava upit i vraća rezultate kao niz stranica redaka
+
+        U memoriji je najviše jedna stranica; veliki rezultati se ne spremaju u priručnu memoriju.
+        """
+        execution_id, _, error = self._wait_for_execution(query_id, params)
+        if error is not None:
+            raise DuneQueryError(error["error"])
+        yield from self.iter_result_pages(execution_id, page_size)
+
+    def iter_bitcoin_transactions(self, address: str = None, limit: int = 10, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Dohvaća Bitcoin transakcije u stranicama od najviše page_size redaka
+        Koristi upit ID 2309372 - Bitcoin transakcije
+        """
+        # Za sada simulirani podaci; s parametriziranim upitom ovo postaje iter_query_pages(2309372, ...)
+        for offset in range(0, limit, page_size):
+            yield self._simulated_bitcoin_transactions(address, min(page_size, limit - offset), offset)
+
+    def get_ethereum_price(self) -> float:
+        """
+        Dohvaća trenutnu cijenu Ethereuma
+        Koristi upit ID 2309365 - Ethereum cijena
+        """
+        return self._parse_ethereum_price(self.execute_query(ETHEREUM_PRICE_QUERY_ID))
+
+    def get_bitcoin_price(self) -> float:
+        """
+        Dohvaća trenutnu cijenu Bitcoina
+        Koristi upit ID 5132855 - Bitcoin cijena
+        """
+        print(f"Dohvaćanje cijene Bitcoina preko Dune API-ja (query ID: 5132855)...")
+        return self._parse_bitcoin_price(self.execute_query(BITCOIN_PRICE_QUERY_ID))
+
+    def get_bitcoin_price_alt(self) -> float:
+        """
+        Alternativni način dohvaćanja cijene Bitcoina
+        Koristi upit ID 2309370 - Bitcoin cijena (alternativni upit)
+        """
+        return self._parse_bitcoin_price_alt(self.execute_query(BITCOIN_PRICE_ALT_QUERY_ID))
+
+    def get_ethereum_status(self) -> Dict[str, Any]:
+        """
+        Dohvaća trenutno stanje Ethereum mreže
+        Koristi upit ID 2309366 - Ethereum status
+        """
+        return self._parse_ethereum_status(self.execute_query(ETHEREUM_STATUS_QUERY_ID))
+
+    def get_bitcoin_status(self) -> Dict[str, Any]:
+        """
+        Dohvaća trenutno stanje Bitcoin mreže
+        Koristi upit ID 2309371 - Bitcoin status
+        """
+        return self._parse_bitcoin_status(self.execute_query(BITCOIN_STATUS_QUERY_ID))
+
+    def get_token_balances(self, address: str) -> List[Dict[str, Any]]:
+        """
+        Dohvaća stanja tokena za određenu adresu
+        Koristi upit ID 2309367 - Token balances
+        """
+        # U stvarnoj implementaciji bi se koristio parametrizirani upit
         # Za sada vraćamo simulirane podatke
-        
-        # Provjeri je li txid validan (64 znaka dug heksadecimalni string)
-        if not re.match(r'^[0-9a-fA-F]{64}$', txid):
-            return None
-            
-        current_timestamp = int(time.time())
-        
-        # Slučajno vrijeme transakcije (unutar zadnjih 24 sata)
-        timestamp = current_timestamp - random.randint(60, 86400)
-        
-        # Slučajna vrijednost u BTC (između 0.001 i 2 BTC)
-        value = round(random.uniform(0.001, 2), 8)
-        
-        # Slučajna naknada (između 0.00001 i 0.001 BTC)
-        fee = round(random.uniform(0.00001, 0.001), 8)
-        
-        # Generiraj slučajne adrese
-        sender = f"bc1{''.join([random.choice('0123456789abcdefghijklmnopqrstuvwxyz') for _ in range(30)])}"
-        recipient = f"bc1{''.join([random.choice('0123456789abcdefghijklmnopqrstuvwxyz') for _ in range(30)])}"
-        
-        # Slučajan broj potvrda (između 1 i 10)
-        confirmations = random.randint(1, 10)
-        
-        return {
-            "txid": txid,  # Koristimo stvarni txid koji je prosljeđen
-            "block_height": 840000 - confirmations,
-            "timestamp": timestamp,
-            "sender": sender,
-            "recipient": recipient,
-            "value": str(value),
-            "fee": str(fee),
-            "confirmations": confirmations
-        }
-    
-    def get_bitcoin_blocks(self, limit: int = 5) -> List[Dict[str, Any]]:
+        return self._simulated_token_balances(address)
+
+    def get_transactions(self, address: str) -> List[Dict[str, Any]]:
         """
-        Dohvaća zadnje Bitcoin blokove
-        Koristi upit ID 2309373 - Bitcoin blokovi
+        Dohvaća transakcije za određenu adresu
+        Koristi upit ID 2309368 - Transactions
         """
         # U stvarnoj implementaciji bi se koristio parametrizirani upit
         # Za sada vraćamo simulirane podatke
-        
-        blocks = []
-        current_timestamp = int(time.time())
-        last_block_height = 840000
-        
-        for i in range(limit):
-            # Generiraj slučajni hash bloka
-            block_hash = "".join([random.choice("0123456789abcdef") for _ in range(64)])
-            
-            # Slučajno vrijeme bloka (svaki blok je otprilike 10 minuta nakon prethodnog)
-            timestamp = current_timestamp - (i * 600)  # 600 sekundi = 10 minuta
-            
-            # Slučajna veličina bloka (između 1 MB i 2 MB)
-            size = random.randint(1000000, 2000000)
-            
-            # Slučajan broj transakcija (između 1000 i 3000)
-            tx_count = random.randint(1000, 3000)
-            
-            # Generiraj slučajnu adresu rudara
-            miner = f"bc1{''.join([random.choice('0123456789abcdefghijklmnopqrstuvwxyz') for _ in range(30)])}"
-            
-            block = {
-                "height": last_block_height - i,
-                "hash": block_hash,
-                "timestamp": timestamp,
-                "size": size,
-                "tx_count": tx_count,
-                "miner": miner,
-                "difficulty": "78.3T",
-                "weight": size * 4,
-                "version": "0x20000000",
-                "merkle_root": "".join([random.choice("0123456789abcdef") for _ in range(64)]),
-                "bits": "386604799",
-                "nonce": random.randint(0, 4294967295),
-                "previous_block_hash": "".join([random.choice("0123456789abcdef") for _ in range(64)]) if i < limit - 1 else None
-            }
-            
-            blocks.append(block)
-        
-        return blocks
-    
+        return self._simulated_transactions(address)
+
+    def get_bitcoin_transactions(self, address: str = None, limit: int = 10, before_height: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Dohvaća Bitcoin transakcije za određenu adresu ili zadnje transakcije
+        (s before_height samo iz blokova ispod te visine)
+        Koristi upit ID 2309372 - Bitcoin transakcije
+        """
+        return self._simulated_bitcoin_transactions(address, limit, before_height=before_height)
+
+    def get_bitcoin_block_transactions(self, height: int) -> List[Dict[str, Any]]:
+        """
+        Dohvaća sve transakcije Bitcoin bloka
+        Koristi upit ID 2309372 - Bitcoin transakcije
+        """
+        return self._simulated_bitcoin_block_transactions(height)
+
+    def get_bitcoin_transaction(self, txid: str) -> Optional[Dict[str, Any]]:
+        """
+        Dohvaća detalje Bitcoin transakcije prema hash-u
+        Koristi upit ID 2309376 - Bitcoin transakcija detalji
+        """
+        return self._simulated_bitcoin_transaction(txid)
+
+    def get_bitcoin_blocks(self, limit: int = 5, start_height: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Dohvaća zadnje Bitcoin blokove (ili blokove od start_height prema nižim visinama)
+        Koristi upit ID 2309373 - Bitcoin blokovi
+        """
+        return self._simulated_bitcoin_blocks(limit, start_height)
+
+    def get_bitcoin_block(self, block_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Dohvaća Bitcoin blok prema visini ili hashu
+        Koristi upit ID 2309373 - Bitcoin blokovi
+        """
+        return self._simulated_bitcoin_block(block_id)
+
     def get_bitcoin_address_info(self, address: str) -> Dict[str, Any]:
         """
         Dohvaća informacije o Bitcoin adresi
         Koristi upit ID 2309374 - Bitcoin adresa
         """
-        # U stvarnoj implementaciji bi se koristio parametrizirani upit
-        # Za sada vraćamo simulirane podatke
-        
-        # Slučajno stanje (između 0.1 i 10 BTC)
-        balance = round(random.uniform(0.1, 10), 8)
-        
-        # Slučajan broj transakcija (između 10 i 1000)
-        tx_count = random.randint(10, 1000)
-        
-        # Slučajno ukupno primljeno (veće od stanja)
-        total_received = round(balance + random.uniform(1, 20), 8)
-        
-        # Slučajno ukupno poslano (razlika između primljenog i stanja)
-        total_sent = round(total_received - balance, 8)
-        
-        return {
-            "address": address,
-            "balance": str(balance),
-            "tx_count": tx_count,
-            "total_received": str(total_received),
-            "total_sent": str(total_sent),
-            "first_seen": int(time.time()) - random.randint(86400 * 30, 86400 * 365 * 3),  # Između 30 dana i 3 godine
-            "last_seen": int(time.time()) - random.randint(0, 86400 * 30)  # Unutar zadnjih 30 dana
-        }
-    
+        return self._simulated_bitcoin_address_info(address)
+
     def get_bitcoin_price_history(self, days: int = 7) -> List[Dict[str, Any]]:
         """
         Dohvaća povijest cijene Bitcoina
         Koristi upit ID 2309375 - Bitcoin povijest cijena
         """
-        # U stvarnoj implementaciji bi se koristio parametrizirani upit
-        # Za sada vraćamo simulirane podatke
-        
-        price_history = []
-        current_timestamp = int(time.time())
-        current_price = 67890.0
-        
-        for i in range(days):
-            # Datum (počevši od danas unatrag)
-            timestamp = current_timestamp - (i * 86400)  # 86400 sekundi = 1 dan
-            date = time.strftime("%Y-%m-%d", time.localtime(timestamp))
-            
-            # Slučajna promjena cijene (između -5% i +5%)
-            price_change = random.uniform(-0.05, 0.05)
-            price = current_price * (1 + price_change * (i + 1))
-            
-            price_history.append({
-                "date": date,
-                "price": round(price, 2)
-            })
-        
-        # Sortiraj po datumu (od najstarijeg do najnovijeg)
-        price_history.reverse()
-        
-        return price_history
+        return self._simulated_bitcoin_price_history(days)
+
+
+class AsyncDuneClient(_DuneClientBase):
+    """
+    Asinkroni klijent za Dune Analytics API (httpx.AsyncClient)
+
+    Čekanje na izvršavanje upita ne blokira dretvu pa jedan worker može
+    istovremeno pratiti stotine sporih izvršavanja. Zatvara se s aclose().
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        stale_while_revalidate: bool = True,
+        singleflight: Optional[AsyncSingleFlight] = None,
+        limiter: Optional[AsyncRateLimiter] = None,
+        **options
+    ):
+        super().__init__(api_key, **options)
+        self.session = httpx.AsyncClient(**self._session_options())
+        self.limiter = limiter or AsyncRateLimiter(self.execution_rate, self.execution_burst)
+
+        # Istovremeni pozivi istog upita čekaju na jedno izvršavanje
+        self.singleflight = singleflight or AsyncSingleFlight()
+
+        # Zastarjeli rezultat se vraća odmah, a osvježavanje ide u pozadini
+        self.stale_while_revalidate = stale_while_revalidate
+        self._refresh_tasks: Dict[CacheKey, asyncio.Task] = {}
+
+    async def aclose(self) -> None:
+        """Zatvara HTTP sesiju i sve otvorene konekcije"""
+        for task in list(self._refresh_tasks.values()):
+            task.cancel()
+        await self.session.aclose()
+
+    async def __aenter__(self) -> "AsyncDuneClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def _make_request(self, method: str, endpoint: str, params: Dict[str, Any] = None, data: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Izvršava HTTP zahtjev prema Dune API-ju
+        """
+        method = self._check_method(method)
+
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            try:
+                with span(self._span_name(endpoint)):
+                    if method == "get":
+                        response = await self.session.get(endpoint, params=params)
+                    else:
+                        response = await self.session.post(endpoint, json=data)
+
+                if response.status_code == 429:
+                    retry_after = self._on_rate_limited(response)
+                    # Provjere statusa i rezultati se ponavljaju nakon Retry-After (izvršavanja ponavlja _submit)
+                    if method == "get" and attempt < RATE_LIMIT_RETRIES:
+                        with span("rate_limit_wait"):
+                            await asyncio.sleep(retry_after)
+                        continue
+                response.raise_for_status()
+                with span("parse"):
+                    body = response.json()
+                self._record_call(endpoint, True)
+                return body
+            except (httpx.HTTPError, ValueError) as e:
+                self._record_call(endpoint, False)
+                print(f"Greška pri komunikaciji s Dune API-jem: {str(e)}")
+                # Vraćamo prazni rječnik u slučaju greške
+                return {}
+
+    async def execute_query(self, query_id: int, params: Optional[Dict[str, Any]] = None, priority: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Izvršava postojeći upit na Dune Analytics
+
+        Svježi rezultat iz priručne memorije vraća se bez novog (plaćenog) izvršavanja.
+        Zastarjeli rezultat se također vraća odmah, uz osvježavanje u pozadini.
+        Prioritet određuje redoslijed čekanja na limiter (zadano prema vrsti upita).
+        """
+        if self.cache is not None and self.stale_while_revalidate:
+            entry = self.cache.lookup(query_id, params)
+            if entry is not None:
+                if not entry.fresh:
+                    self.schedule_refresh(query_id, params)
+                return entry.value
+        else:
+            cached = self._cached_result(query_id, params)
+            if cached is not None:
+                return cached
+
+        return await self.refresh(query_id, params, priority, reuse_fresh=True)
+
+    async def refresh(
+        self,
+        query_id: int,
+        params: Optional[Dict[str, Any]] = None,
+        priority: Optional[int] = None,
+        reuse_fresh: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Izvršava upit bez obzira na priručnu memoriju i sprema uspješan rezultat
+
+        S reuse_fresh=True (execute_query) vraća se svježi rezultat koji je
+        spremio poziv završen nakon provjere priručne memorije.
+        """
+        key = cache_key(query_id, params)
+        priority = priority_for(query_id) if priority is None else priority
+        # Izvršavanje koje već čeka s nižim prioritetom preuzima prioritet ovog poziva
+        self.limiter.promote(key, priority)
+        return await self.singleflight.do(key, self._execute_and_store, query_id, params, priority, reuse_fresh)
+
+    async def _execute_and_store(
+        self,
+        query_id: int,
+        params: Optional[Dict[str, Any]],
+        priority: int = PRIORITY_INTERACTIVE,
+        reuse_fresh: bool = False,
+    ) -> Dict[str, Any]:
+        if reuse_fresh:
+            # Rezultat je možda spremio pozivatelj koji je upravo završio
+            entry = self.cache.peek(query_id, params) if self.cache is not None else None
+            if entry is not None and entry.fresh:
+                return entry.value
+
+        breaker = self.breakers.get(query_id)
+        if not breaker.allow():
+            return self._circuit_open(query_id, params)
+        started = time.monotonic()
+        try:
+            result = await self._execute(query_id, params, priority)
+        except BaseException:
+            breaker.abandon()
+            raise
+        self._record_duration(query_id, started)
+        return self._finish_execution(query_id, params, result)
+
+    def resume_from_ledger(self) -> List[asyncio.Task]:
+        """
+        Nastavlja nedovršena izvršavanja iz evidencije i preuzima svježe završene rezultate
+        """
+        return [self.schedule_refresh(query_id, params) for query_id, params in self._resumable_queries()]
+
+    def schedule_refresh(self, query_id: int, params: Optional[Dict[str, Any]] = None) -> asyncio.Task:
+        """
+        Pokreće osvježavanje u pozadini (najviše jedno po upitu i parametrima)
+
+        Osvježavanje čeka na limiter iza zahtjeva korisnika (PRIORITY_BACKGROUND).
+        """
+        key = cache_key(query_id, params)
+        task = self._refresh_tasks.get(key)
+        if task is None or task.done():
+            task = asyncio.create_task(self.refresh(query_id, params, PRIORITY_BACKGROUND))
+            self._refresh_tasks[key] = task
+            task.add_done_callback(lambda t, key=key: self._refresh_done(key, t))
+        return task
+
+    def _refresh_done(self, key: CacheKey, task: asyncio.Task) -> None:
+        if self._refresh_tasks.get(key) is task:
+            del self._refresh_tasks[key]
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Greška pri osvježavanju upita {key[0]} u pozadini: {task.exception()}")
+
+    async def _execute(self, query_id: int, params: Optional[Dict[str, Any]] = None, priority: int = PRIORITY_INTERACTIVE) -> Dict[str, Any]:
+        """
+        Pokreće novo izvršavanje upita i čeka na rezultate
+        """
+        execution_id, polls, error = await self._wait_for_execution(query_id, params, priority)
+        if error is not None:
+            return error
+
+        # Dohvati rezultate
+        results = await self._make_request(
+            "get",
+            f"execution/{execution_id}/results"
+        )
+        if not results and polls == 0:
+            # Rezultati ponovno iskorištenog izvršavanja više nisu dostupni, pokreni novo
+            self._ledger_state(execution_id, QUERY_STATE_EXPIRED)
+            return await self._execute(query_id, params, priority)
+        with span("parse"):
+            results = to_columnar(results)
+        return self._finish_polling(query_id, polls, QUERY_STATE_COMPLETED, results)
+
+    async def _wait_for_execution(self, query_id: int, params: Optional[Dict[str, Any]], priority: int = PRIORITY_INTERACTIVE) -> Tuple[Optional[str], int, Optional[Dict[str, Any]]]:
+        """
+        Pokreće (ili nastavlja) izvršavanje i čeka da završi
+
+        Vraća (execution_id, broj provjera, greška); greška je None kad su rezultati spremni.
+        """
+        policy = self.polling_policy(query_id)
+        deadline = time.monotonic() + policy.deadline
+
+        # Izvršavanje iz evidencije (npr. pokrenuto prije restarta) se ne plaća ponovno
+        execution_id, completed = self._ledger_lookup(query_id, params)
+        if completed:
+            return execution_id, 0, None
+
+        if not execution_id:
+            # Pokreni izvršavanje upita (kad limiter dopusti)
+            execution_id, queued_out = await self._submit(query_id, params, priority, deadline)
+            if not execution_id:
+                return None, 0, {"error": "Nije moguće pokrenuti upit", "rate_limited": queued_out}
+            self._ledger_submitted(execution_id, query_id, params)
+
+        # Provjeri status izvršavanja (kratka prva provjera, zatim backoff do roka)
+        polls = 0
+
+        for delay in policy.delays():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            with span("poll_wait"):
+                await asyncio.sleep(min(delay, remaining))
+
+            status_response = await self._make_request(
+                "get",
+                f"execution/{execution_id}/status"
+            )
+            polls += 1
+
+            state = status_response.get("state")
+
+            if state == QUERY_STATE_COMPLETED:
+                self._ledger_state(execution_id, state)
+                return execution_id, polls, None
+
+            elif state in QUERY_STATE_FINAL_ERRORS:
+                self._ledger_state(execution_id, state)
+                return execution_id, polls, self._finish_polling(query_id, polls, state, {"error": f"Upit nije uspješno izvršen. Status: {state}"})
+
+        return execution_id, polls, self._finish_polling(query_id, polls, "TIMEOUT", {"error": "Isteklo vrijeme za izvršavanje upita"})
+
+    async def _submit(self, query_id: int, params: Optional[Dict[str, Any]], priority: int, deadline: float) -> Tuple[Optional[str], bool]:
+        """
+        Pokreće izvršavanje kad limiter dopusti; nakon odgovora 429 pokušava ponovno do roka
+
+        Vraća (execution_id, je li isteklo čekanje na limiter); bez execution_id
+        i bez isteka čekanja Dune nije pokrenuo izvršavanje.
+        """
+        key = cache_key(query_id, params)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not await self.limiter.acquire(priority, key, remaining):
+                print(f"Isteklo vrijeme čekanja na pokretanje upita {query_id} (rate limit)")
+                return None, True
+
+            rate_limited = self.limiter.rate_limited
+            execution_response = await self._make_request(
+                "post",
+                f"query/{query_id}/execute",
+                data=self._execute_payload(params)
+            )
+            execution_id = execution_response.get("execution_id")
+            if execution_id or self.limiter.rate_limited == rate_limited:
+                return execution_id, False
+
+    async def iter_result_pages(self, execution_id: str, page_size: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Dohvaća rezultate izvršavanja stranicu po stranicu (limit/offset)
+        """
+        offset = 0
+        while True:
+            page = await self._make_request(
+                "get",
+                f"execution/{execution_id}/results",
+                params={"limit": page_size, "offset": offset}
+            )
+            if not page or "error" in page:
+                raise DuneQueryError(f"Greška pri dohvaćanju rezultata izvršavanja {execution_id} (offset {offset})")
+
+            rows = _result_rows(page)
+            if rows:
+                yield rows
+
+            next_offset = page.get("next_offset")
+            if next_offset is None or not rows:
+                return
+            offset = next_offset
+
+    async def iter_query_pages(self, query_id: int, params: Optional[Dict[str, Any]] = None, page_size: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Izvršava upit i vraća rezultate kao niz stranica redaka
+
+        U memoriji je najviše jedna stranica; veliki rezultati se ne spremaju u priručnu memoriju.
+        """
+        execution_id, _, error = await self._wait_for_execution(query_id, params)
+        if error is not None:
+            raise DuneQueryError(error["error"])
+        async for rows in self.iter_result_pages(execution_id, page_size):
+            yield rows
+
+    async def iter_bitcoin_transactions(self, address: str = None, limit: int = 10, page_size: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Dohvaća Bitcoin transakcije u stranicama od najviše page_size redaka
+        Koristi upit ID 2309372 - Bitcoin transakcije
+        """
+        # Za sada simulirani podaci; s parametriziranim upitom ovo postaje iter_query_pages(2309372, ...)
+        for offset in range(0, limit, page_size):
+            yield self._simulated_bitcoin_transactions(address, min(page_size, limit - offset), offset)
+            # Ustupi event loop između stranica
+            await asyncio.sleep(0)
+
+    async def get_ethereum_price(self) -> float:
+        """
+        Dohvaća trenutnu cijenu Ethereuma
+        Koristi upit ID 2309365 - Ethereum cijena
+        """
+        return self._parse_ethereum_price(await self.execute_query(ETHEREUM_PRICE_QUERY_ID))
+
+    async def get_bitcoin_price(self) -> float:
+        """
+        Dohvaća trenutnu cijenu Bitcoina
+        Koristi upit ID 5132855 - Bitcoin cijena
+        """
+        print(f"Dohvaćanje cijene Bitcoina preko Dune API-ja (query ID: 5132855)...")
+        return self._parse_bitcoin_price(await self.execute_query(BITCOIN_PRICE_QUERY_ID))
+
+    async def get_bitcoin_price_alt(self) -> float:
+        """
+        Alternativni način dohvaćanja cijene Bitcoina
+        Koristi upit ID 2309370 - Bitcoin cijena (alternativni upit)
+        """
+        return self._parse_bitcoin_price_alt(await self.execute_query(BITCOIN_PRICE_ALT_QUERY_ID))
+
+    async def get_ethereum_status(self) -> Dict[str, Any]:
+        """
+        Dohvaća trenutno stanje Ethereum mreže
+        Koristi upit ID 2309366 - Ethereum status
+        """
+        return self._parse_ethereum_status(await self.execute_query(ETHEREUM_STATUS_QUERY_ID))
+
+    async def get_bitcoin_status(self) -> Dict[str, Any]:
+        """
+        Dohvaća trenutno stanje Bitcoin mreže
+        Koristi upit ID 2309371 - Bitcoin status
+        """
+        return self._parse_bitcoin_status(await self.execute_query(BITCOIN_STATUS_QUERY_ID))
+
+    async def get_token_balances(self, address: str) -> List[Dict[str, Any]]:
+        """
+        Dohvaća stanja tokena za određenu adresu
+        Koristi upit ID 2309367 - Token balances
+        """
+        return self._simulated_token_balances(address)
+
+    async def get_transactions(self, address: str) -> List[Dict[str, Any]]:
+        """
+        Dohvaća transakcije za određenu adresu
+        Koristi upit ID 2309368 - Transactions
+        """
+        return self._simulated_transactions(address)
+
+    async def get_bitcoin_transactions(self, address: str = None, limit: int = 10, before_height: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Dohvaća Bitcoin transakcije za određenu adresu ili zadnje transakcije
+        (s before_height samo iz blokova ispod te visine)
+        Koristi upit ID 2309372 - Bitcoin transakcije
+        """
+        return self._simulated_bitcoin_transactions(address, limit, before_height=before_height)
+
+    async def get_bitcoin_block_transactions(self, height: int) -> List[Dict[str, Any]]:
+        """
+        Dohvaća sve transakcije Bitcoin bloka
+        Koristi upit ID 2309372 - Bitcoin transakcije
+        """
+        return self._simulated_bitcoin_block_transactions(height)
+
+    async def get_bitcoin_transaction(self, txid: str) -> Optional[Dict[str, Any]]:
+        """
+        Dohvaća detalje Bitcoin transakcije prema hash-u
+        Koristi upit ID 2309376 - Bitcoin transakcija detalji
+        """
+        return self._simulated_bitcoin_transaction(txid)
+
+    async def get_bitcoin_blocks(self, limit: int = 5, start_height: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Dohvaća zadnje Bitcoin blokove (ili blokove od start_height prema nižim visinama)
+        Koristi upit ID 2309373 - Bitcoin blokovi
+        """
+        return self._simulated_bitcoin_blocks(limit, start_height)
+
+    async def get_bitcoin_block(self, block_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Dohvaća Bitcoin blok prema visini ili hashu
+        Koristi upit ID 2309373 - Bitcoin blokovi
+        """
+        return self._simulated_bitcoin_block(block_id)
+
+    async def get_bitcoin_address_info(self, address: str) -> Dict[str, Any]:
+        """
+        Dohvaća informacije o Bitcoin adresi
+        Koristi upit ID 2309374 - Bitcoin adresa
+        """
+        # Prvo prebrojavanje transakcija adrese prolazi cijeli lanac pa ne smije blokirati event loop
+        return await asyncio.to_thread(self._simulated_bitcoin_address_info, address)
+
+    async def get_bitcoin_price_history(self, days: int = 7) -> List[Dict[str, Any]]:
+        """
+        Dohvaća povijest cijene Bitcoina
+        Koristi upit ID 2309375 - Bitcoin povijest cijena
+        """
+        return self._simulated_bitcoin_price_history(days)
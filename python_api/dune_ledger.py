@@ -0,0 +1,118 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from dune_cache import cache_key
+
+LEDGER_STATE_SUBMITTED = "SUBMITTED"
+LEDGER_STATE_COMPLETED = "QUERY_STATE_COMPLETED"
+LEDGER_FINAL_STATES = ("QUERY_STATE_COMPLETED", "QUERY_STATE_FAILED", "QUERY_STATE_CANCELLED", "QUERY_STATE_EXPIRED")
+_FINAL_STATES_SQL = ", ".join(f"'{state}'" for state in LEDGER_FINAL_STATES)
+
+
+class ExecutionLedger:
+    """
+    Trajna evidencija (SQLite) pokrenutih Dune izvršavanja
+
+    Nakon restarta klijent nastavlja pratiti nedovršena izvršavanja i
+    ponovno koristi svježe završene rezultate umjesto da plaća novo izvršavanje.
+    """
+
+    def __init__(self, path: str, pending_max_age: float = 900):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        # Nedovršeno izvršavanje starije od ovoga se ne nastavlja
+        self.pending_max_age = pending_max_age
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS executions (
+                execution_id TEXT PRIMARY KEY,
+                query_id INTEGER NOT NULL,
+                params TEXT NOT NULL,
+                state TEXT NOT NULL,
+                submitted_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                completed_at REAL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS executions_query ON executions (query_id, params, submitted_at)"
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def record_submitted(self, execution_id: str, query_id: int, params: Optional[Dict[str, Any]] = None) -> None:
+        now = time.time()
+        _, params_key = cache_key(query_id, params)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO executions VALUES (?, ?, ?, ?, ?, ?, NULL)",
+                (execution_id, int(query_id), params_key, LEDGER_STATE_SUBMITTED, now, now),
+            )
+
+    def update_state(self, execution_id: str, state: str) -> None:
+        now = time.time()
+        completed_at = now if state == LEDGER_STATE_COMPLETED else None
+        with self._lock:
+            self._conn.execute(
+                "UPDATE executions SET state = ?, updated_at = ?, completed_at = COALESCE(?, completed_at) "
+                "WHERE execution_id = ?",
+                (state, now, completed_at, execution_id),
+            )
+
+    def find_pending(self, query_id: int, params: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Zadnje nedovršeno izvršavanje upita koje se još isplati pratiti"""
+        _, params_key = cache_key(query_id, params)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT execution_id FROM executions "
+                f"WHERE query_id = ? AND params = ? AND state NOT IN ({_FINAL_STATES_SQL}) AND submitted_at >= ? "
+                "ORDER BY submitted_at DESC LIMIT 1",
+                (int(query_id), params_key, time.time() - self.pending_max_age),
+            ).fetchone()
+        return row[0] if row else None
+
+    def find_completed(self, query_id: int, params: Optional[Dict[str, Any]], max_age: float) -> Optional[str]:
+        """Zadnje uspješno izvršavanje upita mlađe od max_age sekundi"""
+        _, params_key = cache_key(query_id, params)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT execution_id FROM executions "
+                "WHERE query_id = ? AND params = ? AND state = ? AND completed_at >= ? "
+                "ORDER BY completed_at DESC LIMIT 1",
+                (int(query_id), params_key, LEDGER_STATE_COMPLETED, time.time() - max_age),
+            ).fetchone()
+        return row[0] if row else None
+
+    def resumable(self, max_completed_age: float) -> List[Tuple[int, str]]:
+        """
+        Upiti (ID, parametri) s nedovršenim ili nedavno završenim izvršavanjem
+        """
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT query_id, params FROM executions "
+                f"WHERE (state NOT IN ({_FINAL_STATES_SQL}) AND submitted_at >= ?) "
+                "OR (state = ? AND completed_at >= ?)",
+                (now - self.pending_max_age, LEDGER_STATE_COMPLETED, now - max_completed_age),
+            ).fetchall()
+        return [(row[0], row[1]) for row in rows]
+
+    def prune(self, older_than: float = 7 * 24 * 3600) -> int:
+        """Briše zapise starije od older_than sekundi"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM executions WHERE updated_at < ?", (time.time() - older_than,)
+            )
+        return cursor.rowcount
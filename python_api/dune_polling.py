@@ -0,0 +1,44 @@
+import random
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
+
+from dune_queries import (
+    ETHEREUM_PRICE_QUERY_ID, ETHEREUM_STATUS_QUERY_ID, BITCOIN_PRICE_QUERY_ID, BITCOIN_STATUS_QUERY_ID
+)
+
+
+@dataclass(frozen=True)
+class PollingPolicy:
+    """
+    Strategija provjere statusa izvršavanja upita
+
+    Prva provjera je brza, a razmaci zatim rastu eksponencijalno (uz jitter)
+    do max_delay. Ukupno vrijeme čekanja ograničeno je s deadline.
+    """
+
+    first_delay: float = 0.25
+    multiplier: float = 2.0
+    max_delay: float = 5.0
+    # Udio razmaka koji se nasumično dodaje/oduzima (0.2 = ±20%)
+    jitter: float = 0.2
+    deadline: float = 60.0
+
+    def delays(self, rng: Optional[random.Random] = None) -> Iterator[float]:
+        """Beskonačan niz razmaka (u sekundama) prije svake provjere statusa"""
+        rng = rng or random
+        delay = self.first_delay
+        while True:
+            spread = delay * self.jitter
+            yield max(0.0, delay + rng.uniform(-spread, spread))
+            delay = min(delay * self.multiplier, self.max_delay)
+
+
+DEFAULT_POLLING_POLICY = PollingPolicy()
+
+# Cijene i status su brzi upiti, a kraći rok sprječava dugo čekanje ruta
+DEFAULT_QUERY_POLLING: Dict[int, PollingPolicy] = {
+    BITCOIN_PRICE_QUERY_ID: PollingPolicy(first_delay=0.2, max_delay=2.0, deadline=30.0),
+    ETHEREUM_PRICE_QUERY_ID: PollingPolicy(first_delay=0.2, max_delay=2.0, deadline=30.0),
+    ETHEREUM_STATUS_QUERY_ID: PollingPolicy(first_delay=0.25, max_delay=3.0, deadline=45.0),
+    BITCOIN_STATUS_QUERY_ID: PollingPolicy(first_delay=0.25, max_delay=3.0, deadline=45.0),
+}
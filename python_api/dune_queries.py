@@ -0,0 +1,12 @@
+# ID upita na Dune (jedino mjesto gdje su zapisani)
+ETHEREUM_PRICE_QUERY_ID = 2309365
+ETHEREUM_STATUS_QUERY_ID = 2309366
+BITCOIN_PRICE_QUERY_ID = 5132855
+BITCOIN_PRICE_ALT_QUERY_ID = 2309370
+BITCOIN_STATUS_QUERY_ID = 2309371
+
+# Upiti cijena i stanja mreže (svaka stranica ih prikazuje)
+CORE_QUERY_IDS = frozenset({
+    BITCOIN_PRICE_QUERY_ID, ETHEREUM_PRICE_QUERY_ID, BITCOIN_PRICE_ALT_QUERY_ID,
+    ETHEREUM_STATUS_QUERY_ID, BITCOIN_STATUS_QUERY_ID,
+})
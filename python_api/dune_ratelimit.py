@@ -0,0 +1,262 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Hashable, List, Optional
+
+from dune_queries import CORE_QUERY_IDS
+
+# Prioriteti (manji broj ide prvi)
+PRIORITY_CORE = 0  # cijene i stanje mreže (svaka stranica ih prikazuje)
+PRIORITY_INTERACTIVE = 1  # ostali zahtjevi korisnika
+PRIORITY_BACKGROUND = 2  # osvježavanje u pozadini
+
+PRIORITY_NAMES = {PRIORITY_CORE: "core", PRIORITY_INTERACTIVE: "interactive", PRIORITY_BACKGROUND: "background"}
+
+# Pauza nakon odgovora 429 bez zaglavlja Retry-After
+DEFAULT_RETRY_AFTER = 5.0
+
+
+def priority_for(query_id: int) -> int:
+    return PRIORITY_CORE if int(query_id) in CORE_QUERY_IDS else PRIORITY_INTERACTIVE
+
+
+def parse_retry_after(value: Optional[str], default: float = DEFAULT_RETRY_AFTER) -> float:
+    """Retry-After u sekundama (broj sekundi ili HTTP datum)"""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+class TokenBucket:
+    """
+    Token bucket: rate tokena u sekundi, najviše capacity odjednom
+
+    Nije thread-safe; koristi se unutar lokota ili event loopa limitera.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Sekunde do sljedećeg tokena (0 ako je token dostupan)"""
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+
+class _RateLimiterBase:
+    """
+    Zajednička logika limitera izvršavanja Dune upita
+
+    Token bucket ograničava broj pokrenutih izvršavanja (troše kredite i
+    rate limit), a red s prioritetima određuje tko dobiva sljedeći token:
+    cijene i stanje mreže, zatim ostali zahtjevi korisnika, pa tek onda
+    osvježavanje u pozadini. Nakon odgovora 429 sva izvršavanja čekaju
+    koliko kaže Retry-After.
+    """
+
+    def __init__(self, rate: float = 40 / 60, burst: float = 10):
+        self.bucket = TokenBucket(rate, burst)
+        self.paused_until = 0.0
+        # Red čekanja: [prioritet, redni broj, čekatelj]
+        self._heap: List[list] = []
+        self._waiting: Dict[Hashable, list] = {}
+        self._sequence = itertools.count()
+
+        self.acquired = {name: 0 for name in PRIORITY_NAMES.values()}
+        self.timeouts = 0
+        self.rate_limited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _delay(self, now: float) -> float:
+        return max(self.paused_until - now, self.bucket.delay(now))
+
+    def _record_acquired(self, priority: int, waited: float) -> None:
+        self.acquired[PRIORITY_NAMES.get(priority, str(priority))] += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+    def _push(self, priority: int, key: Optional[Hashable], waiter: Any) -> list:
+        entry = [priority, next(self._sequence), waiter]
+        heapq.heappush(self._heap, entry)
+        if key is not None:
+            self._waiting[key] = entry
+        return entry
+
+    def _remove(self, entry: list, key: Optional[Hashable]) -> None:
+        if entry in self._heap:
+            self._heap.remove(entry)
+            heapq.heapify(self._heap)
+        if key is not None and self._waiting.get(key) is entry:
+            del self._waiting[key]
+
+    def _promote(self, key: Hashable, priority: int) -> bool:
+        entry = self._waiting.get(key)
+        if entry is None or entry[0] <= priority:
+            return False
+        entry[0] = priority
+        heapq.heapify(self._heap)
+        return True
+
+    def _pause(self, seconds: float) -> None:
+        self.rate_limited += 1
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def queue_depth(self) -> Dict[str, int]:
+        depth = {name: 0 for name in PRIORITY_NAMES.values()}
+        for priority, _, _ in list(self._heap):
+            depth[PRIORITY_NAMES.get(priority, str(priority))] += 1
+        return depth
+
+    def stats(self) -> Dict[str, Any]:
+        acquired = sum(self.acquired.values())
+        return {
+            "queue_depth": self.queue_depth(),
+            "acquired": dict(self.acquired),
+            "timeouts": self.timeouts,
+            "rate_limited": self.rate_limited,
+            "paused_for": round(max(0.0, self.paused_until - time.monotonic()), 3),
+            "tokens": round(self.bucket.tokens, 3),
+            "total_wait": round(self.total_wait, 3),
+            "mean_wait": round(self.total_wait / acquired, 3) if acquired else 0.0,
+            "max_wait": round(self.max_wait, 3),
+        }
+
+
+class RateLimiter(_RateLimiterBase):
+    """Limiter izvršavanja za sinkroni klijent (dretve)"""
+
+    def __init__(self, rate: float = 40 / 60, burst: float = 10):
+        super().__init__(rate, burst)
+        self._condition = threading.Condition()
+
+    def acquire(self, priority: int = PRIORITY_INTERACTIVE, key: Optional[Hashable] = None, timeout: Optional[float] = None) -> bool:
+        """Čeka na token (redom prioriteta); False ako je isteklo timeout sekundi"""
+        start = time.monotonic()
+        with self._condition:
+            entry = self._push(priority, key, threading.get_ident())
+            try:
+                while True:
+                    now = time.monotonic()
+                    delay = self._delay(now)
+                    if self._heap[0] is entry and delay <= 0:
+                        self.bucket.take()
+                        # Prioritet je možda podignut dok je zahtjev čekao
+                        self._record_acquired(entry[0], now - start)
+                        return True
+                    if timeout is not None and now - start >= timeout:
+                        self.timeouts += 1
+                        return False
+                    wait = delay if self._heap[0] is entry else None
+                    if timeout is not None:
+                        remaining = timeout - (now - start)
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._condition.wait(wait)
+            finally:
+                self._remove(entry, key)
+                self._condition.notify_all()
+
+    def promote(self, key: Hashable, priority: int) -> None:
+        with self._condition:
+            if self._promote(key, priority):
+                self._condition.notify_all()
+
+    def pause(self, seconds: float) -> None:
+        """Odgovor 429: nova izvršavanja čekaju seconds sekundi"""
+        with self._condition:
+            self._pause(seconds)
+
+
+class AsyncRateLimiter(_RateLimiterBase):
+    """Limiter izvršavanja za asinkroni klijent (jedan event loop)"""
+
+    def __init__(self, rate: float = 40 / 60, burst: float = 10):
+        super().__init__(rate, burst)
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def acquire(self, priority: int = PRIORITY_INTERACTIVE, key: Optional[Hashable] = None, timeout: Optional[float] = None) -> bool:
+        """Čeka na token (redom prioriteta); False ako je isteklo timeout sekundi"""
+        start = time.monotonic()
+        if not self._heap and self._delay(start) <= 0:
+            self.bucket.take()
+            self._record_acquired(priority, 0.0)
+            return True
+
+        future = asyncio.get_running_loop().create_future()
+        entry = self._push(priority, key, future)
+        self._dispatch()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            self._remove(entry, key)
+            if future.done() and not future.cancelled():
+                # Token je dodijeljen u trenutku isteka
+                self._record_acquired(entry[0], time.monotonic() - start)
+                return True
+            future.cancel()
+            self.timeouts += 1
+            self._dispatch()
+            return False
+        except asyncio.CancelledError:
+            self._remove(entry, key)
+            if future.done() and not future.cancelled():
+                # Dodijeljeni token se vraća
+                self.bucket.tokens += 1
+            future.cancel()
+            self._dispatch()
+            raise
+        # Prioritet je možda podignut dok je zahtjev čekao
+        self._record_acquired(entry[0], time.monotonic() - start)
+        return True
+
+    def _dispatch(self) -> None:
+        """Dodjeljuje tokene čekateljima redom prioriteta i zakazuje sljedeću provjeru"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._heap:
+            now = time.monotonic()
+            delay = self._delay(now)
+            if delay > 0:
+                self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+            entry = heapq.heappop(self._heap)
+            future = entry[2]
+            for key, waiting in list(self._waiting.items()):
+                if waiting is entry:
+                    del self._waiting[key]
+            if not future.done():
+                self.bucket.take()
+                future.set_result(None)
+
+    def promote(self, key: Hashable, priority: int) -> None:
+        if self._promote(key, priority):
+            self._dispatch()
+
+    def pause(self, seconds: float) -> None:
+        """Odgovor 429: nova izvršavanja čekaju seconds sekundi"""
+        self._pause(seconds)
+        if self._heap:
+            self._dispatch()
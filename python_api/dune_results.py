@@ -0,0 +1,247 @@
+import math
+from array import array
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Dune tipovi stupaca -> typecode za array (stupci bez typecodea ostaju liste)
+_DUNE_TYPECODES = {
+    "double": "d",
+    "real": "d",
+    "float": "d",
+    "decimal": "d",
+    "bigint": "q",
+    "integer": "q",
+    "int": "q",
+    "smallint": "q",
+    "tinyint": "q",
+}
+
+OBJECT = "O"
+
+Column = Union[array, List[Any], memoryview]
+
+
+class Schema:
+    """
+    Imena i tipovi stupaca rezultata
+
+    Sheme se dijele (interniraju) pa svi rezultati istog upita koriste isti objekt.
+    """
+
+    __slots__ = ("names", "types", "index")
+    _interned: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], "Schema"] = {}
+
+    def __init__(self, names: Tuple[str, ...], types: Tuple[str, ...]):
+        self.names = names
+        self.types = types
+        self.index = {name: i for i, name in enumerate(names)}
+
+    @classmethod
+    def get(cls, names: Sequence[str], types: Sequence[str]) -> "Schema":
+        key = (tuple(names), tuple(types))
+        schema = cls._interned.get(key)
+        if schema is None:
+            schema = cls._interned[key] = cls(*key)
+        return schema
+
+
+def _typecode_for(values: Sequence[Any], dune_type: Optional[str] = None) -> str:
+    if dune_type:
+        typecode = _DUNE_TYPECODES.get(dune_type.split("(")[0].strip().lower())
+        if typecode is not None and all(v is None or isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+            # Cijeli brojevi s nedostajućim ili decimalnim vrijednostima prelaze u double (NaN)
+            if typecode == "q" and any(v is None or isinstance(v, float) for v in values):
+                return "d"
+            return typecode
+        return OBJECT
+
+    present = [v for v in values if v is not None]
+    if not present or any(isinstance(v, bool) or not isinstance(v, (int, float)) for v in present):
+        return OBJECT
+    if len(present) == len(values) and all(isinstance(v, int) for v in present):
+        return "q"
+    return "d"
+
+
+def _make_column(values: Sequence[Any], typecode: str) -> Column:
+    if typecode == OBJECT:
+        return list(values)
+    if typecode == "d":
+        return array("d", (math.nan if v is None else float(v) for v in values))
+    return array(typecode, values)
+
+
+def _build_column(values: Sequence[Any], typecode: str) -> Tuple[Column, str]:
+    try:
+        return _make_column(values, typecode), typecode
+    except OverflowError:
+        # Vrijednosti izvan 64-bitnog raspona ostaju Python objekti
+        return list(values), OBJECT
+
+
+class ColumnarResult:
+    """
+    Rezultat Dune upita u stupčanom obliku
+
+    Brojčani stupci su array.array (8 bajtova po vrijednosti, bez ključeva po
+    retku), a rezanje (slice) ne kopira podatke. Ponaša se i kao niz redaka
+    (len, indeksiranje, iteracija) pa postojeći kod koji čita retke i dalje radi.
+    """
+
+    __slots__ = ("schema", "columns", "length")
+
+    def __init__(self, schema: Schema, columns: List[Column], length: int):
+        self.schema = schema
+        self.columns = columns
+        self.length = length
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Sequence[Dict[str, Any]],
+        names: Optional[Sequence[str]] = None,
+        dune_types: Optional[Sequence[str]] = None,
+    ) -> "ColumnarResult":
+        if names is None:
+            names = list(rows[0].keys()) if rows else []
+            for row in rows:
+                for name in row:
+                    if name not in names:
+                        names.append(name)
+
+        raw_columns = [[row.get(name) for row in rows] for name in names]
+        typecodes = [
+            _typecode_for(values, dune_types[i] if dune_types and i < len(dune_types) else None)
+            for i, values in enumerate(raw_columns)
+        ]
+        built = [_build_column(values, typecode) for values, typecode in zip(raw_columns, typecodes)]
+        columns = [column for column, _ in built]
+        return cls(Schema.get(names, [typecode for _, typecode in built]), columns, len(rows))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ColumnarResult":
+        """Suprotno od to_dict() (npr. pri učitavanju s diska)"""
+        schema = Schema.get(data["names"], data["types"])
+        columns = [_make_column(values, typecode) for values, typecode in zip(data["columns"], schema.types)]
+        return cls(schema, columns, data["length"])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Kompaktan JSON-serijalizabilan oblik (stupci umjesto redaka)"""
+        return {
+            "names": list(self.schema.names),
+            "types": list(self.schema.types),
+            "columns": [
+                [None if isinstance(v, float) and math.isnan(v) else v for v in column]
+                if typecode == "d" else list(column)
+                for column, typecode in zip(self.columns, self.schema.types)
+            ],
+            "length": self.length,
+        }
+
+    # Pristup stupcima
+
+    def column(self, name: str) -> Column:
+        """Stupac bez kopiranja (memoryview za brojčane stupce)"""
+        column = self.columns[self.schema.index[name]]
+        return memoryview(column) if isinstance(column, array) else column
+
+    def first(self, name: str, default: Any = None) -> Any:
+        """Vrijednost stupca u prvom retku ili default"""
+        i = self.schema.index.get(name)
+        if i is None or self.length == 0:
+            return default
+        value = self.columns[i][0]
+        if value is None or isinstance(value, float) and math.isnan(value):
+            return default
+        return value
+
+    def slice(self, start: int, stop: Optional[int] = None) -> "ColumnarResult":
+        """Retci [start, stop) bez kopiranja brojčanih stupaca"""
+        start, stop, _ = slice(start, stop).indices(self.length)
+        columns = [
+            memoryview(column)[start:stop] if isinstance(column, array) else column[start:stop]
+            for column in self.columns
+        ]
+        return ColumnarResult(self.schema, columns, max(0, stop - start))
+
+    # Agregacije nad cijelim stupcem
+
+    def _numeric(self, name: str) -> List[float]:
+        return [v for v in self.column(name) if v is not None and not (isinstance(v, float) and math.isnan(v))]
+
+    def sum(self, name: str) -> float:
+        return math.fsum(self._numeric(name))
+
+    def mean(self, name: str) -> Optional[float]:
+        values = self._numeric(name)
+        return math.fsum(values) / len(values) if values else None
+
+    def min(self, name: str) -> Optional[float]:
+        values = self._numeric(name)
+        return min(values) if values else None
+
+    def max(self, name: str) -> Optional[float]:
+        values = self._numeric(name)
+        return max(values) if values else None
+
+    # Pristup po retcima (kompatibilnost s listom rječnika)
+
+    def row(self, i: int) -> Dict[str, Any]:
+        values = {}
+        for name, column, typecode in zip(self.schema.names, self.columns, self.schema.types):
+            value = column[i]
+            if typecode == "d" and math.isnan(value):
+                value = None
+            values[name] = value
+        return values
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __repr__(self) -> str:
+        return f"<ColumnarResult {self.length} redaka, stupci: {', '.join(self.schema.names)}>"
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        if i < 0:
+            i += self.length
+        if not 0 <= i < self.length:
+            raise IndexError("Indeks retka izvan raspona")
+        return self.row(i)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self.length):
+            yield self.row(i)
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+
+def to_columnar(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Zamjenjuje retke u odgovoru execution/{id}/results stupčanim rezultatom
+
+    Koristi imena i tipove stupaca iz metapodataka odgovora kad postoje.
+    """
+    body = result.get("result") if result else None
+    if not isinstance(body, dict) or not isinstance(body.get("rows"), list):
+        return result
+
+    metadata = body.get("metadata") or {}
+    names = metadata.get("column_names")
+    if names is not None and body["rows"] and any(name not in body["rows"][0] for name in names):
+        names = None
+    columnar = ColumnarResult.from_rows(body["rows"], names, metadata.get("column_types") if names else None)
+    return {**result, "result": {**body, "rows": columnar}}
+
+
+def encode_columnar(value: Any) -> Any:
+    """json.dumps default= za rezultate sa stupčanim retcima"""
+    if isinstance(value, ColumnarResult):
+        return {"__columnar__": value.to_dict()}
+    raise TypeError(f"Objekt tipa {type(value).__name__} nije JSON serijalizabilan")
+
+
+def decode_columnar(obj: Dict[str, Any]) -> Any:
+    """json.loads object_hook= za rezultate sa stupčanim retcima"""
+    if "__columnar__" in obj and len(obj) == 1:
+        return ColumnarResult.from_dict(obj["__columnar__"])
+    return obj
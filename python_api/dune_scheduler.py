@@ -0,0 +1,110 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+
+from dune_client import AsyncDuneClient
+from dune_queries import (
+    ETHEREUM_PRICE_QUERY_ID, ETHEREUM_STATUS_QUERY_ID, BITCOIN_PRICE_QUERY_ID, BITCOIN_STATUS_QUERY_ID
+)
+
+# Upiti koje osvježavamo u pozadini (cijene i stanje mreže)
+DEFAULT_REFRESH_QUERIES = [
+    BITCOIN_PRICE_QUERY_ID,
+    ETHEREUM_PRICE_QUERY_ID,
+    ETHEREUM_STATUS_QUERY_ID,
+    BITCOIN_STATUS_QUERY_ID,
+]
+
+
+@dataclass
+class RefreshJob:
+    query_id: int
+    params: Optional[Dict[str, Any]] = None
+    interval: float = 60
+    next_attempt: float = field(default=0.0)
+
+
+class RefreshScheduler:
+    """
+    Osvježava registrirane upite u pozadini prije nego im istekne TTL
+
+    Rute tako uvijek dobiju zadnju dobru vrijednost iz priručne memorije
+    umjesto da čekaju na cijelo izvršavanje upita.
+    """
+
+    def __init__(
+        self,
+        client: AsyncDuneClient,
+        refresh_ahead: float = 0.8,
+        tick: float = 1.0,
+        retry_delay: float = 15.0,
+        ledger_retention: Optional[float] = None,
+        prune_interval: float = 3600.0,
+    ):
+        if client.cache is None:
+            raise ValueError("RefreshScheduler zahtijeva klijent s priručnom memorijom")
+
+        self.client = client
+        # Osvježava se kad zapis dosegne ovaj udio svog TTL-a
+        self.refresh_ahead = refresh_ahead
+        self.tick = tick
+        # Razmak između pokušaja kad osvježavanje ne uspije
+        self.retry_delay = retry_delay
+        self.jobs: List[RefreshJob] = []
+        # Zapisi evidencije izvršavanja stariji od ledger_retention brišu se svakih prune_interval sekundi
+        self.ledger_retention = ledger_retention
+        self.prune_interval = prune_interval
+        self._next_prune = time.time() + prune_interval
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, query_id: int, params: Optional[Dict[str, Any]] = None, interval: Optional[float] = None) -> RefreshJob:
+        """Registrira upit za periodično osvježavanje"""
+        if interval is None:
+            interval = self.client.cache.ttl_for(query_id) * self.refresh_ahead
+        job = RefreshJob(query_id=query_id, params=params, interval=interval)
+        self.jobs.append(job)
+        return job
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _due(self, job: RefreshJob, now: float) -> bool:
+        if now < job.next_attempt:
+            return False
+        entry = self.client.cache.peek(job.query_id, job.params)
+        return entry is None or entry.age >= job.interval
+
+    async def _run(self) -> None:
+        while True:
+            now = time.time()
+            for job in self.jobs:
+                if self._due(job, now):
+                    # Ako osvježavanje ne uspije, zapis ostaje star pa se pokušava ponovno nakon retry_delay
+                    job.next_attempt = now + min(self.retry_delay, job.interval)
+                    self.client.schedule_refresh(job.query_id, job.params)
+            if now >= self._next_prune:
+                self._next_prune = now + self.prune_interval
+                self.prune_ledger()
+            await asyncio.sleep(self.tick)
+
+    def prune_ledger(self) -> int:
+        """Briše stare zapise evidencije izvršavanja; vraća broj obrisanih"""
+        if self.client.ledger is None or self.ledger_retention is None:
+            return 0
+        try:
+            return self.client.ledger.prune(older_than=self.ledger_retention)
+        except Exception as e:
+            print(f"Greška pri brisanju starih zapisa evidencije: {str(e)}")
+            return 0
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+import zlib
+from typing import Dict, Any, Optional
+
+from dune_cache import ResultCache, cache_key
+from dune_results import encode_columnar, decode_columnar
+
+STORE_SUFFIX = ".json.z"
+
+
+class ResultStore:
+    """
+    Trajna pohrana završenih rezultata Dune upita na lokalnom disku
+
+    Svaki rezultat je jedna zlib-komprimirana JSON datoteka s vremenom
+    dohvaćanja. Zapisivanje ide u pozadinskoj dretvi pa ne usporava rute,
+    a pri pokretanju se priručna memorija puni iz spremljenih rezultata.
+    """
+
+    def __init__(self, directory: str, max_age: float = 24 * 3600, max_bytes: int = 64 * 1024 * 1024):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._worker = threading.Thread(target=self._write_loop, name="dune-result-store", daemon=True)
+        self._worker.start()
+
+    def _path(self, query_id: int, params: Optional[Dict[str, Any]]) -> str:
+        _, params_key = cache_key(query_id, params)
+        digest = hashlib.sha1(params_key.encode()).hexdigest()[:16]
+        return os.path.join(self.directory, f"{int(query_id)}-{digest}{STORE_SUFFIX}")
+
+    def save(self, query_id: int, params: Optional[Dict[str, Any]], value: Dict[str, Any], fetched_at: Optional[float] = None) -> None:
+        """Sprema rezultat u pozadini (ne blokira pozivatelja)"""
+        self._queue.put((query_id, params, value, fetched_at or time.time()))
+
+    def flush(self) -> None:
+        """Čeka da se zapišu svi rezultati u redu"""
+        self._queue.join()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._worker.join()
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+            except Exception as e:
+                # Neuspjeli zapis ne smije zaustaviti dretvu (inače flush() čeka zauvijek, a red raste)
+                print(f"Greška pri spremanju rezultata na disk: {type(e).__name__}: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, query_id: int, params: Optional[Dict[str, Any]], value: Dict[str, Any], fetched_at: float) -> None:
+        payload = json.dumps(
+            {"query_id": int(query_id), "params": params, "fetched_at": fetched_at, "value": value},
+            separators=(",", ":"),
+            default=encode_columnar,
+        ).encode()
+        path = self._path(query_id, params)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(zlib.compress(payload, 6))
+        os.replace(tmp_path, path)
+        self.prune()
+
+    def prune(self) -> None:
+        """Briše prestare datoteke i najstarije datoteke iznad max_bytes"""
+        now = time.time()
+        files = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(STORE_SUFFIX):
+                continue
+            stat = entry.stat()
+            if now - stat.st_mtime > self.max_age:
+                os.remove(entry.path)
+            else:
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+    def load_into(self, cache: ResultCache) -> int:
+        """
+        Puni priručnu memoriju spremljenim rezultatima mlađim od max_age
+
+        Zapisi zadržavaju izvorno vrijeme dohvaćanja pa se istekli rezultati
+        poslužuju kao zastarjeli i osvježavaju u pozadini.
+        """
+        self.prune()
+        loaded = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(STORE_SUFFIX):
+                continue
+            try:
+                with open(entry.path, "rb") as f:
+                    record = json.loads(zlib.decompress(f.read()), object_hook=decode_columnar)
+            except (OSError, ValueError, zlib.error) as e:
+                print(f"Neispravna datoteka s rezultatom {entry.name}: {str(e)}")
+                continue
+            if time.time() - record["fetched_at"] <= self.max_age:
+                loaded.append(record)
+
+        # Najnoviji rezultati se učitavaju zadnji pa ih LRU zadržava
+        for record in sorted(loaded, key=lambda r: r["fetched_at"]):
+            cache.set(record["query_id"], record["params"], record["value"], fetched_at=record["fetched_at"])
+        return len(loaded)
@@ -0,0 +1,186 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Any, Hashable, Mapping, Optional
+
+from pydantic import TypeAdapter
+from starlette.responses import Response
+
+# orjson je višestruko brži od json modula (pip install orjson); bez njega se koristi json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def dumps(value: Any) -> bytes:
+    """Kompaktni JSON (UTF-8) kao kod Starlette JSONResponse"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(body: bytes) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+_adapters: Dict[Any, TypeAdapter] = {}
+
+
+def validate(annotation: Any, value: Any) -> Any:
+    """
+    Validira podatke jednom (npr. List[BitcoinTransaction]) i vraća ih kao
+    obične rječnike i liste spremne za kodiranje u JSON
+    """
+    adapter = _adapters.get(annotation)
+    if adapter is None:
+        adapter = _adapters[annotation] = TypeAdapter(annotation)
+    return adapter.dump_python(adapter.validate_python(value), mode="json")
+
+
+def etag_for(body: bytes) -> str:
+    """Jaki ETag iz sadržaja odgovora (isti na svim workerima i nakon restarta)"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def cache_headers(etag: str, last_modified: Optional[float], max_age: float) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={max(0, int(max_age))}"}
+    if last_modified is not None:
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+    return headers
+
+
+def is_not_modified(request_headers: Mapping[str, str], etag: str, last_modified: Optional[float]) -> bool:
+    """
+    Ima li klijent već ovu verziju odgovora (If-None-Match, inače If-Modified-Since)
+
+    If-None-Match se uspoređuje slabo (W/"..." odgovara "..."), kako traži RFC 9110.
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            return int(last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class FastJSONResponse(Response):
+    """
+    JSON odgovor kodiran s orjson (ako je dostupan)
+
+    Ruta koja vrati Response preskače FastAPI validaciju response_modela i
+    jsonable_encoder pa podatke treba validirati prije (vidi validate).
+    Sadržaj može biti i već kodiran (bytes), a izvorni podaci ostaju u data
+    (koristi ih batch ruta).
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, content: Any, status_code: int = 200, headers: Optional[Mapping[str, str]] = None, data: Any = None):
+        self._data = content if data is None and not isinstance(content, bytes) else data
+        super().__init__(content, status_code=status_code, headers=headers)
+
+    @property
+    def data(self) -> Any:
+        # Već kodirani sadržaj (npr. iz lokalnog indeksa) dekodira se tek kad zatreba
+        if self._data is None:
+            self._data = loads(self.body)
+        return self._data
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+@dataclass
+class EncodedResponse:
+    data: Any
+    body: bytes
+    version: Hashable
+    created_at: float
+    etag: str
+    last_modified: Optional[float] = None
+
+    def response(self, headers: Optional[Mapping[str, str]] = None) -> FastJSONResponse:
+        return FastJSONResponse(self.body, headers=headers, data=self.data)
+
+
+class ResponseCache:
+    """
+    Kodirani JSON odgovori po ključu i verziji podataka s LRU izbacivanjem
+
+    Verzija je nešto što se mijenja kad se promijene podaci (npr. visina
+    vrha lanca), pa se isti odgovor ne validira i ne kodira ponovno dok se
+    podaci ne promijene. ETag se računa jednom, pri kodiranju. Ukupna
+    veličina tijela odgovora je ograničena s max_bytes.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, EncodedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, version: Hashable) -> Optional[EncodedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: Hashable, version: Hashable, data: Any, last_modified: Optional[float] = None) -> EncodedResponse:
+        """Kodira podatke i sprema odgovor (prevelik odgovor se ne sprema)"""
+        body = dumps(data)
+        entry = EncodedResponse(data, body, version, time.time(), etag_for(body), last_modified)
+        if len(entry.body) > self.max_bytes:
+            return entry
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous.body)
+            self._entries[key] = entry
+            self._bytes += len(entry.body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.body)
+                self.evictions += 1
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,137 @@
+import asyncio
+import contextvars
+from typing import Awaitable, Callable, Dict, Any, AsyncIterator, Iterable, Optional, Set
+
+from json_response import dumps
+
+# Razmak između komentara koji drže SSE vezu otvorenom (proxyji zatvaraju neaktivne veze)
+KEEPALIVE_INTERVAL = 15.0
+# Koliko dugo klijent čeka prije ponovnog spajanja (EventSource retry)
+RECONNECT_DELAY_MS = 3000
+
+
+def sse_message(event: str, data: bytes, event_id: Optional[int] = None) -> bytes:
+    """Jedna Server-Sent Events poruka (data je JSON u jednom retku)"""
+    message = b"event: " + event.encode("utf-8") + b"\n"
+    if event_id is not None:
+        message += b"id: " + str(event_id).encode("ascii") + b"\n"
+    return message + b"data: " + data + b"\n\n"
+
+
+class LiveChannel:
+    """
+    Kanal s obavijestima uživo (SSE) za sve spojene klijente
+
+    Jedan zadatak u pozadini svakih interval sekundi poziva snapshot() (npr.
+    stanje mreže i zadnji blokovi) i šalje samo događaje čiji se sadržaj
+    promijenio, pa N spojenih klijenata košta jedan dohvat po osvježavanju.
+    Zadatak radi samo dok postoji barem jedan pretplatnik. Novi pretplatnik
+    odmah dobiva zadnje poznate vrijednosti svih događaja, a spori klijent
+    gubi najstarije neposlane poruke umjesto da usporava ostale.
+
+    Polja iz volatile_fields (npr. stale_age, starost podataka koja raste
+    pri svakom osvježavanju) ne uspoređuju se pri otkrivanju promjene, ali
+    se šalju s ostatkom događaja.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        snapshot: Callable[[], Awaitable[Dict[str, Any]]],
+        interval: float = 5.0,
+        queue_size: int = 16,
+        keepalive: float = KEEPALIVE_INTERVAL,
+        volatile_fields: Iterable[str] = (),
+    ):
+        self.name = name
+        self.snapshot = snapshot
+        self.interval = interval
+        self.queue_size = queue_size
+        self.keepalive = keepalive
+        self.volatile_fields = frozenset(volatile_fields)
+
+        self.subscribers: Set[asyncio.Queue] = set()
+        # Zadnji sadržaj (bez volatile_fields) i zadnja poruka po događaju (za nove pretplatnike)
+        self._bodies: Dict[str, bytes] = {}
+        self.latest: Dict[str, bytes] = {}
+        self.sequence = 0
+        self._task: Optional[asyncio.Task] = None
+
+        self.refreshes = 0
+        self.published = 0
+        self.dropped = 0
+
+    def publish(self, event: str, data: Any) -> bool:
+        """Šalje događaj svim pretplatnicima ako se sadržaj promijenio"""
+        body = dumps(data)
+        if self.volatile_fields and isinstance(data, dict):
+            compared = dumps({key: value for key, value in data.items() if key not in self.volatile_fields})
+        else:
+            compared = body
+        if self._bodies.get(event) == compared:
+            return False
+        self._bodies[event] = compared
+        self.sequence += 1
+        message = sse_message(event, body, self.sequence)
+        self.latest[event] = message
+        self.published += 1
+        for queue in self.subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(message)
+        return True
+
+    async def refresh(self) -> None:
+        """Jedan dohvat podataka za sve pretplatnike"""
+        self.refreshes += 1
+        for event, data in (await self.snapshot()).items():
+            self.publish(event, data)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Greška pri osvježavanju kanala {self.name}: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    async def subscribe(self) -> AsyncIterator[bytes]:
+        """SSE tok za jednog klijenta (završava kad se klijent odspoji)"""
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        for message in self.latest.values():
+            queue.put_nowait(message)
+        self.subscribers.add(queue)
+        if self._task is None or self._task.done():
+            # Zadatak nadživljava zahtjev koji ga je pokrenuo pa ne nasljeđuje njegov kontekst (trag zahtjeva)
+            self._task = contextvars.Context().run(asyncio.create_task, self._run())
+
+        try:
+            yield f"retry: {RECONNECT_DELAY_MS}\n\n".encode("ascii")
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), self.keepalive)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+        finally:
+            self.subscribers.discard(queue)
+            if not self.subscribers:
+                self.stop()
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        # Bez pretplatnika se podaci ne osvježavaju pa sljedeći pretplatnik čeka novi dohvat
+        self._bodies.clear()
+        self.latest.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "subscribers": len(self.subscribers),
+            "refreshes": self.refreshes,
+            "published": self.published,
+            "dropped": self.dropped,
+        }
@@ -1,15 +1,204 @@
-from fastapi import FastAPI, HTTPException, Depends
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 import os
 from dotenv import load_dotenv
-from typing import List, Optional, Dict, Any
-from dune_client import DuneClient
+from typing import List, Optional, Dict, Any, Awaitable, Callable, Tuple, AsyncIterator
+from dune_client import AsyncDuneClient, DuneQueryError
+from dune_queries import (
+    ETHEREUM_PRICE_QUERY_ID, ETHEREUM_STATUS_QUERY_ID,
+    BITCOIN_PRICE_QUERY_ID, BITCOIN_PRICE_ALT_QUERY_ID, BITCOIN_STATUS_QUERY_ID, CORE_QUERY_IDS
+)
+from dune_cache import ResultCache
+from dune_ledger import ExecutionLedger
+from dune_store import ResultStore
+from dune_scheduler import RefreshScheduler, DEFAULT_REFRESH_QUERIES
+from metrics import (
+    MetricsRegistry, MetricsMiddleware, DuneMetrics, PROMETHEUS_CONTENT_TYPE,
+    cache_collector, singleflight_collector, ratelimit_collector, breaker_collector, runtime_collector,
+    response_cache_collector, live_collector, block_index_collector, tx_index_collector, monitor_event_loop
+)
+from json_response import EncodedResponse, FastJSONResponse, ResponseCache, cache_headers, dumps, etag_for, is_not_modified, validate
+from synthetic_data import BLOCK_INTERVAL
+from live_updates import LiveChannel
+from block_index import BlockIndex, BlockIndexSyncer
+from tx_index import TransactionIndex, decode_cursor, encode_cursor
+from tracing import TimingMiddleware, TimedRoute, TraceLog
 
 # Učitaj varijable iz .env datoteke
 load_dotenv()
 
-app = FastAPI(title="Dune API Python Backend")
+# Dohvati API ključ iz okoline
+DUNE_API_KEY = os.getenv("DUNE_API_KEY", "")
+DUNE_CACHE_MAX_ENTRIES = int(os.getenv("DUNE_CACHE_MAX_ENTRIES", "256"))
+# Direktorij za lokalne podatke (evidencija izvršavanja, spremljeni rezultati...)
+DATA_DIR = os.getenv("PYTHON_API_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+DUNE_LEDGER_PATH = os.getenv("DUNE_LEDGER_PATH", os.path.join(DATA_DIR, "dune_ledger.sqlite3"))
+# Koliko dugo (u sekundama) se čuvaju zapisi evidencije izvršavanja
+DUNE_LEDGER_RETENTION = float(os.getenv("DUNE_LEDGER_RETENTION", str(7 * 24 * 3600)))
+RESULT_STORE_DIR = os.getenv("RESULT_STORE_DIR", os.path.join(DATA_DIR, "results"))
+RESULT_STORE_MAX_AGE = float(os.getenv("RESULT_STORE_MAX_AGE", str(24 * 3600)))
+RESULT_STORE_MAX_BYTES = int(os.getenv("RESULT_STORE_MAX_BYTES", str(64 * 1024 * 1024)))
+DUNE_BACKGROUND_REFRESH = os.getenv("DUNE_BACKGROUND_REFRESH", "1") == "1"
+# Koliko dugo složena ruta čeka na pojedini dio odgovora (u sekundama)
+COMPOSITE_PART_TIMEOUT = float(os.getenv("COMPOSITE_PART_TIMEOUT", "10"))
+
+# Prometheus metrike (/metrics); middleware ih bilježi od prvog zahtjeva
+metrics_registry = MetricsRegistry()
+
+# Strukturirani tragovi zahtjeva (JSON po retku; prazno = isključeno)
+REQUEST_TRACE_LOG = os.getenv("REQUEST_TRACE_LOG", "")
+trace_log = TraceLog(REQUEST_TRACE_LOG) if REQUEST_TRACE_LOG else None
+# Profiliranje pojedinog zahtjeva (X-Profile: 1 ili ?profile=1) samo ako je izričito uključeno
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "0") == "1"
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(DATA_DIR, "profiles"))
+
+# Kodirani JSON odgovori velikih lista (transakcije, blokovi...) po verziji podataka
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256")),
+    max_bytes=int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+)
+# Cache-Control max-age za podatke koji se ne mijenjaju s vremenom (sintetički lanac bez live načina)
+HTTP_MAX_AGE = int(os.getenv("HTTP_MAX_AGE", "60"))
+# Razmak osvježavanja kanala uživo (/api/stream/...) i broj blokova u događaju "blocks"
+LIVE_UPDATE_INTERVAL = float(os.getenv("LIVE_UPDATE_INTERVAL", "5"))
+LIVE_BLOCKS = int(os.getenv("LIVE_BLOCKS", "5"))
+# Lokalni indeks Bitcoin blokova (prazan BLOCK_INDEX_PATH isključuje indeks)
+BLOCK_INDEX_PATH = os.getenv("BLOCK_INDEX_PATH", os.path.join(DATA_DIR, "block_index.sqlite3"))
+BLOCK_INDEX_SYNC_INTERVAL = float(os.getenv("BLOCK_INDEX_SYNC_INTERVAL", "30"))
+BLOCK_INDEX_INITIAL_DEPTH = int(os.getenv("BLOCK_INDEX_INITIAL_DEPTH", "2016"))
+# Lokalni indeks transakcija po adresi (dopunjuje se zajedno s indeksom blokova; prazno isključuje)
+TX_INDEX_PATH = os.getenv("TX_INDEX_PATH", os.path.join(DATA_DIR, "tx_index.sqlite3"))
+# Koliko blokova se čuvaju txid-ovi transakcija nepraćenih adresa i ciljani udio lažno pozitivnih u filtru txid-ova
+TX_INDEX_TXID_RETENTION = int(os.getenv("TX_INDEX_TXID_RETENTION", "144"))
+TXID_FILTER_ERROR_RATE = float(os.getenv("TXID_FILTER_ERROR_RATE", "0.01"))
+# Najveći broj adresa u indeksu transakcija (najdulje nekorištene se uklanjaju)
+TX_INDEX_MAX_ADDRESSES = int(os.getenv("TX_INDEX_MAX_ADDRESSES", "10000"))
+# Najveći broj transakcija po stranici (?limit=)
+MAX_PAGE_LIMIT = int(os.getenv("MAX_PAGE_LIMIT", "1000"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Jedan klijent (i jedan pool konekcija) za cijeli životni vijek aplikacije
+    app.state.result_cache = ResultCache(max_entries=DUNE_CACHE_MAX_ENTRIES)
+    # Prazan DUNE_LEDGER_PATH isključuje evidenciju izvršavanja
+    app.state.execution_ledger = ExecutionLedger(DUNE_LEDGER_PATH) if DUNE_LEDGER_PATH else None
+    if app.state.execution_ledger is not None:
+        app.state.execution_ledger.prune(older_than=DUNE_LEDGER_RETENTION)
+
+    # Rezultati spremljeni prije restarta odmah pune priručnu memoriju (prazan RESULT_STORE_DIR isključuje pohranu)
+    app.state.result_store = None
+    if RESULT_STORE_DIR:
+        app.state.result_store = ResultStore(
+            RESULT_STORE_DIR,
+            max_age=RESULT_STORE_MAX_AGE,
+            max_bytes=RESULT_STORE_MAX_BYTES
+        )
+        app.state.result_store.load_into(app.state.result_cache)
+
+    app.state.dune_client = AsyncDuneClient(
+        DUNE_API_KEY,
+        cache=app.state.result_cache,
+        ledger=app.state.execution_ledger,
+        store=app.state.result_store,
+        metrics=DuneMetrics(metrics_registry)
+    )
+    # Zadnje dobre vrijednosti dijelova složenih odgovora (vrijednost, vrijeme dohvaćanja podataka)
+    app.state.last_good_parts = {}
+
+    # Cijene i stanje mreže osvježavaju se u pozadini prije isteka TTL-a (a stari zapisi evidencije se brišu)
+    app.state.refresh_scheduler = RefreshScheduler(app.state.dune_client, ledger_retention=DUNE_LEDGER_RETENTION)
+    for query_id in DEFAULT_REFRESH_QUERIES:
+        app.state.refresh_scheduler.register(query_id)
+    if DUNE_BACKGROUND_REFRESH:
+        app.state.refresh_scheduler.start()
+
+    # Kanali uživo: jedno osvježavanje za sve spojene klijente (sama promjena starosti podataka se ne šalje)
+    app.state.live_channels = {
+        "bitcoin": LiveChannel(
+            "bitcoin", lambda: bitcoin_live_snapshot(app), interval=LIVE_UPDATE_INTERVAL, volatile_fields=("stale_age",)
+        ),
+        "ethereum": LiveChannel(
+            "ethereum", lambda: ethereum_live_snapshot(app), interval=LIVE_UPDATE_INTERVAL, volatile_fields=("stale_age",)
+        ),
+    }
+
+    # Blokovi se poslužuju iz lokalnog indeksa koji se u pozadini dopunjuje novim blokovima
+    # Transakcije adresa poslužuju se iz indeksa transakcija koji obrađuje nove blokove
+    app.state.block_index = None
+    app.state.block_syncer = None
+    app.state.tx_index = None
+    if BLOCK_INDEX_PATH:
+        app.state.block_index = BlockIndex(BLOCK_INDEX_PATH, initial_depth=BLOCK_INDEX_INITIAL_DEPTH)
+        followers = []
+        if TX_INDEX_PATH:
+            app.state.tx_index = TransactionIndex(
+                TX_INDEX_PATH,
+                txid_retention=TX_INDEX_TXID_RETENTION,
+                filter_error_rate=TXID_FILTER_ERROR_RATE,
+                max_addresses=TX_INDEX_MAX_ADDRESSES,
+                resolve_address=app.state.dune_client.synthetic.alias_address
+            )
+            followers.append(lambda: app.state.tx_index.sync(
+                app.state.block_index,
+                app.state.dune_client.get_bitcoin_block_transactions,
+                normalize=lambda transactions: validate(List[BitcoinTransaction], transactions)
+            ))
+        app.state.block_syncer = BlockIndexSyncer(
+            app.state.block_index,
+            lambda limit, start_height: app.state.dune_client.get_bitcoin_blocks(limit=limit, start_height=start_height),
+            normalize=lambda blocks: validate(List[BitcoinBlock], blocks),
+            interval=BLOCK_INDEX_SYNC_INTERVAL,
+            followers=followers
+        )
+        app.state.block_syncer.start()
+
+    # Statistika priručne memorije, spajanja poziva i zasićenosti čita se pri dohvaćanju /metrics
+    app.state.metrics = metrics_registry
+    metrics_registry.register_collector("cache", cache_collector(app.state.result_cache))
+    metrics_registry.register_collector("singleflight", singleflight_collector(app.state.dune_client.singleflight))
+    metrics_registry.register_collector("ratelimit", ratelimit_collector(app.state.dune_client.limiter))
+    metrics_registry.register_collector("breaker", breaker_collector(app.state.dune_client.breakers))
+    metrics_registry.register_collector("response_cache", response_cache_collector(response_cache))
+    metrics_registry.register_collector("live", live_collector(app.state.live_channels))
+    if app.state.block_index is not None:
+        metrics_registry.register_collector("block_index", block_index_collector(app.state.block_index))
+    if app.state.tx_index is not None:
+        metrics_registry.register_collector("tx_index", tx_index_collector(app.state.tx_index))
+    metrics_registry.register_collector("runtime", runtime_collector)
+    event_loop_monitor = asyncio.create_task(monitor_event_loop(metrics_registry))
+
+    # Izvršavanja pokrenuta prije restarta se nastavljaju umjesto ponovnog plaćanja
+    app.state.dune_client.resume_from_ledger()
+    try:
+        yield
+    finally:
+        event_loop_monitor.cancel()
+        for channel in app.state.live_channels.values():
+            channel.stop()
+        await app.state.refresh_scheduler.stop()
+        if app.state.block_syncer is not None:
+            await app.state.block_syncer.stop()
+            app.state.block_index.close()
+        if app.state.tx_index is not None:
+            app.state.tx_index.close()
+        await app.state.dune_client.aclose()
+        if app.state.execution_ledger is not None:
+            app.state.execution_ledger.close()
+        if app.state.result_store is not None:
+            app.state.result_store.close()
+        if trace_log is not None:
+            trace_log.close()
+
+app = FastAPI(title="Dune API Python Backend", lifespan=lifespan)
+# Rute odvajaju vrijeme funkcije rute od validacije i serijalizacije odgovora
+app.router.route_class = TimedRoute
 
 # Dodaj CORS middleware za komunikaciju s React aplikacijom
 app.add_middleware(
@@ -18,10 +207,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Profile", "ETag", "X-Next-Cursor"],
+)
+app.add_middleware(MetricsMiddleware, registry=metrics_registry)
+app.add_middleware(
+    TimingMiddleware,
+    trace_log=trace_log,
+    profile_dir=PROFILE_DIR,
+    profiling_enabled=PROFILING_ENABLED,
 )
-
-# Dohvati API ključ iz okoline
-DUNE_API_KEY = os.getenv("DUNE_API_KEY", "")
 
 # Ethereum modeli podataka
 class Token(BaseModel):
@@ -46,6 +240,10 @@ class EthereumStatus(BaseModel):
     last_block: int
     gas_price: int
     transactions_count: int
+    stale: bool = False
+    stale_parts: List[str] = []
+    stale_age: Optional[float] = None
+    unavailable_parts: List[str] = []
     
 # Bitcoin modeli podataka
 class BitcoinTransaction(BaseModel):
@@ -89,129 +287,704 @@ class BitcoinStatus(BaseModel):
     transactions_count: int
     difficulty: float
     hashrate: float
+    stale: bool = False
+    stale_parts: List[str] = []
+    stale_age: Optional[float] = None
+    unavailable_parts: List[str] = []
 
 class BitcoinPriceHistory(BaseModel):
     date: str
     price: float
 
+# Batch modeli podataka
+class BatchItem(BaseModel):
+    id: Optional[str] = None
+    type: str
+    params: Dict[str, Any] = {}
+
+class BatchRequest(BaseModel):
+    requests: List[BatchItem]
+
+class BatchResult(BaseModel):
+    id: Optional[str] = None
+    type: str
+    status: int
+    data: Any = None
+    error: Optional[str] = None
+    # Kursor sljedeće stranice (kao zaglavlje X-Next-Cursor odgovarajuće rute)
+    next_cursor: Optional[str] = None
+
+class BatchResponse(BaseModel):
+    results: List[BatchResult]
+
+# Parametri pod-zahtjeva po vrsti (kao parametri odgovarajuće rute; nepoznati parametri su greška)
+class BatchParams(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+class AddressParams(BatchParams):
+    address: str
+
+class BitcoinTransactionsParams(BatchParams):
+    limit: int = 10
+
+class BitcoinAddressTransactionsParams(BatchParams):
+    address: str
+    limit: int = Field(10, ge=1, le=MAX_PAGE_LIMIT)
+    cursor: Optional[str] = None
+
+class BitcoinTransactionParams(BatchParams):
+    txid: str
+
+class BitcoinBlocksParams(BatchParams):
+    limit: int = 5
+    before: Optional[int] = None
+
+class BitcoinBlockParams(BatchParams):
+    block_id: str
+
+class BitcoinPriceHistoryParams(BatchParams):
+    days: int = 7
+
 # Dependency za dohvaćanje Dune klijenta
-def get_dune_client():
-    return DuneClient(DUNE_API_KEY)
+def get_dune_client(request: Request) -> AsyncDuneClient:
+    return request.app.state.dune_client
+
+def chain_version(dune_client: AsyncDuneClient) -> Tuple[int, float, float]:
+    """
+    Verzija podataka lanca (visina vrha), Last-Modified i max-age
+
+    Podaci se mijenjaju tek s novim blokom pa klijenti smiju koristiti
+    odgovor do očekivanog sljedećeg bloka.
+    """
+    synthetic = dune_client.synthetic
+    now = time.time()
+    started_at = min(now, synthetic.tip_started_at())
+    if not synthetic.live:
+        return synthetic.tip_height, started_at, HTTP_MAX_AGE
+    return synthetic.tip_height, started_at, max(0.0, started_at + BLOCK_INTERVAL - now)
+
+def dune_freshness(request: Request, query_ids: List[int]) -> Tuple[Optional[float], float]:
+    """Last-Modified (najnoviji rezultat) i max-age (do isteka TTL-a prvog rezultata) za Dune podatke"""
+    cache = request.app.state.result_cache
+    entries = [entry for entry in (cache.peek(query_id) for query_id in query_ids) if entry is not None]
+    if not entries:
+        return None, 0
+    now = time.time()
+    return max(entry.fetched_at for entry in entries), max(0.0, min(entry.expires_at for entry in entries) - now)
+
+async def cached_entry(
+    key: Tuple[Any, ...],
+    annotation: Any,
+    fetch: Callable[[], Awaitable[Any]],
+    version: Any,
+    last_modified: Optional[float] = None,
+) -> EncodedResponse:
+    """Validirani i kodirani podaci iz priručne memorije odgovora (ili dohvat, validacija i kodiranje)"""
+    entry = response_cache.get(key, version)
+    if entry is None:
+        entry = response_cache.set(key, version, validate(annotation, await fetch()), last_modified)
+    return entry
+
+def not_modified(headers: Dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
+
+async def cached_response(
+    request: Request,
+    key: Tuple[Any, ...],
+    annotation: Any,
+    fetch: Callable[[], Awaitable[Any]],
+    version: Any,
+    last_modified: Optional[float],
+    max_age: float,
+) -> Response:
+    """
+    Kodirani odgovor iz priručne memorije ili dohvat, validacija (jednom) i kodiranje
+
+    Spremljeni odgovor vrijedi dok se ne promijeni verzija podataka (npr. vrh
+    lanca). Ako klijent već ima istu verziju (If-None-Match), vraća se 304 bez
+    dohvaćanja i kodiranja.
+    """
+    entry = await cached_entry(key, annotation, fetch, version, last_modified)
+    headers = cache_headers(entry.etag, entry.last_modified, max_age)
+    if request.method == "GET" and is_not_modified(request.headers, entry.etag, entry.last_modified):
+        return not_modified(headers)
+    return entry.response(headers)
+
+def json_response(request: Request, data: Any, last_modified: Optional[float], max_age: float) -> Response:
+    """Validirani podaci kao JSON s ETag/Cache-Control zaglavljima (304 ako ih klijent već ima)"""
+    return raw_json_response(request, dumps(data), last_modified, max_age, data=data)
+
+def raw_json_response(request: Request, body: bytes, last_modified: Optional[float], max_age: float, data: Any = None) -> Response:
+    """Već kodirani JSON (npr. iz lokalnog indeksa) s ETag/Cache-Control zaglavljima"""
+    headers = cache_headers(etag_for(body), last_modified, max_age)
+    if request.method == "GET" and is_not_modified(request.headers, headers["ETag"], last_modified):
+        return not_modified(headers)
+    return FastJSONResponse(body, headers=headers, data=data)
+
+def current_block_index(app: FastAPI) -> Optional[BlockIndex]:
+    """
+    Lokalni indeks blokova (None ako je isključen ili još prazan)
+
+    Zahtjev ne čeka sinkronizaciju: ako indeks zaostaje za vrhom lanca,
+    sinkronizacija se pokreće u pozadini, a rute iz indeksa poslužuju samo
+    raspon koji sadrži (ostalo dohvaćaju izravno).
+    """
+    index = app.state.block_index
+    if index is None:
+        return None
+    if index.tip_height is None or index.tip_height < app.state.dune_client.synthetic.tip_height:
+        app.state.block_syncer.sync_soon()
+    return index if index.tip_height is not None else None
+
+def current_transaction_index(app: FastAPI) -> Optional[TransactionIndex]:
+    """Indeks transakcija (None ako je isključen ili još nije obradio nijedan blok)"""
+    tx_index = app.state.tx_index
+    if tx_index is None or current_block_index(app) is None:
+        return None
+    if tx_index.tip_height is None or tx_index.tip_height < app.state.dune_client.synthetic.tip_height:
+        app.state.block_syncer.sync_soon()
+    return tx_index if tx_index.tip_height is not None else None
+
+def is_hex_hash(value: str) -> bool:
+    """Je li vrijednost hash od 32 bajta (64 heksadekadska znaka), npr. txid ili hash bloka"""
+    return len(value) == 64 and all(c in "0123456789abcdefABCDEF" for c in value)
+
+def parse_block_id(block_id: str) -> Optional[Tuple[str, Any]]:
+    """Visina bloka ("height", int) ili hash ("hash", str); None ako nije ni jedno"""
+    if is_hex_hash(block_id):
+        return "hash", block_id.lower()
+    if block_id.isdigit():
+        return "height", int(block_id)
+    return None
+
+async def resolve_parts(
+    app: FastAPI,
+    prefix: str,
+    parts: Dict[str, Tuple[Awaitable[Any], Any, Optional[int]]],
+    timeout: float = COMPOSITE_PART_TIMEOUT,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Istovremeno dohvaća neovisne dijelove složenog odgovora
+
+    Svaki dio je (awaitable, zadana vrijednost, ID upita). Dio koji ne stigne
+    na vrijeme zamjenjuje se zadnjom dobrom vrijednošću (ili zadanom
+    vrijednošću), a izvršavanje na Dune-u se pritom ne prekida pa sljedeći
+    zahtjev dobiva svježe podatke iz priručne memorije. Dijelovi posluženi iz
+    zastarjelih podataka (npr. dok je prekidač otvoren) navode se u
+    stale_parts sa starošću najstarijeg u stale_age, a dijelovi za koje nema
+    nijednog uspješnog rezultata (zadane vrijednosti) u unavailable_parts.
+    Drugi rezultat se prosljeđuje modelu odgovora (**staleness).
+    """
+    dune_client = app.state.dune_client
+    last_good = app.state.last_good_parts
+    names = list(parts)
+    results = await asyncio.gather(
+        *(asyncio.wait_for(parts[name][0], timeout) for name in names),
+        return_exceptions=True
+    )
+
+    now = time.time()
+    values = {}
+    stale_parts = []
+    unavailable_parts = []
+    ages = []
+    for name, result in zip(names, results):
+        key = f"{prefix}:{name}"
+        _, default, query_id = parts[name]
+        if isinstance(result, asyncio.TimeoutError):
+            stale_parts.append(name)
+            if key in last_good:
+                values[name], fetched_at = last_good[key]
+                ages.append(now - fetched_at)
+            else:
+                values[name] = default
+                unavailable_parts.append(name)
+        elif isinstance(result, BaseException):
+            raise result
+        elif query_id is not None and not dune_client.has_data(query_id):
+            # Dune nije vratio podatke, a uspješnog rezultata nema: vrijednosti su zadane
+            values[name] = result
+            stale_parts.append(name)
+            unavailable_parts.append(name)
+        else:
+            values[name] = result
+            age = dune_client.data_age(query_id) if query_id is not None else None
+            if age is not None:
+                stale_parts.append(name)
+                ages.append(age)
+            last_good[key] = (result, now - (age or 0.0))
+
+    staleness = {
+        "stale": bool(stale_parts),
+        "stale_parts": stale_parts,
+        "stale_age": round(max(ages), 1) if ages else None,
+        "unavailable_parts": unavailable_parts,
+    }
+    return values, staleness
+
+def stream_rows(batches: AsyncIterator[List[Dict[str, Any]]], format: str = "ndjson") -> StreamingResponse:
+    """
+    Šalje retke klijentu postupno, stranicu po stranicu
+
+    format="ndjson" šalje jedan JSON objekt po retku, a format="json" jedan
+    JSON niz u dijelovima. Greška nakon početka slanja dodaje se kao zadnji zapis.
+    """
+    if format not in ("ndjson", "json"):
+        raise HTTPException(status_code=400, detail=f"Nepodržani format: {format}")
+
+    async def ndjson_body():
+        try:
+            async for batch in batches:
+                yield b"".join(dumps(row) + b"\n" for row in batch)
+        except DuneQueryError as e:
+            yield dumps({"error": str(e)}) + b"\n"
+
+    async def json_body():
+        yield b"["
+        first = True
+        try:
+            async for batch in batches:
+                if not batch:
+                    continue
+                yield (b"" if first else b",") + b",".join(dumps(row) for row in batch)
+                first = False
+        except DuneQueryError as e:
+            yield (b"" if first else b",") + dumps({"error": str(e)})
+        yield b"]"
+
+    if format == "ndjson":
+        return StreamingResponse(ndjson_body(), media_type="application/x-ndjson")
+    return StreamingResponse(json_body(), media_type="application/json")
+
+async def ethereum_status_data(app: FastAPI, dune_client: AsyncDuneClient) -> Dict[str, Any]:
+    """Stanje Ethereum mreže i cijena (validirano, spremno za JSON)"""
+    parts, staleness = await resolve_parts(app, "ethereum", {
+        "status": (dune_client.get_ethereum_status(), {}, ETHEREUM_STATUS_QUERY_ID),
+        "price": (dune_client.get_ethereum_price(), 0.0, ETHEREUM_PRICE_QUERY_ID),
+    })
+    eth_status = parts["status"]
+
+    return EthereumStatus(
+        price=parts["price"],
+        last_block=eth_status.get("last_block", 22417536),
+        gas_price=eth_status.get("gas_price", 30),
+        transactions_count=eth_status.get("transactions_count", 1500),
+        **staleness
+    ).model_dump()
+
+async def bitcoin_status_data(app: FastAPI, dune_client: AsyncDuneClient) -> Dict[str, Any]:
+    """Stanje Bitcoin mreže i cijena (validirano, spremno za JSON)"""
+    parts, staleness = await resolve_parts(app, "bitcoin", {
+        "status": (dune_client.get_bitcoin_status(), {}, BITCOIN_STATUS_QUERY_ID),
+        "price": (dune_client.get_bitcoin_price(), 0.0, BITCOIN_PRICE_QUERY_ID),
+    })
+    btc_status = parts["status"]
+
+    return BitcoinStatus(
+        price=parts["price"],
+        last_block=btc_status.get("last_block", 840000),
+        fee_rate=btc_status.get("fee_rate", 25),
+        transactions_count=btc_status.get("transactions_count", 350000),
+        difficulty=btc_status.get("difficulty", 78.3e12),
+        hashrate=btc_status.get("hashrate", 650.2e18),
+        **staleness
+    ).model_dump()
+
+async def bitcoin_live_snapshot(app: FastAPI) -> Dict[str, Any]:
+    """Događaji kanala /api/stream/bitcoin: stanje mreže s cijenom i zadnji blokovi"""
+    dune_client = app.state.dune_client
+    version, last_modified, _ = chain_version(dune_client)
+    status = await bitcoin_status_data(app, dune_client)
+    index = current_block_index(app)
+    if index is not None and index.tip_height >= version:
+        return {"status": status, "blocks": index.latest(LIVE_BLOCKS)}
+    blocks = await cached_entry(
+        ("bitcoin_blocks", LIVE_BLOCKS, None), List[BitcoinBlock],
+        lambda: dune_client.get_bitcoin_blocks(limit=LIVE_BLOCKS),
+        version, last_modified
+    )
+    return {"status": status, "blocks": blocks.data}
+
+async def ethereum_live_snapshot(app: FastAPI) -> Dict[str, Any]:
+    """Događaji kanala /api/stream/ethereum: stanje mreže s cijenom"""
+    return {"status": await ethereum_status_data(app, app.state.dune_client)}
+
+def event_stream(channel: LiveChannel) -> StreamingResponse:
+    return StreamingResponse(
+        channel.subscribe(),
+        media_type="text/event-stream",
+        # Proxy (npr. nginx) ne smije spremati ni odgađati događaje
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 # API rute
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Dune API Python Backend je aktivan"}
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Metrike u Prometheus tekstualnom formatu"""
+    return Response(content=metrics_registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
 @app.get("/api/token-balances/{address}", response_model=List[Token])
-def get_token_balances(address: str, dune_client: DuneClient = Depends(get_dune_client)):
+async def get_token_balances(address: str, dune_client: AsyncDuneClient = Depends(get_dune_client)):
     """Dohvaća stanja tokena za određenu adresu"""
     try:
-        tokens = dune_client.get_token_balances(address)
-        return [Token(**token) for token in tokens]
+        tokens = await dune_client.get_token_balances(address)
+        return FastJSONResponse(validate(List[Token], tokens))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Greška pri dohvaćanju stanja tokena: {str(e)}")
 
 @app.get("/api/transactions/{address}", response_model=List[Transaction])
-def get_transactions(address: str, dune_client: DuneClient = Depends(get_dune_client)):
+async def get_transactions(address: str, dune_client: AsyncDuneClient = Depends(get_dune_client)):
     """Dohvaća transakcije za određenu adresu"""
     try:
-        transactions = dune_client.get_transactions(address)
-        return [Transaction(**tx) for tx in transactions]
+        transactions = await dune_client.get_transactions(address)
+        return FastJSONResponse(validate(List[Transaction], transactions))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Greška pri dohvaćanju transakcija: {str(e)}")
 
 @app.get("/api/ethereum-status", response_model=EthereumStatus)
-def get_ethereum_status(dune_client: DuneClient = Depends(get_dune_client)):
+async def get_ethereum_status(request: Request, dune_client: AsyncDuneClient = Depends(get_dune_client)):
     """Dohvaća trenutno stanje Ethereum mreže"""
     try:
-        eth_status = dune_client.get_ethereum_status()
-        eth_price = dune_client.get_ethereum_price()
-        
-        return EthereumStatus(
-            price=eth_price,
-            last_block=eth_status.get("last_block", 22417536),
-            gas_price=eth_status.get("gas_price", 30),
-            transactions_count=eth_status.get("transactions_count", 1500)
-        )
+        data = await ethereum_status_data(request.app, dune_client)
+        return json_response(request, data, *dune_freshness(request, [ETHEREUM_STATUS_QUERY_ID, ETHEREUM_PRICE_QUERY_ID]))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Greška pri dohvaćanju stanja Ethereum mreže: {str(e)}")
 
 # Bitcoin API rute
 @app.get("/api/bitcoin/status", response_model=BitcoinStatus)
-def get_bitcoin_status(dune_client: DuneClient = Depends(get_dune_client)):
+async def get_bitcoin_status(request: Request, dune_client: AsyncDuneClient = Depends(get_dune_client)):
     """Dohvaća trenutno stanje Bitcoin mreže"""
     try:
-        btc_status = dune_client.get_bitcoin_status()
-        btc_price = dune_client.get_bitcoin_price()
-        
-        return BitcoinStatus(
-            price=btc_price,
-            last_block=btc_status.get("last_block", 840000),
-            fee_rate=btc_status.get("fee_rate", 25),
-            transactions_count=btc_status.get("transactions_count", 350000),
-            difficulty=btc_status.get("difficulty", 78.3e12),
-            hashrate=btc_status.get("hashrate", 650.2e18)
-        )
+        data = await bitcoin_status_data(request.app, dune_client)
+        return json_response(request, data, *dune_freshness(request, [BITCOIN_STATUS_QUERY_ID, BITCOIN_PRICE_QUERY_ID]))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Greška pri dohvaćanju stanja Bitcoin mreže: {str(e)}")
 
 @app.get("/api/bitcoin/transactions", response_model=List[BitcoinTransaction])
-def get_bitcoin_transactions(limit: int = 10, dune_client: DuneClient = Depends(get_dune_client)):
+async def get_bitcoin_transactions(request: Request, limit: int = 10, dune_client: AsyncDuneClient = Depends(get_dune_client)):
     """Dohvaća zadnje Bitcoin transakcije"""
     try:
-        transactions = dune_client.get_bitcoin_transactions(limit=limit)
-        return [BitcoinTransaction(**tx) for tx in transactions]
+        return await cached_response(
+            request, ("bitcoin_transactions", limit), List[BitcoinTransaction],
+            lambda: dune_client.get_bitcoin_transactions(limit=limit),
+            *chain_version(dune_client)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Greška pri dohvaćanju Bitcoin transakcija: {str(e)}")
 
+async def fetch_address_page(
+    dune_client: AsyncDuneClient, address: str, limit: int, position: Optional[Tuple[int, str]]
+) -> List[Dict[str, Any]]:
+    """
+    Stranica transakcija adrese izravno iz izvora, ispod kursora (visina, txid)
+
+    Redoslijed je isti kao u indeksu transakcija (visina pa txid, silazno),
+    pa kursor izdan na jednom putu vrijedi i na drugom. Iz najnižeg
+    dohvaćenog bloka možda nisu dohvaćene sve transakcije, pa se taj blok
+    koristi samo ako je izvor vratio sve transakcije ispod kursora.
+    """
+    before_height = position[0] + 1 if position else None
+    fetch_limit = limit
+    while True:
+        transactions = await dune_client.get_bitcoin_transactions(address=address, limit=fetch_limit, before_height=before_height)
+        complete = len(transactions) < fetch_limit
+        if not complete:
+            lowest = min(tx["block_height"] for tx in transactions)
+            transactions = [tx for tx in transactions if tx["block_height"] > lowest]
+        if position is not None:
+            transactions = [tx for tx in transactions if (tx["block_height"], tx["txid"]) < position]
+        if complete or len(transactions) >= limit:
+            transactions.sort(key=lambda tx: (tx["block_height"], tx["txid"]), reverse=True)
+            return transactions[:limit]
+        fetch_limit *= 2
+
 @app.get("/api/bitcoin/transactions/{address}", response_model=List[BitcoinTransaction])
-def get_bitcoin_address_transactions(address: str, limit: int = 10, dune_client: DuneClient = Depends(get_dune_client)):
-    """Dohvaća Bitcoin transakcije za određenu adresu"""
+async def get_bitcoin_address_transactions(
+    request: Request,
+    address: str,
+    limit: int = Query(10, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    dune_client: AsyncDuneClient = Depends(get_dune_client)
+):
+    """
+    Dohvaća Bitcoin transakcije za određenu adresu
+
+    Sljedeća stranica se dohvaća s ?cursor= iz zaglavlja X-Next-Cursor.
+    """
     try:
-        transactions = dune_client.get_bitcoin_transactions(address=address, limit=limit)
-        return [BitcoinTransaction(**tx) for tx in transactions]
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        chain_tip, last_modified, max_age = chain_version(dune_client)
+        tx_index = current_transaction_index(request.app)
+        # Indeks sadrži transakcije do svog vrha; prva stranica treba i blokove do vrha lanca
+        top_height = chain_tip if position is None else position[0]
+        if tx_index is not None and top_height <= tx_index.tip_height:
+            transactions, next_cursor = await tx_index.address_page(
+                address, limit, position,
+                lambda address, limit, before_height: dune_client.get_bitcoin_transactions(
+                    address=address, limit=limit, before_height=before_height
+                ),
+                normalize=lambda transactions: validate(List[BitcoinTransaction], transactions),
+                chain_tip=chain_tip
+            )
+            response = json_response(request, transactions, last_modified, max_age)
+        else:
+            response = await cached_response(
+                request, ("bitcoin_address_transactions", address, limit, position), List[BitcoinTransaction],
+                lambda: fetch_address_page(dune_client, address, limit, position),
+                *chain_version(dune_client)
+            )
+            rows = response.data if isinstance(response, FastJSONResponse) else []
+            next_cursor = encode_cursor((rows[-1]["block_height"], rows[-1]["txid"])) if rows and len(rows) == limit else None
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Greška pri dohvaćanju Bitcoin transakcija za adresu: {str(e)}")
 
+@app.get("/api/bitcoin/transactions/{address}/stream")
+async def stream_bitcoin_address_transactions(address: str, limit: int = 10000, format: str = "ndjson", dune_client: AsyncDuneClient = Depends(get_dune_client)):
+    """Postupno šalje Bitcoin transakcije za određenu adresu (NDJSON ili JSON niz)"""
+    return stream_rows(dune_client.iter_bitcoin_transactions(address=address, limit=limit), format)
+
+# Upiti čiji se rezultati smiju dohvatiti izravno (svaki poziv može pokrenuti plaćeno izvršavanje)
+STREAMABLE_QUERY_IDS = CORE_QUERY_IDS
+
+@app.get("/api/dune/query/{query_id}/results")
+async def stream_query_results(query_id: int, format: str = "ndjson", dune_client: AsyncDuneClient = Depends(get_dune_client)):
+    """
+    Postupno šalje retke rezultata Dune upita (NDJSON ili JSON niz)
+
+    Rezultati se dohvaćaju stranicu po stranicu i ne spremaju se u priručnu
+    memoriju; nedavno završeno izvršavanje iz evidencije se ne plaća ponovno.
+    """
+    if query_id not in STREAMABLE_QUERY_IDS:
+        raise HTTPException(status_code=404, detail=f"Upit {query_id} nije dostupan")
+    return stream_rows(dune_client.iter_query_pages(query_id), format)
+
 @app.get("/api/bitcoin/transaction/{txid}", response_model=BitcoinTransaction)
-def get_bitcoin_transaction(txid: str, dune_client: DuneClient = Depends(get_dune_client)):
+async def get_bitcoin_transaction(request: Request, txid: str, dune_client: AsyncDuneClient = Depends(get_dune_client)):
     """Dohvaća detalje Bitcoin transakcije prema hash-u"""
     try:
-        transaction = dune_client.get_bitcoin_transaction(txid)
+        if not is_hex_hash(txid):
+            raise HTTPException(status_code=404, detail=f"Transakcija s hash-om {txid} nije pronađena")
+        transaction = None
+        tx_index = current_transaction_index(request.app)
+        if tx_index is not None:
+            # Lokalni indeks: txid koji filtar odbije ne čita se iz baze
+            transaction = tx_index.get_transaction(txid, chain_tip=dune_client.synthetic.tip_height)
+            if transaction is None and tx_index.has_all_txids(dune_client.synthetic.txid_height(txid)):
+                # Blok iz txid-a je obrađen u cijelosti, a txid-a u njemu nema
+                raise HTTPException(status_code=404, detail=f"Transakcija s hash-om {txid} nije pronađena")
+        if transaction is None:
+            # Starije transakcije (i blokovi koje indeks još nije obradio) dohvaćaju se izravno
+            transaction = await dune_client.get_bitcoin_transaction(txid)
         if not transaction:
             raise HTTPException(status_code=404, detail=f"Transakcija s hash-om {txid} nije pronađena")
-        return BitcoinTransaction(**transaction)
+        _, last_modified, max_age = chain_version(dune_client)
+        return json_response(request, validate(BitcoinTransaction, transaction), last_modified, max_age)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Greška pri dohvaćanju Bitcoin transakcije: {str(e)}")
 
 @app.get("/api/bitcoin/blocks", response_model=List[BitcoinBlock])
-def get_bitcoin_blocks(limit: int = 5, dune_client: DuneClient = Depends(get_dune_client)):
-    """Dohvaća zadnje Bitcoin blokove"""
+async def get_bitcoin_blocks(
+    request: Request,
+    limit: int = 5,
+    before: Optional[int] = None,
+    dune_client: AsyncDuneClient = Depends(get_dune_client)
+):
+    """Dohvaća zadnje Bitcoin blokove (ili blokove ispod visine before)"""
     try:
-        blocks = dune_client.get_bitcoin_blocks(limit=limit)
-        return [BitcoinBlock(**block) for block in blocks]
+        chain_tip, last_modified, max_age = chain_version(dune_client)
+        if before is not None and before <= 0:
+            return json_response(request, [], last_modified, max_age)
+
+        index = current_block_index(request.app)
+        if index is not None:
+            top = chain_tip if before is None else min(before - 1, chain_tip)
+            if index.covers(top) and index.covers(max(0, top - limit + 1)):
+                return raw_json_response(request, index.latest_json(limit, top + 1), last_modified, max_age)
+
+        # Indeks je isključen ili ne sadrži sve tražene blokove
+        start_height = None if before is None else before - 1
+        return await cached_response(
+            request, ("bitcoin_blocks", limit, start_height), List[BitcoinBlock],
+            lambda: dune_client.get_bitcoin_blocks(limit=limit, start_height=start_height),
+            *chain_version(dune_client)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Greška pri dohvaćanju Bitcoin blokova: {str(e)}")
 
+@app.get("/api/bitcoin/block/{block_id}", response_model=BitcoinBlock)
+async def get_bitcoin_block(request: Request, block_id: str, dune_client: AsyncDuneClient = Depends(get_dune_client)):
+    """Dohvaća Bitcoin blok prema visini ili hash-u"""
+    try:
+        key = parse_block_id(block_id)
+        if key is None:
+            raise HTTPException(status_code=404, detail=f"Blok {block_id} nije pronađen")
+        kind, value = key
+        chain_tip, last_modified, max_age = chain_version(dune_client)
+        if kind == "height" and value > chain_tip:
+            raise HTTPException(status_code=404, detail=f"Blok {block_id} nije pronađen")
+
+        index = current_block_index(request.app)
+        if index is not None:
+            body = index.by_height_raw(value) if kind == "height" else index.by_hash_raw(value)
+            if body is not None:
+                return raw_json_response(request, body, last_modified, max_age)
+
+        # Blok izvan indeksiranog raspona (ili indeks nije dostupan)
+        block = await dune_client.get_bitcoin_block(str(value))
+        if not block:
+            raise HTTPException(status_code=404, detail=f"Blok {block_id} nije pronađen")
+        return json_response(request, validate(BitcoinBlock, block), last_modified, max_age)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Greška pri dohvaćanju Bitcoin bloka: {str(e)}")
+
 @app.get("/api/bitcoin/address/{address}", response_model=BitcoinAddressInfo)
-def get_bitcoin_address_info(address: str, dune_client: DuneClient = Depends(get_dune_client)):
+async def get_bitcoin_address_info(request: Request, address: str, dune_client: AsyncDuneClient = Depends(get_dune_client)):
     """Dohvaća informacije o Bitcoin adresi"""
     try:
-        address_info = dune_client.get_bitcoin_address_info(address)
-        return BitcoinAddressInfo(**address_info)
+        chain_tip, last_modified, max_age = chain_version(dune_client)
+        tx_index = current_transaction_index(request.app)
+        # Spremljeni sažetak vrijedi samo ako je indeks obradio sve blokove do vrha lanca
+        if tx_index is not None and tx_index.tip_height >= chain_tip:
+            body = tx_index.address_info_raw(address)
+            if body is not None:
+                return raw_json_response(request, body, last_modified, max_age)
+            tip_height = tx_index.tip_height
+            info = validate(BitcoinAddressInfo, await dune_client.get_bitcoin_address_info(address))
+            tx_index.set_address_info(address, info, tip_height)
+            return json_response(request, info, last_modified, max_age)
+
+        return await cached_response(
+            request, ("bitcoin_address", address), BitcoinAddressInfo,
+            lambda: dune_client.get_bitcoin_address_info(address),
+            *chain_version(dune_client)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Greška pri dohvaćanju informacija o Bitcoin adresi: {str(e)}")
 
 @app.get("/api/bitcoin/price-history", response_model=List[BitcoinPriceHistory])
-def get_bitcoin_price_history(days: int = 7, dune_client: DuneClient = Depends(get_dune_client)):
+async def get_bitcoin_price_history(request: Request, days: int = 7, dune_client: AsyncDuneClient = Depends(get_dune_client)):
     """Dohvaća povijest cijene Bitcoina"""
     try:
-        price_history = dune_client.get_bitcoin_price_history(days)
-        return [BitcoinPriceHistory(**item) for item in price_history]
+        return await cached_response(
+            request, ("bitcoin_price_history", days), List[BitcoinPriceHistory],
+            lambda: dune_client.get_bitcoin_price_history(days),
+            *chain_version(dune_client)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Greška pri dohvaćanju povijesti cijene Bitcoina: {str(e)}")
 
+# Obavijesti uživo (Server-Sent Events)
+@app.get("/api/stream/bitcoin")
+async def stream_bitcoin(request: Request):
+    """
+    Stanje Bitcoin mreže, cijena i novi blokovi uživo (SSE)
+
+    Događaji "status" (kao /api/bitcoin/status) i "blocks" (kao
+    /api/bitcoin/blocks) šalju se odmah po spajanju i zatim pri svakoj promjeni.
+    """
+    return event_stream(request.app.state.live_channels["bitcoin"])
+
+@app.get("/api/stream/ethereum")
+async def stream_ethereum(request: Request):
+    """Stanje Ethereum mreže i cijena uživo (SSE, događaj "status")"""
+    return event_stream(request.app.state.live_channels["ethereum"])
+
+# Batch API
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "50"))
+
+# Vrste pod-zahtjeva: ruta koja ih obrađuje i model njenih parametara
+BATCH_HANDLERS = {
+    "token_balances": (get_token_balances, AddressParams),
+    "transactions": (get_transactions, AddressParams),
+    "ethereum_status": (get_ethereum_status, BatchParams),
+    "bitcoin_status": (get_bitcoin_status, BatchParams),
+    "bitcoin_transactions": (get_bitcoin_transactions, BitcoinTransactionsParams),
+    "bitcoin_address_transactions": (get_bitcoin_address_transactions, BitcoinAddressTransactionsParams),
+    "bitcoin_transaction": (get_bitcoin_transaction, BitcoinTransactionParams),
+    "bitcoin_blocks": (get_bitcoin_blocks, BitcoinBlocksParams),
+    "bitcoin_block": (get_bitcoin_block, BitcoinBlockParams),
+    "bitcoin_address": (get_bitcoin_address_info, AddressParams),
+    "bitcoin_price_history": (get_bitcoin_price_history, BitcoinPriceHistoryParams),
+}
+
+# Rute koje primaju Request (složeni odgovori i HTTP priručna memorija)
+BATCH_NEEDS_REQUEST = {
+    "ethereum_status", "bitcoin_status", "bitcoin_transactions", "bitcoin_address_transactions",
+    "bitcoin_transaction", "bitcoin_blocks", "bitcoin_block", "bitcoin_address", "bitcoin_price_history",
+}
+
+def _params_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, detail['loc'])) or 'params'}: {detail['msg']}" for detail in error.errors()
+    )
+
+async def _resolve_batch_item(request: Request, item: BatchItem, dune_client: AsyncDuneClient) -> BatchResult:
+    entry = BATCH_HANDLERS.get(item.type)
+    if entry is None:
+        return BatchResult(id=item.id, type=item.type, status=400, error=f"Nepoznata vrsta zahtjeva: {item.type}")
+    handler, params_model = entry
+
+    # Parametri se provjeravaju prije poziva rute (kao query parametri pri HTTP zahtjevu)
+    try:
+        kwargs = params_model.model_validate(item.params).model_dump()
+    except ValidationError as e:
+        return BatchResult(id=item.id, type=item.type, status=400, error=f"Neispravni parametri: {_params_error(e)}")
+    if item.type in BATCH_NEEDS_REQUEST:
+        kwargs["request"] = request
+
+    try:
+        response = await handler(dune_client=dune_client, **kwargs)
+        next_cursor = response.headers.get("X-Next-Cursor") if isinstance(response, Response) else None
+        # Rute vraćaju već validirane podatke (FastJSONResponse.data)
+        data = response.data if isinstance(response, FastJSONResponse) else jsonable_encoder(response)
+        return BatchResult(id=item.id, type=item.type, status=200, data=data, next_cursor=next_cursor)
+    except HTTPException as e:
+        return BatchResult(id=item.id, type=item.type, status=e.status_code, error=str(e.detail))
+
+@app.post("/api/batch", response_model=BatchResponse)
+async def batch(batch_request: BatchRequest, request: Request, dune_client: AsyncDuneClient = Depends(get_dune_client)):
+    """
+    Obrađuje više zahtjeva u jednom pozivu
+
+    Pod-zahtjevi se izvršavaju istovremeno i dijele priručnu memoriju i
+    spajanje istih Dune izvršavanja. Jednaki pod-zahtjevi obrađuju se samo jednom.
+    """
+    if len(batch_request.requests) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Najviše {MAX_BATCH_SIZE} zahtjeva po batch pozivu")
+
+    unique: Dict[str, BatchItem] = {}
+    signatures = []
+    for item in batch_request.requests:
+        signature = json.dumps([item.type, item.params], sort_keys=True, default=str)
+        unique.setdefault(signature, item)
+        signatures.append(signature)
+
+    resolved = await asyncio.gather(
+        *(_resolve_batch_item(request, item, dune_client) for item in unique.values())
+    )
+    by_signature = dict(zip(unique.keys(), resolved))
+
+    results = []
+    for item, signature in zip(batch_request.requests, signatures):
+        result = by_signature[signature]
+        results.append({**result.model_dump(), "id": item.id})
+    return FastJSONResponse({"results": results})
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
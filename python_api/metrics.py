@@ -0,0 +1,439 @@
+import asyncio
+import math
+import threading
+import time
+from typing import Callable, Dict, Any, Iterable, List, Optional, Sequence, Tuple
+
+# Granice histograma latencija (sekunde)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Izvršavanja Dune upita traju sekundama
+DUNE_QUERY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 45.0, 60.0, 120.0)
+EVENT_LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Starlette sam dodaje "; charset=utf-8" tekstualnim odgovorima
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+LabelValues = Tuple[str, ...]
+# (ime, tip, opis, [(oznake, vrijednost)])
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Metrika {self.name} očekuje oznake {self.labelnames}, dobila {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelValues) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        with self._lock:
+            return [(self.name, self._labels(key), value) for key, value in self._values.items()]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Po oznakama: [brojevi po granici..., +Inf], zbroj
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key) or self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            total[0] += value
+
+    def count(self, **labels: Any) -> int:
+        values = self._values.get(self._key(labels))
+        return sum(values[0]) if values else 0
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        samples = []
+        with self._lock:
+            for key, (counts, total) in self._values.items():
+                labels = self._labels(key)
+                cumulative = 0
+                for bound, count in zip(self.buckets + (math.inf,), counts):
+                    cumulative += count
+                    samples.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+                samples.append((f"{self.name}_sum", labels, total[0]))
+                samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Metrike u Prometheus tekstualnom formatu (bez vanjskih ovisnosti)
+
+    Brojači i histogrami bilježe se na mjestu događaja, a vrijednosti koje
+    već postoje drugdje (npr. statistika priručne memorije) čitaju se tek
+    pri dohvaćanju /metrics preko kolektora.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: Dict[str, Callable[[], Iterable[Family]]] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metrika {metric.name} je već registrirana s drugim oznakama")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, name: str, collector: Callable[[], Iterable[Family]]) -> None:
+        """Kolektor se poziva pri svakom dohvaćanju (isto ime zamjenjuje prethodni)"""
+        with self._lock:
+            self._collectors[name] = collector
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for collector in list(self._collectors.values()):
+            for name, kind, documentation, samples in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class DuneMetrics:
+    """Metrike Dune klijenta (pozivi API-ja, ishodi i trajanje izvršavanja)"""
+
+    def __init__(self, registry: MetricsRegistry):
+        self.calls = registry.counter(
+            "dune_api_calls_total", "Pozivi Dune API-ja po vrsti (execute, status, results) i ishodu", ["call", "outcome"]
+        )
+        self.executions = registry.counter(
+            "dune_query_executions_total", "Završena izvršavanja upita po konačnom stanju", ["query_id", "state"]
+        )
+        self.polls = registry.counter(
+            "dune_query_polls_total", "Provjere statusa izvršavanja po upitu", ["query_id"]
+        )
+        self.duration = registry.histogram(
+            "dune_query_duration_seconds", "Trajanje izvršavanja upita (pokretanje, provjere statusa, rezultati)",
+            ["query_id"], DUNE_QUERY_BUCKETS
+        )
+
+    @staticmethod
+    def call_kind(endpoint: str) -> str:
+        if endpoint.endswith("/execute"):
+            return "execute"
+        if endpoint.endswith("/status"):
+            return "status"
+        if endpoint.endswith("/results"):
+            return "results"
+        return "other"
+
+    def record_call(self, endpoint: str, ok: bool) -> None:
+        self.calls.inc(call=self.call_kind(endpoint), outcome="ok" if ok else "error")
+
+    def record_execution(self, query_id: int, state: str, polls: int) -> None:
+        self.executions.inc(query_id=int(query_id), state=state)
+        if polls:
+            self.polls.inc(polls, query_id=int(query_id))
+
+
+def cache_collector(cache) -> Callable[[], List[Family]]:
+    """Statistika ResultCache kao Prometheus metrike"""
+    def collect() -> List[Family]:
+        stats = cache.stats()
+        return [
+            ("dune_cache_hits_total", "counter", "Pogoci priručne memorije po vrsti (fresh, stale)",
+             [({"kind": "fresh"}, stats["hits"]), ({"kind": "stale"}, stats["stale_hits"])]),
+            ("dune_cache_misses_total", "counter", "Promašaji priručne memorije", [({}, stats["misses"])]),
+            ("dune_cache_evictions_total", "counter", "Zapisi izbačeni iz priručne memorije (LRU)", [({}, stats["evictions"])]),
+            ("dune_cache_entries", "gauge", "Broj zapisa u priručnoj memoriji", [({}, stats["size"])]),
+        ]
+    return collect
+
+
+def response_cache_collector(cache) -> Callable[[], List[Family]]:
+    """Statistika priručne memorije kodiranih JSON odgovora"""
+    def collect() -> List[Family]:
+        stats = cache.stats()
+        return [
+            ("response_cache_hits_total", "counter", "Odgovori posluženi bez validacije i kodiranja", [({}, stats["hits"])]),
+            ("response_cache_misses_total", "counter", "Odgovori koji su validirani i kodirani", [({}, stats["misses"])]),
+            ("response_cache_evictions_total", "counter", "Odgovori izbačeni iz priručne memorije (LRU)", [({}, stats["evictions"])]),
+            ("response_cache_entries", "gauge", "Broj spremljenih odgovora", [({}, stats["size"])]),
+            ("response_cache_bytes", "gauge", "Ukupna veličina spremljenih odgovora", [({}, stats["bytes"])]),
+        ]
+    return collect
+
+
+def singleflight_collector(singleflight) -> Callable[[], List[Family]]:
+    """Statistika spajanja istovremenih izvršavanja"""
+    def collect() -> List[Family]:
+        stats = singleflight.stats()
+        return [
+            ("dune_singleflight_calls_total", "counter", "Izvršavanja pokrenuta kroz single-flight", [({}, stats["calls"])]),
+            ("dune_singleflight_coalesced_total", "counter", "Pozivi koji su čekali na već pokrenuto izvršavanje", [({}, stats["coalesced"])]),
+            ("dune_singleflight_in_flight", "gauge", "Izvršavanja koja su trenutno u tijeku", [({}, stats["in_flight"])]),
+        ]
+    return collect
+
+
+def ratelimit_collector(limiter) -> Callable[[], List[Family]]:
+    """Red čekanja i vrijeme čekanja na limiter izvršavanja"""
+    def collect() -> List[Family]:
+        stats = limiter.stats()
+        return [
+            ("dune_ratelimit_queue_depth", "gauge", "Izvršavanja koja čekaju na limiter po prioritetu",
+             [({"priority": name}, depth) for name, depth in stats["queue_depth"].items()]),
+            ("dune_ratelimit_acquired_total", "counter", "Izvršavanja propuštena kroz limiter po prioritetu",
+             [({"priority": name}, count) for name, count in stats["acquired"].items()]),
+            ("dune_ratelimit_wait_seconds_total", "counter", "Ukupno vrijeme čekanja na limiter", [({}, stats["total_wait"])]),
+            ("dune_ratelimit_wait_max_seconds", "gauge", "Najdulje čekanje na limiter", [({}, stats["max_wait"])]),
+            ("dune_ratelimit_timeouts_total", "counter", "Izvršavanja koja nisu dočekala limiter do roka", [({}, stats["timeouts"])]),
+            ("dune_ratelimit_429_total", "counter", "Odgovori 429 (rate limit) s Dune API-ja", [({}, stats["rate_limited"])]),
+            ("dune_ratelimit_paused_seconds", "gauge", "Preostala pauza nakon odgovora 429", [({}, stats["paused_for"])]),
+        ]
+    return collect
+
+
+BREAKER_STATE_VALUES = {"closed": 0, "open": 1, "half_open": 2}
+
+
+def breaker_collector(breakers) -> Callable[[], List[Family]]:
+    """Stanje prekidača po upitu (0 zatvoren, 1 otvoren, 2 probni poziv)"""
+    def collect() -> List[Family]:
+        stats = breakers.stats()
+        return [
+            ("dune_breaker_state", "gauge", "Stanje prekidača po upitu (0 zatvoren, 1 otvoren, 2 half-open)",
+             [({"query_id": str(key)}, BREAKER_STATE_VALUES.get(s["state"], 0)) for key, s in stats.items()]),
+            ("dune_breaker_opens_total", "counter", "Otvaranja prekidača po upitu",
+             [({"query_id": str(key)}, s["opens"]) for key, s in stats.items()]),
+            ("dune_breaker_short_circuited_total", "counter", "Pozivi odbijeni bez poziva Dune API-ja (otvoren prekidač)",
+             [({"query_id": str(key)}, s["short_circuited"]) for key, s in stats.items()]),
+        ]
+    return collect
+
+
+def live_collector(channels) -> Callable[[], List[Family]]:
+    """Pretplatnici i poruke kanala uživo (SSE)"""
+    def collect() -> List[Family]:
+        stats = {name: channel.stats() for name, channel in channels.items()}
+        return [
+            ("live_subscribers", "gauge", "Spojeni klijenti po kanalu", [({"channel": n}, s["subscribers"]) for n, s in stats.items()]),
+            ("live_refreshes_total", "counter", "Dohvati podataka za kanal (jedan za sve klijente)",
+             [({"channel": n}, s["refreshes"]) for n, s in stats.items()]),
+            ("live_messages_total", "counter", "Poslani događaji po kanalu", [({"channel": n}, s["published"]) for n, s in stats.items()]),
+            ("live_dropped_total", "counter", "Poruke izgubljene kod sporih klijenata", [({"channel": n}, s["dropped"]) for n, s in stats.items()]),
+        ]
+    return collect
+
+
+def block_index_collector(index) -> Callable[[], List[Family]]:
+    """Veličina i sinkronizacija lokalnog indeksa blokova"""
+    def collect() -> List[Family]:
+        stats = index.stats()
+        return [
+            ("block_index_blocks", "gauge", "Broj blokova u lokalnom indeksu", [({}, stats["blocks"])]),
+            ("block_index_tip_height", "gauge", "Najviši indeksirani blok", [({}, stats["tip_height"] or 0)]),
+            ("block_index_synced_blocks_total", "counter", "Blokovi dodani sinkronizacijom", [({}, stats["synced_blocks"])]),
+            ("block_index_reorgs_total", "counter", "Reorganizacije lanca otkrivene pri sinkronizaciji", [({}, stats["reorgs"])]),
+        ]
+    return collect
+
+
+def tx_index_collector(index) -> Callable[[], List[Family]]:
+    """Praćene adrese, popunjavanje indeksa transakcija i filtar txid-ova"""
+    def collect() -> List[Family]:
+        stats = index.stats()
+        return [
+            ("tx_index_addresses", "gauge", "Adrese u indeksu transakcija", [({}, stats["addresses"])]),
+            ("tx_index_evicted_addresses_total", "counter", "Adrese uklonjene iz indeksa transakcija (najdulje nekorištene)",
+             [({}, stats["evicted_addresses"])]),
+            ("tx_index_entries", "gauge", "Zapisi adresa -> transakcija u indeksu", [({}, stats["entries"])]),
+            ("tx_index_ingested_blocks_total", "counter", "Blokovi čije su transakcije obrađene", [({}, stats["ingested_blocks"])]),
+            ("tx_index_backfills_total", "counter", "Dohvati starijih transakcija adrese (popunjavanje indeksa)", [({}, stats["backfills"])]),
+            ("tx_index_pages_total", "counter", "Stranice transakcija adresa poslužene iz indeksa", [({}, stats["pages"])]),
+            ("tx_index_txids", "gauge", "Transakcije u txid indeksu", [({}, stats["txids"])]),
+            ("txid_lookups_total", "counter", "Dohvati transakcija po txid-u (hit, filtered = odbio filtar, false_positive)",
+             [({"result": "hit"}, stats["txid_hits"]), ({"result": "filtered"}, stats["txid_filtered"]),
+              ({"result": "false_positive"}, stats["txid_false_positives"])]),
+            ("txid_filter_memory_bytes", "gauge", "Memorija Bloom filtra txid-ova", [({}, stats["txid_filter"]["memory_bytes"])]),
+            ("txid_filter_entries", "gauge", "Txid-ovi u Bloom filtru", [({}, stats["txid_filter"]["entries"])]),
+            ("txid_filter_capacity", "gauge", "Kapacitet Bloom filtra txid-ova", [({}, stats["txid_filter"]["capacity"])]),
+            ("txid_filter_false_positive_rate", "gauge", "Udio lažno pozitivnih odgovora filtra (expected = procjena, observed = izmjereno)",
+             [({"kind": "expected"}, stats["txid_filter"]["expected_error_rate"]),
+              ({"kind": "observed"}, stats["txid_filter"]["observed_error_rate"])]),
+        ]
+    return collect
+
+
+def runtime_collector() -> List[Family]:
+    """Zasićenost event loopa i threadpoola (poziva se unutar event loopa)"""
+    families: List[Family] = []
+    try:
+        families.append(("event_loop_tasks", "gauge", "Broj asyncio zadataka u event loopu", [({}, len(asyncio.all_tasks()))]))
+    except RuntimeError:
+        pass
+    try:
+        from anyio import to_thread
+        limiter = to_thread.current_default_thread_limiter()
+        families.append(("threadpool_busy_threads", "gauge", "Zauzete dretve u threadpoolu (sync rute i pozivi)", [({}, limiter.borrowed_tokens)]))
+        families.append(("threadpool_max_threads", "gauge", "Veličina threadpoola", [({}, limiter.total_tokens)]))
+        families.append(("threadpool_waiting_tasks", "gauge", "Pozivi koji čekaju slobodnu dretvu", [({}, limiter.statistics().tasks_waiting)]))
+    except (ImportError, RuntimeError, LookupError):
+        pass
+    return families
+
+
+async def monitor_event_loop(registry: MetricsRegistry, interval: float = 0.5) -> None:
+    """
+    Mjeri kašnjenje event loopa: koliko kasnije od zadanog se zadatak probudi
+
+    Veliko kašnjenje znači da nešto blokira event loop (npr. sinkroni kod u async ruti).
+    """
+    lag_histogram = registry.histogram(
+        "event_loop_lag_seconds", "Kašnjenje buđenja zadataka u event loopu", buckets=EVENT_LOOP_LAG_BUCKETS
+    )
+    lag_gauge = registry.gauge("event_loop_lag_last_seconds", "Zadnje izmjereno kašnjenje event loopa")
+    while True:
+        start = time.monotonic()
+        await asyncio.sleep(interval)
+        lag = max(0.0, time.monotonic() - start - interval)
+        lag_histogram.observe(lag)
+        lag_gauge.set(lag)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware koji mjeri trajanje i broj HTTP zahtjeva po ruti
+
+    Ruta je predložak putanje (npr. /api/bitcoin/transaction/{txid}) pa broj
+    vremenskih serija ne raste s brojem različitih adresa i txid-ova.
+    """
+
+    def __init__(self, app, registry: Optional[MetricsRegistry] = None):
+        self.app = app
+        self.registry = registry or MetricsRegistry()
+        self.duration = self.registry.histogram(
+            "http_request_duration_seconds", "Trajanje HTTP zahtjeva po ruti", ["route", "method"]
+        )
+        self.requests = self.registry.counter(
+            "http_requests_total", "HTTP zahtjevi po ruti i statusu odgovora", ["route", "method", "status"]
+        )
+        self.in_flight = self.registry.gauge("http_requests_in_flight", "HTTP zahtjevi koji se trenutno obrađuju")
+        self._route_paths: Dict[Any, str] = {}
+
+    def _route_path(self, scope: Dict[str, Any]) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        path = self._route_paths.get(endpoint)
+        if path is None:
+            for route in getattr(scope.get("app"), "routes", []):
+                if getattr(route, "endpoint", None) is endpoint:
+                    path = route.path
+                    break
+            path = self._route_paths[endpoint] = path or "unmatched"
+        return path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.in_flight.dec()
+            route = self._route_path(scope)
+            self.duration.observe(elapsed, route=route, method=scope["method"])
+            self.requests.inc(route=route, method=scope["method"], status=status)
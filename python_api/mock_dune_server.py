@@ -0,0 +1,396 @@
+"""
+Lokalna zamjena za Dune API (za razvoj, testiranje i mjerenje performansi)
+
+Implementira rute koje koristi DuneClient:
+
+    POST /v1/query/{query_id}/execute
+    GET  /v1/execution/{execution_id}/status
+    GET  /v1/execution/{execution_id}/results?limit=&offset=
+
+Trajanje izvršavanja, kašnjenje odgovora, udio neuspjelih izvršavanja,
+odgovori 429 (rate limit) i veličina rezultata podešavaju se po upitu.
+
+Pokretanje:
+
+    python mock_dune_server.py --port 8765 --profiles profiles.json
+    DUNE_API_BASE_URL=http://127.0.0.1:8765/v1 python main.py
+
+Datoteka s profilima je JSON oblika {"5132855": {"execution_time": 2, "rate_limit_rate": 0.1}, ...},
+a ključ "default" vrijedi za sve ostale upite.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict, field, fields
+from typing import Callable, Dict, Any, Iterator, List, Optional
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+from dune_queries import (
+    ETHEREUM_PRICE_QUERY_ID, ETHEREUM_STATUS_QUERY_ID,
+    BITCOIN_PRICE_QUERY_ID, BITCOIN_PRICE_ALT_QUERY_ID, BITCOIN_STATUS_QUERY_ID
+)
+from synthetic_data import SyntheticChain
+
+MOCK_API_PREFIX = "/v1"
+
+STATE_PENDING = "QUERY_STATE_PENDING"
+STATE_EXECUTING = "QUERY_STATE_EXECUTING"
+STATE_COMPLETED = "QUERY_STATE_COMPLETED"
+STATE_FAILED = "QUERY_STATE_FAILED"
+STATE_EXPIRED = "QUERY_STATE_EXPIRED"
+
+
+@dataclass
+class QueryProfile:
+    """Ponašanje zamjenskog servera za jedan upit"""
+
+    # Trajanje izvršavanja (sekunde) i nasumično odstupanje (0.2 = ±20%)
+    execution_time: float = 0.5
+    execution_jitter: float = 0.0
+    # Kašnjenje svakog HTTP odgovora (sekunde)
+    latency: float = 0.0
+    # Udio izvršavanja koja završe s QUERY_STATE_FAILED
+    error_rate: float = 0.0
+    # Udio zahtjeva s odgovorom 500
+    http_error_rate: float = 0.0
+    # Udio zahtjeva s odgovorom 429 i vrijednost zaglavlja Retry-After
+    rate_limit_rate: float = 0.0
+    retry_after: float = 1.0
+    # Broj redaka rezultata
+    rows: int = 1
+    # Nakon koliko sekundi rezultati istječu (None = nikad)
+    result_ttl: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], base: Optional["QueryProfile"] = None) -> "QueryProfile":
+        known = {f.name for f in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"Nepoznate postavke profila: {', '.join(sorted(unknown))}")
+        return cls(**{**asdict(base or cls()), **data})
+
+
+# Retci rezultata po upitu (stupci koje očekuju parseri u DuneClientu)
+RowFactory = Callable[[random.Random, int], Dict[str, Any]]
+
+ROW_FACTORIES: Dict[int, RowFactory] = {
+    BITCOIN_PRICE_QUERY_ID: lambda rng, i: {"price_usd": round(rng.uniform(60000, 70000), 2), "symbol": "BTC"},
+    ETHEREUM_PRICE_QUERY_ID: lambda rng, i: {"price": round(rng.uniform(3000, 3500), 2), "symbol": "ETH"},
+    BITCOIN_PRICE_ALT_QUERY_ID: lambda rng, i: {"price": round(rng.uniform(60000, 70000), 2)},
+    ETHEREUM_STATUS_QUERY_ID: lambda rng, i: {
+        "last_block": 22417536 + i,
+        "gas_price": rng.randint(10, 60),
+        "transactions_count": rng.randint(1000, 2000),
+    },
+    BITCOIN_STATUS_QUERY_ID: lambda rng, i: {
+        "last_block": 840000 + i,
+        "fee_rate": round(rng.uniform(5, 60), 1),
+        "transactions_count": rng.randint(300000, 400000),
+        "difficulty": 78.3e12,
+        "hashrate": 650.2e18,
+    },
+}
+
+_DUNE_TYPES = {bool: "boolean", int: "bigint", float: "double", str: "varchar"}
+
+
+@dataclass
+class MockExecution:
+    execution_id: str
+    query_id: int
+    params: Dict[str, Any]
+    submitted_at: float
+    duration: float
+    fails: bool
+    profile: QueryProfile
+    rows: Optional[List[Dict[str, Any]]] = field(default=None, repr=False)
+
+
+class MockDuneServer:
+    """
+    Stanje zamjenskog Dune servera (izvršavanja, profili upita, statistika)
+
+    Izvršavanja napreduju prema stvarnom vremenu: stanje se računa iz
+    trenutka pokretanja i trajanja iz profila, bez pozadinskih zadataka.
+    """
+
+    def __init__(
+        self,
+        profiles: Optional[Dict[int, QueryProfile]] = None,
+        default_profile: Optional[QueryProfile] = None,
+        seed: int = 0,
+    ):
+        self.default_profile = default_profile or QueryProfile()
+        self.profiles: Dict[int, QueryProfile] = dict(profiles or {})
+        self.rng = random.Random(seed)
+        self.synthetic = SyntheticChain(seed=seed)
+        self.executions: Dict[str, MockExecution] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], seed: int = 0) -> "MockDuneServer":
+        """Profili iz JSON konfiguracije ({"default": {...}, "<query_id>": {...}})"""
+        default = QueryProfile.from_dict(config.get("default", {}))
+        profiles = {
+            int(query_id): QueryProfile.from_dict(values, default)
+            for query_id, values in config.items() if query_id != "default"
+        }
+        return cls(profiles, default, seed)
+
+    def profile(self, query_id: int) -> QueryProfile:
+        return self.profiles.get(query_id, self.default_profile)
+
+    def set_profile(self, query_id: int, profile: QueryProfile) -> None:
+        self.profiles[query_id] = profile
+
+    def _count(self, query_id: int, name: str) -> None:
+        with self._lock:
+            counters = self.stats.setdefault(str(query_id), {})
+            counters[name] = counters.get(name, 0) + 1
+
+    def _chance(self, rate: float) -> bool:
+        with self._lock:
+            return rate > 0 and self.rng.random() < rate
+
+    # Odgovori
+
+    def execute(self, query_id: int, params: Dict[str, Any]) -> MockExecution:
+        profile = self.profile(query_id)
+        with self._lock:
+            spread = profile.execution_time * profile.execution_jitter
+            duration = max(0.0, profile.execution_time + self.rng.uniform(-spread, spread))
+            fails = profile.error_rate > 0 and self.rng.random() < profile.error_rate
+        execution = MockExecution(
+            execution_id=f"01MOCK{uuid.uuid4().hex[:20].upper()}",
+            query_id=query_id,
+            params=params,
+            submitted_at=time.time(),
+            duration=duration,
+            fails=fails,
+            profile=profile,
+        )
+        self.executions[execution.execution_id] = execution
+        self._count(query_id, "executions")
+        return execution
+
+    def state(self, execution: MockExecution) -> str:
+        elapsed = time.time() - execution.submitted_at
+        if elapsed < execution.duration * 0.1:
+            return STATE_PENDING
+        if elapsed < execution.duration:
+            return STATE_EXECUTING
+        if execution.fails:
+            return STATE_FAILED
+        ttl = execution.profile.result_ttl
+        if ttl is not None and elapsed > execution.duration + ttl:
+            return STATE_EXPIRED
+        return STATE_COMPLETED
+
+    def status_body(self, execution: MockExecution) -> Dict[str, Any]:
+        state = self.state(execution)
+        body = {
+            "execution_id": execution.execution_id,
+            "query_id": execution.query_id,
+            "state": state,
+            "is_execution_finished": state not in (STATE_PENDING, STATE_EXECUTING),
+            "submitted_at": _iso(execution.submitted_at),
+        }
+        if state == STATE_COMPLETED:
+            body["execution_ended_at"] = _iso(execution.submitted_at + execution.duration)
+            body["result_metadata"] = {"total_row_count": execution.profile.rows}
+        return body
+
+    def _rows(self, execution: MockExecution) -> List[Dict[str, Any]]:
+        if execution.rows is None:
+            factory = ROW_FACTORIES.get(execution.query_id)
+            if factory is not None:
+                rng = random.Random(execution.execution_id)
+                execution.rows = [factory(rng, i) for i in range(execution.profile.rows)]
+            else:
+                # Ostali upiti vraćaju sintetičke Bitcoin transakcije
+                execution.rows = self.synthetic.transactions(limit=execution.profile.rows)
+        return execution.rows
+
+    def results_body(self, execution: MockExecution, limit: Optional[int], offset: int) -> Dict[str, Any]:
+        rows = self._rows(execution)
+        end = len(rows) if limit is None else min(len(rows), offset + limit)
+        page = rows[offset:end]
+        names = list(rows[0].keys()) if rows else []
+        body = {
+            "execution_id": execution.execution_id,
+            "query_id": execution.query_id,
+            "state": STATE_COMPLETED,
+            "is_execution_finished": True,
+            "submitted_at": _iso(execution.submitted_at),
+            "execution_ended_at": _iso(execution.submitted_at + execution.duration),
+            "result": {
+                "rows": page,
+                "metadata": {
+                    "column_names": names,
+                    "column_types": [_DUNE_TYPES.get(type(rows[0][name]), "varchar") for name in names],
+                    "row_count": len(page),
+                    "total_row_count": len(rows),
+                },
+            },
+        }
+        if end < len(rows):
+            body["next_offset"] = end
+            body["next_uri"] = f"{MOCK_API_PREFIX}/execution/{execution.execution_id}/results?limit={limit}&offset={end}"
+        return body
+
+
+def _iso(timestamp: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(timestamp)) + f".{int(timestamp % 1 * 1e6):06d}Z"
+
+
+def create_app(server: Optional[MockDuneServer] = None) -> FastAPI:
+    """FastAPI aplikacija zamjenskog servera"""
+    server = server or MockDuneServer()
+    app = FastAPI(title="Mock Dune API")
+    app.state.mock = server
+
+    async def simulate(query_id: int, profile: QueryProfile) -> Optional[JSONResponse]:
+        """Kašnjenje i nasumične greške iz profila (None = normalan odgovor)"""
+        if profile.latency > 0:
+            await asyncio.sleep(profile.latency)
+        if server._chance(profile.rate_limit_rate):
+            server._count(query_id, "rate_limited")
+            return JSONResponse(
+                status_code=429,
+                content={"error": "Too many requests"},
+                headers={"Retry-After": f"{profile.retry_after:g}"},
+            )
+        if server._chance(profile.http_error_rate):
+            server._count(query_id, "http_errors")
+            return JSONResponse(status_code=500, content={"error": "Internal error"})
+        return None
+
+    def find(execution_id: str) -> MockExecution:
+        execution = server.executions.get(execution_id)
+        if execution is None:
+            raise HTTPException(status_code=404, detail="Execution not found")
+        return execution
+
+    @app.post(f"{MOCK_API_PREFIX}/query/{{query_id}}/execute")
+    async def execute(query_id: int, request: Request):
+        failure = await simulate(query_id, server.profile(query_id))
+        if failure is not None:
+            return failure
+        body = await request.body()
+        try:
+            params = (json.loads(body) if body else {}).get("query_parameters") or {}
+        except (ValueError, AttributeError):
+            raise HTTPException(status_code=400, detail="Invalid JSON body")
+        execution = server.execute(query_id, params)
+        return {"execution_id": execution.execution_id, "state": STATE_PENDING}
+
+    @app.get(f"{MOCK_API_PREFIX}/execution/{{execution_id}}/status")
+    async def status(execution_id: str):
+        execution = find(execution_id)
+        failure = await simulate(execution.query_id, execution.profile)
+        if failure is not None:
+            return failure
+        server._count(execution.query_id, "status_calls")
+        return server.status_body(execution)
+
+    @app.get(f"{MOCK_API_PREFIX}/execution/{{execution_id}}/results")
+    async def results(execution_id: str, limit: Optional[int] = None, offset: int = 0):
+        execution = find(execution_id)
+        failure = await simulate(execution.query_id, execution.profile)
+        if failure is not None:
+            return failure
+        server._count(execution.query_id, "result_calls")
+        state = server.state(execution)
+        if state != STATE_COMPLETED:
+            return JSONResponse(status_code=400, content={"error": f"Execution is in state {state}"})
+        return server.results_body(execution, limit, offset)
+
+    # Upravljanje zamjenskim serverom
+
+    @app.get("/mock/stats")
+    async def mock_stats():
+        return {"executions": len(server.executions), "queries": server.stats}
+
+    @app.put("/mock/profiles/{query_id}")
+    async def mock_set_profile(query_id: int, values: Dict[str, Any]):
+        try:
+            profile = QueryProfile.from_dict(values, server.default_profile)
+        except (ValueError, TypeError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        server.set_profile(query_id, profile)
+        return asdict(profile)
+
+    @app.post("/mock/reset")
+    async def mock_reset():
+        server.executions.clear()
+        server.stats.clear()
+        return {"status": "ok"}
+
+    return app
+
+
+@contextmanager
+def serve_in_background(app: FastAPI, host: str = "127.0.0.1", port: int = 0, lifespan: str = "off") -> Iterator[str]:
+    """Pokreće ASGI aplikaciju (uvicorn) u pozadinskoj dretvi i vraća njen URL"""
+    import uvicorn
+
+    config = uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan=lifespan)
+    uvicorn_server = uvicorn.Server(config)
+    thread = threading.Thread(target=uvicorn_server.run, name="uvicorn-background", daemon=True)
+    thread.start()
+    while not uvicorn_server.started:
+        if not thread.is_alive():
+            raise RuntimeError("Server se nije pokrenuo")
+        time.sleep(0.01)
+    bound_port = uvicorn_server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://{host}:{bound_port}"
+    finally:
+        uvicorn_server.should_exit = True
+        thread.join()
+
+
+@contextmanager
+def run_in_background(server: Optional[MockDuneServer] = None, host: str = "127.0.0.1", port: int = 0) -> Iterator[str]:
+    """
+    Pokreće zamjenski server u pozadinskoj dretvi i vraća base_url za DuneClient
+
+        with run_in_background(MockDuneServer()) as base_url:
+            client = DuneClient(base_url=base_url)
+    """
+    with serve_in_background(create_app(server), host, port) as url:
+        yield f"{url}{MOCK_API_PREFIX}"
+
+
+def load_config(source: Optional[str]) -> Dict[str, Any]:
+    """Profili iz JSON datoteke ili JSON teksta"""
+    if not source:
+        return {}
+    if os.path.exists(source):
+        with open(source) as f:
+            return json.load(f)
+    return json.loads(source)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Lokalna zamjena za Dune API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--profiles", default=os.getenv("MOCK_DUNE_PROFILES"), help="JSON datoteka ili JSON tekst s profilima upita")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    mock = MockDuneServer.from_config(load_config(args.profiles), seed=args.seed)
+    print(f"Zamjenski Dune API: DUNE_API_BASE_URL=http://{args.host}:{args.port}{MOCK_API_PREFIX}")
+    uvicorn.run(create_app(mock), host=args.host, port=args.port)
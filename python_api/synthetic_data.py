@@ -0,0 +1,435 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+# Znakovi bech32 adresa
+BECH32_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+_BECH32_TRANSLATE = bytes.maketrans(bytes(range(256)), bytes(ord(BECH32_CHARSET[b & 31]) for b in range(256)))
+_BECH32_VALUES = {c: i for i, c in enumerate(BECH32_CHARSET)}
+# Parovi bech32 znakova za 10 bitova indeksa adrese
+_BECH32_PAIRS = [BECH32_CHARSET[i >> 5] + BECH32_CHARSET[i & 31] for i in range(1024)]
+
+# Blok 840000 (stvarno vrijeme rudarenja) je zadano sidro sintetičkog lanca
+ANCHOR_HEIGHT = 840000
+ANCHOR_TIME = 1713571767
+BLOCK_INTERVAL = 600
+
+# Svaki blok ima mjesta za SLOTS_PER_BLOCK transakcija; transakcija postoji ako je indeks < tx_count bloka
+SLOTS_PER_BLOCK = 4096
+# Broj sintetičkih adresa (sufiks adrese od 5 bech32 znakova kodira indeks)
+ADDRESS_POOL_BITS = 20
+ADDRESS_POOL_SIZE = 1 << ADDRESS_POOL_BITS
+_ADDRESS_BODY_LEN = 33
+_ADDRESS_INDEX_LEN = 5
+ADDRESS_LEN = 4 + _ADDRESS_BODY_LEN + _ADDRESS_INDEX_LEN
+# Broj adresa čiji se zbrojevi transakcija pamte
+ADDRESS_TOTALS_CACHE_SIZE = 4096
+
+_U32 = float(1 << 32)
+
+
+def _u32(data: bytes, offset: int) -> int:
+    return int.from_bytes(data[offset:offset + 4], "big")
+
+
+class SyntheticChain:
+    """
+    Brz i deterministički generator sintetičkih Bitcoin podataka
+
+    Svi podaci izvode se iz blake2b sažetka (ključ je seed) pa isti seed
+    uvijek daje iste podatke, a pojedini blok ili transakcija mogu se
+    izračunati bez generiranja ostatka lanca:
+
+    - blok na visini h uvijek ima isti hash, a previous_block_hash je hash
+      bloka h - 1; hash kodira visinu pa se blok po hashu ne traži
+    - txid kodira svoju poziciju (visina, indeks) pa dohvat po txid-u vraća
+      istu transakciju kao i popis transakcija
+    - pošiljatelj i primatelj biraju se bijektivnim preslikavanjem pozicije
+      na skup adresa, pa se transakcije adrese mogu nabrojati bez pretraživanja
+
+    Svaka transakcija izvodi se iz jednog sažetka svoje pozicije (a ne iz
+    toka sažetaka cijelog bloka) kako bi dohvat po txid-u i transakcije
+    adrese, raspršene po cijelom lancu, ostali jedan sažetak po transakciji;
+    iter_block_transactions zajednička polja bloka računa jednom.
+
+    S live=True vrh lanca raste s vremenom (jedan blok svakih BLOCK_INTERVAL sekundi).
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        tip_height: Optional[int] = None,
+        anchor_height: int = ANCHOR_HEIGHT,
+        anchor_time: int = ANCHOR_TIME,
+        live: bool = False,
+        base_price: float = 67890.0,
+    ):
+        self.seed = seed
+        self._key = hashlib.blake2b(str(seed).encode(), digest_size=32).digest()
+        # Stanje s već obrađenim ključem; svaki sažetak počinje njegovom kopijom
+        self._hasher = hashlib.blake2b(digest_size=64, key=self._key)
+        self.anchor_height = anchor_height
+        self.anchor_time = anchor_time
+        self.live = live
+        self._fixed_tip = tip_height if tip_height is not None else anchor_height
+        self.base_price = base_price
+
+        # Bijektivna preslikavanja (a * n + b) mod 2^20 za pošiljatelja i primatelja
+        params = self._digest(b"address-map")
+        self._sender_map = (_u32(params, 0) | 1, _u32(params, 4))
+        self._recipient_map = (_u32(params, 8) | 1, _u32(params, 12))
+        # Maske pozicije u txid-u i visine u hashu bloka
+        self._txid_mask = int.from_bytes(self._digest("txid-mask")[:6], "big")
+        self._height_mask = _u32(self._digest("height-mask"), 0)
+
+        # Sažeci se ponavljaju (npr. tx_count bloka, adrese) pa ih pamtimo
+        self._block_digest = lru_cache(maxsize=65536)(self._block_digest_uncached)
+        self.address = lru_cache(maxsize=65536)(self._address_uncached)
+        # Indeks adrese -> (prebrojano do visine, broj transakcija, prva visina, zadnja visina)
+        self._address_totals: "OrderedDict[int, Tuple[int, int, Optional[int], Optional[int]]]" = OrderedDict()
+        self._address_totals_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "SyntheticChain":
+        """Konfiguracija iz okoline (SYNTHETIC_SEED, SYNTHETIC_LIVE, SYNTHETIC_TIP_HEIGHT)"""
+        tip_height = os.getenv("SYNTHETIC_TIP_HEIGHT")
+        return cls(
+            seed=int(os.getenv("SYNTHETIC_SEED", "0")),
+            tip_height=int(tip_height) if tip_height else None,
+            live=os.getenv("SYNTHETIC_LIVE", "1") == "1",
+        )
+
+    def _digest(self, *parts: Any) -> bytes:
+        hasher = self._hasher.copy()
+        hasher.update(":".join(map(str, parts)).encode())
+        return hasher.digest()
+
+    # Lanac
+
+    @property
+    def tip_height(self) -> int:
+        if not self.live:
+            return self._fixed_tip
+        return max(self._fixed_tip, self.anchor_height + int(time.time() - self.anchor_time) // BLOCK_INTERVAL)
+
+    def tip_started_at(self) -> float:
+        """Vrijeme od kojeg vrijedi trenutni vrh (svakih BLOCK_INTERVAL sekundi u live načinu)"""
+        return self.anchor_time + (self.tip_height - self.anchor_height) * BLOCK_INTERVAL
+
+    def _block_digest_uncached(self, height: int) -> bytes:
+        return self._digest("block", height)
+
+    def block_hash(self, height: int) -> str:
+        # Stvarni hashevi blokova počinju nulama (proof of work); zadnjih 8 znakova kodira visinu
+        body = self._block_digest(height).hex()[:37]
+        return f"0000000000000000000{body}{height ^ int(body[:8], 16) ^ self._height_mask:08x}"
+
+    def block_timestamp(self, height: int) -> int:
+        jitter = _u32(self._block_digest(height), 32) % 300
+        return self.anchor_time + (height - self.anchor_height) * BLOCK_INTERVAL + jitter
+
+    def block_tx_count(self, height: int) -> int:
+        return 1000 + _u32(self._block_digest(height), 36) % 2001
+
+    def block(self, height: int) -> Optional[Dict[str, Any]]:
+        if height < 0 or height > self.tip_height:
+            return None
+        d = self._block_digest(height)
+        size = 1000000 + _u32(d, 40) % 1000001
+        return {
+            "height": height,
+            "hash": self.block_hash(height),
+            "timestamp": self.block_timestamp(height),
+            "size": size,
+            "tx_count": self.block_tx_count(height),
+            "miner": self.address(_u32(d, 44) % ADDRESS_POOL_SIZE),
+            "difficulty": "78.3T",
+            "weight": size * 4,
+            "version": "0x20000000",
+            "merkle_root": self._digest("merkle", height).hex()[:64],
+            "bits": "386604799",
+            "nonce": _u32(d, 48),
+            "previous_block_hash": self.block_hash(height - 1) if height > 0 else None
+        }
+
+    def blocks(self, limit: int = 5, start_height: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Blokovi od start_height (zadano: vrh lanca) prema nižim visinama"""
+        start = self.tip_height if start_height is None else min(start_height, self.tip_height)
+        return [self.block(height) for height in range(start, max(start - limit, -1), -1)]
+
+    def block_by_hash(self, block_hash: str) -> Optional[Dict[str, Any]]:
+        """Blok po hashu (visina se čita iz hasha, a hash se zatim provjerava)"""
+        if len(block_hash) != 64:
+            return None
+        block_hash = block_hash.lower()
+        try:
+            height = int(block_hash[56:], 16) ^ int(block_hash[19:27], 16) ^ self._height_mask
+        except ValueError:
+            return None
+        block = self.block(height)
+        return block if block is not None and block["hash"] == block_hash else None
+
+    # Adrese
+
+    def _address_uncached(self, index: int) -> str:
+        hasher = self._hasher.copy()
+        hasher.update(b"address:%d" % index)
+        body = hasher.digest()[:_ADDRESS_BODY_LEN].translate(_BECH32_TRANSLATE).decode()
+        # Sufiks od 5 znakova (25 bitova) kodira indeks
+        suffix = BECH32_CHARSET[(index >> 20) & 31] + _BECH32_PAIRS[(index >> 10) & 1023] + _BECH32_PAIRS[index & 1023]
+        return f"bc1q{body}{suffix}"
+
+    def address_index(self, address: str) -> Optional[int]:
+        """Indeks sintetičke adrese ili None ako adresa nije iz skupa"""
+        if len(address) != ADDRESS_LEN or not address.startswith("bc1q"):
+            return None
+        index = 0
+        for c in address[-_ADDRESS_INDEX_LEN:]:
+            value = _BECH32_VALUES.get(c)
+            if value is None:
+                return None
+            index = (index << 5) | value
+        if index >= ADDRESS_POOL_SIZE or self.address(index) != address:
+            return None
+        return index
+
+    def _alias_index(self, address: str) -> int:
+        """Adrese izvan skupa preslikavaju se na jednu adresu iz skupa"""
+        index = self.address_index(address)
+        if index is None:
+            index = _u32(self._digest("alias", address), 0) % ADDRESS_POOL_SIZE
+        return index
+
+    def alias_address(self, address: str) -> str:
+        """Adresa iz skupa pod kojom se u blokovima pojavljuju transakcije adrese"""
+        return self.address(self._alias_index(address))
+
+    # Transakcije
+
+    def _slot_address(self, slot: int, mapping: Tuple[int, int]) -> int:
+        a, b = mapping
+        return (slot * a + b) & (ADDRESS_POOL_SIZE - 1)
+
+    def _slot_residue(self, index: int, mapping: Tuple[int, int]) -> int:
+        """Ostatak mod 2^20 svih pozicija na kojima je adresa index (inverz preslikavanja)"""
+        a, b = mapping
+        return ((index - b) * pow(a, -1, ADDRESS_POOL_SIZE)) & (ADDRESS_POOL_SIZE - 1)
+
+    def _txid(self, height: int, index: int, d: bytes) -> str:
+        # Pozicija se maskira prvim bajtovima txid-a pa se dekodira bez dodatnog sažetka
+        prefix = d[:26]
+        position = ((height << 16) | index) ^ int.from_bytes(prefix[:6], "big") ^ self._txid_mask
+        return f"{prefix.hex()}{position:012x}"
+
+    def _decode_txid(self, txid: str) -> Optional[Tuple[int, int]]:
+        raw = bytes.fromhex(txid)
+        position = int.from_bytes(raw[26:32], "big") ^ int.from_bytes(raw[:6], "big") ^ self._txid_mask
+        return position >> 16, position & 0xFFFF
+
+    def txid_height(self, txid: str) -> Optional[int]:
+        """Visina bloka kodirana u txid-u (None ako txid nije heksadekadski zapis od 32 bajta)"""
+        try:
+            if len(txid) != 64:
+                return None
+            return self._decode_txid(txid.lower())[0]
+        except ValueError:
+            return None
+
+    def _transaction(self, height: int, index: int, timestamp: int, confirmations: int) -> Dict[str, Any]:
+        hasher = self._hasher.copy()
+        hasher.update(b"tx:%d:%d" % (height, index))
+        d = hasher.digest()
+        slot = height * SLOTS_PER_BLOCK + index
+        (sender_a, sender_b), (recipient_a, recipient_b) = self._sender_map, self._recipient_map
+        return {
+            "txid": self._txid(height, index, d),
+            "block_height": height,
+            "timestamp": timestamp,
+            "sender": self.address((slot * sender_a + sender_b) & (ADDRESS_POOL_SIZE - 1)),
+            "recipient": self.address((slot * recipient_a + recipient_b) & (ADDRESS_POOL_SIZE - 1)),
+            "value": str(round(0.001 + int.from_bytes(d[26:30], "big") / _U32 * 1.999, 8)),
+            "fee": str(round(0.00001 + int.from_bytes(d[30:34], "big") / _U32 * 0.00099, 8)),
+            "confirmations": confirmations
+        }
+
+    def transaction_at(self, height: int, index: int) -> Optional[Dict[str, Any]]:
+        """Transakcija na poziciji (visina bloka, indeks u bloku)"""
+        tip = self.tip_height
+        if height < 0 or height > tip or index >= self.block_tx_count(height):
+            return None
+        return self._transaction(height, index, self.block_timestamp(height), tip - height + 1)
+
+    def transaction(self, txid: str) -> Dict[str, Any]:
+        """
+        Transakcija po txid-u
+
+        Txid-ovi koje je generirao ovaj lanac vraćaju istu transakciju kao i
+        popisi; za ostale se transakcija deterministički izvodi iz txid-a.
+        """
+        txid = txid.lower()
+        height, index = self._decode_txid(txid)
+        tx = self.transaction_at(height, index) if height <= self.tip_height else None
+        if tx is not None and tx["txid"] == txid:
+            return tx
+
+        d = self._digest("foreign-tx", txid)
+        height = self.tip_height - _u32(d, 0) % 1000
+        tx = self.transaction_at(height, _u32(d, 4) % self.block_tx_count(height))
+        tx["txid"] = txid
+        return tx
+
+    def is_known_txid(self, txid: str) -> bool:
+        """Je li txid generirao ovaj lanac"""
+        try:
+            height, index = self._decode_txid(txid.lower())
+        except ValueError:
+            return False
+        tx = self.transaction_at(height, index) if height <= self.tip_height else None
+        return tx is not None and tx["txid"] == txid.lower()
+
+    def iter_block_transactions(self, height: int) -> Iterator[Dict[str, Any]]:
+        """Sve transakcije bloka (polja zajednička bloku računaju se jednom)"""
+        tip = self.tip_height
+        if height < 0 or height > tip:
+            return
+        timestamp = self.block_timestamp(height)
+        for index in range(self.block_tx_count(height)):
+            yield self._transaction(height, index, timestamp, tip - height + 1)
+
+    def _latest_slots(self, top_height: int) -> Iterator[Tuple[int, int]]:
+        for height in range(top_height, -1, -1):
+            for index in range(self.block_tx_count(height)):
+                yield height, index
+
+    def _address_slots(self, address_index: int, top_height: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+        """Pozicije transakcija adrese od najnovije (najviše u bloku top_height) prema starijima"""
+        if top_height is None:
+            top_height = self.tip_height
+        top = top_height * SLOTS_PER_BLOCK + SLOTS_PER_BLOCK - 1
+        cursors = []
+        for mapping in (self._sender_map, self._recipient_map):
+            residue = self._slot_residue(address_index, mapping)
+            cursors.append(top - ((top - residue) % ADDRESS_POOL_SIZE))
+
+        while max(cursors) >= 0:
+            i = 0 if cursors[0] >= cursors[1] else 1
+            slot = cursors[i]
+            cursors[i] -= ADDRESS_POOL_SIZE
+            # Ista pozicija može pripadati adresi i kao pošiljatelju i kao primatelju
+            if cursors[1 - i] == slot:
+                cursors[1 - i] -= ADDRESS_POOL_SIZE
+            height, index = divmod(slot, SLOTS_PER_BLOCK)
+            if index < self.block_tx_count(height):
+                yield height, index
+
+    def transactions(
+        self,
+        address: Optional[str] = None,
+        limit: int = 10,
+        offset: int = 0,
+        before_height: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Zadnje transakcije (ili transakcije adrese), od najnovije prema starijima
+
+        S before_height vraćaju se samo transakcije iz blokova ispod te visine.
+        """
+        top_height = self.tip_height if before_height is None else min(before_height - 1, self.tip_height)
+        if top_height < 0:
+            return []
+        if address:
+            alias = self.alias_address(address)
+            slots = self._address_slots(self._alias_index(address), top_height)
+        else:
+            alias = None
+            slots = self._latest_slots(top_height)
+
+        transactions = []
+        for position, (height, index) in enumerate(slots):
+            if position < offset:
+                continue
+            if len(transactions) >= limit:
+                break
+            tx = self.transaction_at(height, index)
+            if alias is not None and alias != address:
+                # Adresa izvan sintetičkog skupa preuzima transakcije svog zamjenskog indeksa
+                if tx["sender"] == alias:
+                    tx["sender"] = address
+                if tx["recipient"] == alias:
+                    tx["recipient"] = address
+            transactions.append(tx)
+        return transactions
+
+    def _address_totals_at(self, address_index: int, tip_height: int) -> Tuple[int, Optional[int], Optional[int]]:
+        """
+        Broj transakcija adrese i visine prve/zadnje transakcije do tip_height
+
+        Zbrojevi se pamte po adresi, pa se nakon novih blokova prolaze samo
+        pozicije iznad već prebrojanog vrha (umjesto cijelog lanca).
+        """
+        with self._address_totals_lock:
+            cached = self._address_totals.get(address_index)
+        if cached is not None and cached[0] > tip_height:
+            cached = None
+        counted_to, tx_count, first_seen, last_seen = cached or (-1, 0, None, None)
+
+        if counted_to < tip_height:
+            newest = None
+            for height, _ in self._address_slots(address_index, tip_height):
+                if height <= counted_to:
+                    break
+                if newest is None:
+                    newest = height
+                if tx_count == 0 or height < first_seen:
+                    first_seen = height
+                tx_count += 1
+            if newest is not None:
+                last_seen = newest
+
+        with self._address_totals_lock:
+            self._address_totals[address_index] = (tip_height, tx_count, first_seen, last_seen)
+            self._address_totals.move_to_end(address_index)
+            while len(self._address_totals) > ADDRESS_TOTALS_CACHE_SIZE:
+                self._address_totals.popitem(last=False)
+        return tx_count, first_seen, last_seen
+
+    def address_info(self, address: str) -> Dict[str, Any]:
+        d = self._digest("address-info", address)
+        balance = round(0.1 + _u32(d, 0) / _U32 * 9.9, 8)
+        total_received = round(balance + 1 + _u32(d, 4) / _U32 * 19, 8)
+
+        tx_count, first_seen_height, last_seen_height = self._address_totals_at(self._alias_index(address), self.tip_height)
+        if tx_count == 0:
+            first_seen_height = last_seen_height = self.tip_height
+
+        return {
+            "address": address,
+            "balance": str(balance),
+            "tx_count": tx_count,
+            "total_received": str(total_received),
+            "total_sent": str(round(total_received - balance, 8)),
+            "first_seen": self.block_timestamp(first_seen_height),
+            "last_seen": self.block_timestamp(last_seen_height)
+        }
+
+    # Cijene
+
+    def price_history(self, days: int = 7) -> List[Dict[str, Any]]:
+        """Dnevne cijene (od najstarije prema najnovijoj), slučajni hod određen seedom"""
+        tip_day = self.block_timestamp(self.tip_height) // 86400
+        price = self.base_price
+        history = []
+        for day in range(tip_day, tip_day - days, -1):
+            history.append({
+                "date": time.strftime("%Y-%m-%d", time.gmtime(day * 86400)),
+                "price": round(price, 2)
+            })
+            # Promjena cijene između -5% i +5% (unatrag prema starijim danima)
+            change = _u32(self._digest("price", day), 0) / _U32 * 0.1 - 0.05
+            price = price / (1 + change)
+        history.reverse()
+        return history
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Moduli API-ja su u nadređenoj mapi (pokreće se s python -m pytest python_api/tests)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
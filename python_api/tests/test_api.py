@@ -0,0 +1,144 @@
+import asyncio
+import importlib
+import os
+import time
+
+import httpx
+import pytest
+
+from mock_dune_server import MockDuneServer, QueryProfile, run_in_background, serve_in_background
+
+
+@pytest.fixture(scope="module")
+def app_client(tmp_path_factory):
+    """API nad zamjenskim Dune serverom, s indeksima sinkroniziranima do vrha lanca"""
+    server = MockDuneServer(default_profile=QueryProfile(execution_time=0.01))
+    with run_in_background(server) as url:
+        # main čita postavke pri uvozu
+        os.environ.update(
+            DUNE_API_BASE_URL=url,
+            PYTHON_API_DATA_DIR=str(tmp_path_factory.mktemp("data")),
+            DUNE_BACKGROUND_REFRESH="0",
+            SYNTHETIC_LIVE="0",
+            BLOCK_INDEX_INITIAL_DEPTH="50",
+        )
+        main = importlib.import_module("main")
+        with serve_in_background(main.app, lifespan="on") as base:
+            deadline = time.monotonic() + 60
+            while main.app.state.tx_index.tip_height is None and time.monotonic() < deadline:
+                time.sleep(0.05)
+            with httpx.Client(base_url=base, timeout=30) as client:
+                yield client, main.app.state.dune_client.synthetic
+
+
+def test_bad_cursor_is_400_with_short_message(app_client):
+    client, chain = app_client
+    response = client.get(f"/api/bitcoin/transactions/{chain.address(7)}", params={"cursor": "x:" + "ab" * 32})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Neispravan kursor: x:" + "ab" * 32
+
+
+def test_cursor_from_index_continues_on_direct_fetch(app_client):
+    client, chain = app_client
+    import main
+    from tx_index import decode_cursor
+
+    class Source:
+        async def get_bitcoin_transactions(self, address, limit, before_height=None):
+            return chain.transactions(address, limit, 0, before_height)
+
+    address = chain.address(7)
+    first = client.get(f"/api/bitcoin/transactions/{address}", params={"limit": 3})
+    cursor = first.headers["x-next-cursor"]
+    second = client.get(f"/api/bitcoin/transactions/{address}", params={"limit": 3, "cursor": cursor})
+    direct = asyncio.run(main.fetch_address_page(Source(), address, 3, decode_cursor(cursor)))
+    assert [tx["txid"] for tx in direct] == [tx["txid"] for tx in second.json()]
+
+
+def test_direct_fetch_orders_like_the_index(app_client):
+    _, chain = app_client
+    import main
+
+    # Izvor vraća sve transakcije bloka u proizvoljnom redoslijedu
+    rows = [
+        {"txid": f"{i:064x}", "block_height": height, "sender": "a", "recipient": "b"}
+        for height in (12, 11, 10) for i in (3, 9, 1)
+    ]
+
+    class Source:
+        async def get_bitcoin_transactions(self, address, limit, before_height=None):
+            matching = [tx for tx in rows if before_height is None or tx["block_height"] < before_height]
+            return matching[:limit]
+
+    pages, position = [], None
+    while True:
+        page = asyncio.run(main.fetch_address_page(Source(), "a", 2, position))
+        pages.extend((tx["block_height"], tx["txid"]) for tx in page)
+        if len(page) < 2:
+            break
+        position = pages[-1]
+    assert pages == sorted(((tx["block_height"], tx["txid"]) for tx in rows), reverse=True)
+
+
+def test_batch_params_are_validated_per_type(app_client):
+    client, chain = app_client
+    requests = [
+        {"id": "broj-kao-tekst", "type": "bitcoin_blocks", "params": {"limit": "3"}},
+        {"id": "nije-broj", "type": "bitcoin_blocks", "params": {"limit": "abc"}},
+        {"id": "nula", "type": "bitcoin_address_transactions", "params": {"address": chain.address(1), "limit": 0}},
+        {"id": "visak", "type": "bitcoin_status", "params": {"bogus": 1}},
+        {"id": "nedostaje", "type": "bitcoin_block", "params": {}},
+    ]
+    response = client.post("/api/batch", json={"requests": requests})
+    results = {result["id"]: result for result in response.json()["results"]}
+
+    assert results["broj-kao-tekst"]["status"] == 200
+    assert len(results["broj-kao-tekst"]["data"]) == 3
+    for request_id in ("nije-broj", "nula", "visak", "nedostaje"):
+        assert results[request_id]["status"] == 400
+
+
+@pytest.mark.parametrize("limit", [0, -1, 1001])
+def test_address_page_rejects_out_of_range_limit(app_client, limit):
+    client, chain = app_client
+    response = client.get(f"/api/bitcoin/transactions/{chain.address(7)}", params={"limit": limit})
+    assert response.status_code == 422
+
+
+def test_address_page_returns_cursor_for_full_page(app_client):
+    client, chain = app_client
+    response = client.get(f"/api/bitcoin/transactions/{chain.address(7)}", params={"limit": 5})
+    assert response.status_code == 200
+    assert len(response.json()) == 5
+    assert response.headers.get("x-next-cursor")
+
+
+def test_transaction_lookup_falls_back_outside_indexed_range(app_client):
+    client, chain = app_client
+    tip = chain.tip_height
+    for height in (tip, tip - 500):
+        tx = chain.transaction_at(height, 3)
+        response = client.get(f"/api/bitcoin/transaction/{tx['txid']}")
+        assert response.status_code == 200
+        assert response.json()["txid"] == tx["txid"]
+
+
+def test_missing_transaction_in_indexed_range_is_404(app_client):
+    client, chain = app_client
+    missing = chain._txid(chain.tip_height, 4000, bytes(64))
+    assert client.get(f"/api/bitcoin/transaction/{missing}").status_code == 404
+    assert client.get("/api/bitcoin/transaction/nothex").status_code == 404
+
+
+def test_batch_address_page_carries_next_cursor(app_client):
+    client, chain = app_client
+    address = chain.address(7)
+    first = {"id": "prva", "type": "bitcoin_address_transactions", "params": {"address": address, "limit": 3}}
+    result = client.post("/api/batch", json={"requests": [first]}).json()["results"][0]
+    direct = client.get(f"/api/bitcoin/transactions/{address}", params={"limit": 3})
+    assert result["next_cursor"] == direct.headers["x-next-cursor"]
+
+    second = {"id": "druga", "type": "bitcoin_address_transactions", "params": {"address": address, "limit": 3, "cursor": result["next_cursor"]}}
+    result = client.post("/api/batch", json={"requests": [second]}).json()["results"][0]
+    assert result["status"] == 200
+    assert result["data"][0]["txid"] not in {tx["txid"] for tx in direct.json()}
@@ -0,0 +1,63 @@
+import asyncio
+
+from block_index import BlockIndex
+from synthetic_data import SyntheticChain
+
+FORK_HEIGHT = 995
+
+
+def _forked(block):
+    """Blok s druge grane lanca (iznad FORK_HEIGHT)"""
+    block = dict(block)
+    if block["height"] > FORK_HEIGHT:
+        block["hash"] = "f" + block["hash"][1:]
+    if block["height"] > FORK_HEIGHT + 1:
+        block["previous_block_hash"] = "f" + block["previous_block_hash"][1:]
+    return block
+
+
+def test_sync_rewinds_to_common_block_after_reorg(tmp_path):
+    chain = SyntheticChain(tip_height=1000)
+    index = BlockIndex(str(tmp_path / "blocks.sqlite3"), initial_depth=20)
+    forked = False
+
+    async def fetch(limit, start_height):
+        blocks = chain.blocks(limit, start_height)
+        return [_forked(block) for block in blocks] if forked else blocks
+
+    async def main():
+        nonlocal forked
+        assert await index.sync(fetch) == 20
+        forked = True
+        # Nova grana je i dulja za dva bloka
+        chain._fixed_tip = 1002
+        return await index.sync(fetch)
+
+    added = asyncio.run(main())
+    assert index.reorgs == 1
+    assert added == 1002 - FORK_HEIGHT
+    assert index.tip_height == 1002
+    assert index.hash_at(FORK_HEIGHT) == chain.block(FORK_HEIGHT)["hash"]
+    assert index.hash_at(FORK_HEIGHT + 1).startswith("f")
+    index.close()
+
+
+def test_sync_rewinds_when_tip_is_replaced(tmp_path):
+    chain = SyntheticChain(tip_height=1000)
+    index = BlockIndex(str(tmp_path / "blocks.sqlite3"), initial_depth=20)
+    forked = False
+
+    async def fetch(limit, start_height):
+        blocks = chain.blocks(limit, start_height)
+        return [_forked(block) for block in blocks] if forked else blocks
+
+    async def main():
+        nonlocal forked
+        await index.sync(fetch)
+        forked = True
+        return await index.sync(fetch)
+
+    assert asyncio.run(main()) == 1000 - FORK_HEIGHT
+    assert index.reorgs == 1
+    assert index.hash_at(1000).startswith("f")
+    index.close()
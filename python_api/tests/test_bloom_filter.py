@@ -0,0 +1,23 @@
+from bloom_filter import BloomFilter
+
+
+def test_added_keys_are_always_found():
+    bloom = BloomFilter(1000)
+    keys = [f"{i:064x}" for i in range(1000)]
+    bloom.update(keys)
+    assert all(key in bloom for key in keys)
+
+
+def test_false_positive_rate_near_target():
+    bloom = BloomFilter(10_000, error_rate=0.01)
+    bloom.update(f"dodan-{i}" for i in range(10_000))
+    false_positives = sum(f"nije-{i}" in bloom for i in range(20_000))
+    assert false_positives / 20_000 < 0.02
+    assert bloom.expected_error_rate() < 0.02
+
+
+def test_duplicate_is_not_counted_twice():
+    bloom = BloomFilter(100)
+    assert bloom.add("a")
+    assert not bloom.add("a")
+    assert bloom.count == 1
@@ -0,0 +1,68 @@
+import time
+
+from dune_breaker import CircuitBreaker, CircuitBreakers, BREAKER_CLOSED, BREAKER_OPEN, BREAKER_HALF_OPEN
+from dune_client import DuneClient
+from dune_polling import PollingPolicy
+from mock_dune_server import MockDuneServer, QueryProfile, run_in_background
+
+
+def test_opens_after_threshold_and_short_circuits():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    assert breaker.state == BREAKER_CLOSED
+    breaker.record_failure()
+    assert breaker.state == BREAKER_OPEN
+    assert not breaker.allow()
+    assert breaker.short_circuited == 1
+
+
+def test_half_open_allows_single_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.allow()
+    assert breaker.state == BREAKER_HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.failures == 0
+
+
+def test_failed_probe_doubles_reset_timeout():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01, max_reset_timeout=0.015)
+    breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == BREAKER_OPEN
+    assert breaker.reset_timeout == 0.015
+
+
+def test_abandon_frees_probe_slot():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.allow()
+    breaker.abandon()
+    assert breaker.allow()
+
+
+def test_limiter_timeout_is_not_a_breaker_failure():
+    server = MockDuneServer(default_profile=QueryProfile(execution_time=0.01))
+    with run_in_background(server) as url:
+        client = DuneClient(
+            "test-key",
+            base_url=url,
+            executions_per_minute=0.0001,
+            execution_burst=1,
+            polling={5132855: PollingPolicy(first_delay=0.01, deadline=0.1)},
+            breakers=CircuitBreakers(failure_threshold=2),
+        )
+        # Potroši jedini token: sljedeća izvršavanja istječu u redu limitera
+        client.limiter.acquire()
+        for _ in range(3):
+            client.execute_query(5132855)
+        breaker = client.breakers.get(5132855)
+        assert breaker.state == BREAKER_CLOSED
+        assert breaker.failures == 0
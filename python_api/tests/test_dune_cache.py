@@ -0,0 +1,43 @@
+import time
+
+from dune_cache import ResultCache, cache_key
+
+
+def test_cache_key_ignores_param_order():
+    assert cache_key(1, {"a": 1, "b": 2}) == cache_key(1, {"b": 2, "a": 1})
+    assert cache_key(1) == cache_key(1, {})
+
+
+def test_fresh_entry_is_hit_and_expired_entry_is_miss():
+    cache = ResultCache(default_ttl=60)
+    cache.set(1, None, {"rows": [1]})
+    assert cache.get(1) == {"rows": [1]}
+
+    cache.set(2, None, {"rows": [2]}, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get(2) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2)
+    cache.set(1, None, {"v": 1})
+    cache.set(2, None, {"v": 2})
+    cache.get(1)
+    cache.set(3, None, {"v": 3})
+    assert cache.peek(2) is None
+    assert cache.peek(1) is not None and cache.peek(3) is not None
+    assert cache.evictions == 1
+
+
+def test_lookup_serves_stale_entry_within_max_stale():
+    cache = ResultCache(max_stale=60)
+    now = time.time()
+    cache.set(1, None, {"v": 1}, ttl=10, fetched_at=now - 20)
+    entry = cache.lookup(1)
+    assert entry is not None and not entry.fresh
+    assert cache.stale_hits == 1
+
+    cache.set(2, None, {"v": 2}, ttl=10, fetched_at=now - 100)
+    assert cache.lookup(2) is None
@@ -0,0 +1,31 @@
+import asyncio
+
+from dune_cache import ResultCache
+from dune_client import AsyncDuneClient
+from mock_dune_server import MockDuneServer, QueryProfile, run_in_background
+
+
+def test_refresh_reuses_fresh_result_only_when_asked():
+    server = MockDuneServer(default_profile=QueryProfile(execution_time=0.01))
+    with run_in_background(server) as url:
+        async def main():
+            client = AsyncDuneClient("test-key", base_url=url, cache=ResultCache())
+            executions = 0
+            execute = client._execute
+
+            async def counting(*args):
+                nonlocal executions
+                executions += 1
+                return await execute(*args)
+
+            client._execute = counting
+            try:
+                await client.execute_query(2309371)
+                await client.refresh(2309371, reuse_fresh=True)
+                reused = executions
+                await client.refresh(2309371)
+                return reused, executions
+            finally:
+                await client.aclose()
+
+        assert asyncio.run(main()) == (1, 2)
@@ -0,0 +1,44 @@
+import asyncio
+import time
+
+from dune_cache import ResultCache
+from dune_client import AsyncDuneClient
+from dune_ledger import ExecutionLedger
+from dune_scheduler import RefreshScheduler
+
+
+def _age(ledger, execution_id, seconds):
+    with ledger._lock:
+        ledger._conn.execute(
+            "UPDATE executions SET updated_at = ? WHERE execution_id = ?", (time.time() - seconds, execution_id)
+        )
+
+
+def test_prune_removes_only_old_records(tmp_path):
+    ledger = ExecutionLedger(str(tmp_path / "ledger.sqlite3"))
+    ledger.record_submitted("staro", 5132855)
+    ledger.record_submitted("novo", 5132855)
+    _age(ledger, "staro", 3600)
+
+    assert ledger.prune(older_than=60) == 1
+    assert ledger.find_pending(5132855) == "novo"
+    ledger.close()
+
+
+def test_scheduler_prunes_ledger_periodically(tmp_path):
+    ledger = ExecutionLedger(str(tmp_path / "ledger.sqlite3"))
+    ledger.record_submitted("staro", 5132855)
+    _age(ledger, "staro", 3600)
+
+    async def main():
+        client = AsyncDuneClient("test-key", cache=ResultCache(), ledger=ledger)
+        scheduler = RefreshScheduler(client, tick=0.01, ledger_retention=60, prune_interval=0)
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+        await client.aclose()
+
+    asyncio.run(main())
+    with ledger._lock:
+        assert ledger._conn.execute("SELECT COUNT(*) FROM executions").fetchone()[0] == 0
+    ledger.close()
@@ -0,0 +1,25 @@
+from dune_cache import ResultCache
+from dune_store import ResultStore
+
+
+def test_writer_survives_failed_write(tmp_path, monkeypatch):
+    store = ResultStore(str(tmp_path))
+    original = store._write
+    calls = []
+
+    def failing_once(*args):
+        calls.append(args)
+        if len(calls) == 1:
+            raise OSError("disk je pun")
+        original(*args)
+
+    monkeypatch.setattr(store, "_write", failing_once)
+    store.save(1, None, {"rows": [1]})
+    store.save(2, None, {"rows": [2]})
+    store.flush()
+    assert store._worker.is_alive()
+
+    cache = ResultCache()
+    assert store.load_into(cache) == 1
+    assert cache.peek(2).value == {"rows": [2]}
+    store.close()
@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+
+from dune_ratelimit import (
+    TokenBucket,
+    RateLimiter,
+    AsyncRateLimiter,
+    PRIORITY_CORE,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_BACKGROUND,
+    parse_retry_after,
+)
+
+
+def test_token_bucket_refills_at_rate():
+    bucket = TokenBucket(rate=10, capacity=2)
+    now = bucket.updated
+    bucket.take()
+    bucket.take()
+    assert bucket.delay(now) > 0
+    assert bucket.delay(now + 0.2) == 0
+    # Ne puni se iznad kapaciteta
+    bucket.delay(now + 10)
+    assert bucket.tokens == 2
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None, default=7) == 7
+    assert parse_retry_after("nije datum", default=7) == 7
+
+
+def test_limiter_times_out_without_tokens():
+    limiter = RateLimiter(rate=0.001, burst=1)
+    assert limiter.acquire()
+    assert not limiter.acquire(timeout=0.05)
+    assert limiter.timeouts == 1
+
+
+def test_waiters_are_served_by_priority():
+    limiter = RateLimiter(rate=20, burst=1)
+    limiter.acquire()
+    order = []
+
+    def wait(priority):
+        limiter.acquire(priority)
+        order.append(priority)
+
+    threads = [threading.Thread(target=wait, args=(p,)) for p in (PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, PRIORITY_CORE)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join()
+    assert order == [PRIORITY_CORE, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND]
+
+
+def test_async_waiters_are_served_by_priority():
+    async def main():
+        limiter = AsyncRateLimiter(rate=20, burst=1)
+        await limiter.acquire()
+        order = []
+
+        async def wait(priority):
+            await limiter.acquire(priority)
+            order.append(priority)
+
+        await asyncio.gather(*(wait(p) for p in (PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, PRIORITY_CORE)))
+        return order
+
+    assert asyncio.run(main()) == [PRIORITY_CORE, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND]
+
+
+def test_promote_moves_waiter_ahead():
+    async def main():
+        limiter = AsyncRateLimiter(rate=20, burst=1)
+        await limiter.acquire()
+        order = []
+
+        async def wait(name, priority):
+            await limiter.acquire(priority, key=name)
+            order.append(name)
+
+        tasks = [asyncio.ensure_future(wait("pozadina", PRIORITY_BACKGROUND)), asyncio.ensure_future(wait("korisnik", PRIORITY_INTERACTIVE))]
+        await asyncio.sleep(0)
+        limiter.promote("pozadina", PRIORITY_CORE)
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(main()) == ["pozadina", "korisnik"]
@@ -0,0 +1,79 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from dune_singleflight import SingleFlight, AsyncSingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    executions = []
+    started = threading.Event()
+
+    def slow():
+        executions.append(1)
+        started.set()
+        time.sleep(0.1)
+        return "rezultat"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", slow)))
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=lambda: results.append(flight.do("k", slow))) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    for thread in [leader] + followers:
+        thread.join()
+
+    assert len(executions) == 1
+    assert results == ["rezultat"] * 5
+    assert flight.stats() == {"calls": 5, "coalesced": 4, "in_flight": 0}
+
+
+def test_error_is_raised_to_every_caller():
+    flight = SingleFlight()
+
+    def fail():
+        raise RuntimeError("greška")
+
+    with pytest.raises(RuntimeError):
+        flight.do("k", fail)
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_async_calls_share_one_execution():
+    flight = AsyncSingleFlight()
+    executions = 0
+
+    async def slow(value):
+        nonlocal executions
+        executions += 1
+        await asyncio.sleep(0.05)
+        return value
+
+    async def main():
+        return await asyncio.gather(*(flight.do("k", slow, 42) for _ in range(5)))
+
+    assert asyncio.run(main()) == [42] * 5
+    assert executions == 1
+    assert flight.stats() == {"calls": 5, "coalesced": 4, "in_flight": 0}
+
+
+def test_async_cancelled_caller_does_not_cancel_others():
+    flight = AsyncSingleFlight()
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def main():
+        first = asyncio.ensure_future(flight.do("k", slow))
+        second = asyncio.ensure_future(flight.do("k", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == "ok"
@@ -0,0 +1,35 @@
+from synthetic_data import SyntheticChain
+
+
+def _scan_totals(chain, address):
+    """Broj transakcija i prva/zadnja visina prolaskom kroz cijeli lanac"""
+    heights = [height for height, _ in chain._address_slots(chain._alias_index(address))]
+    return len(heights), min(heights), max(heights)
+
+
+def test_address_info_matches_full_scan_as_chain_grows():
+    chain = SyntheticChain(tip_height=840000)
+    addresses = [chain.address(3), "bc1qadresaizvanskupa"]
+    for tip in (840000, 840050, 845000):
+        chain._fixed_tip = tip
+        for address in addresses:
+            info = chain.address_info(address)
+            tx_count, first_height, last_height = _scan_totals(chain, address)
+            assert info["tx_count"] == tx_count
+            assert info["first_seen"] == chain.block_timestamp(first_height)
+            assert info["last_seen"] == chain.block_timestamp(last_height)
+
+
+def test_address_totals_recount_after_tip_moves_back():
+    chain = SyntheticChain(tip_height=845000)
+    address = chain.address(3)
+    chain.address_info(address)
+    chain._fixed_tip = 840000
+    assert chain.address_info(address)["tx_count"] == _scan_totals(chain, address)[0]
+
+
+def test_transactions_list_agrees_with_tx_count():
+    chain = SyntheticChain(tip_height=840000)
+    address = chain.address(3)
+    info = chain.address_info(address)
+    assert len(chain.transactions(address, limit=info["tx_count"] + 10)) == info["tx_count"]
@@ -0,0 +1,17 @@
+import json
+
+from tracing import TraceLog
+
+
+def test_close_flushes_records_and_is_idempotent(tmp_path):
+    path = tmp_path / "traces" / "requests.jsonl"
+    trace_log = TraceLog(str(path))
+    trace_log.write({"path": "/api/bitcoin/status", "duration": 1.5})
+    trace_log.close()
+    trace_log.close()
+    # Zapis nakon zatvaranja se odbacuje umjesto da ostane u redu
+    trace_log.write({"path": "/kasno"})
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert records == [{"path": "/api/bitcoin/status", "duration": 1.5}]
+    assert not trace_log._worker.is_alive()
@@ -0,0 +1,64 @@
+import pytest
+
+from tx_index import TransactionIndex, encode_cursor, decode_cursor
+
+TXID = "ab" * 32
+
+
+def _tx(txid, height, sender, recipient):
+    return {"txid": txid, "block_height": height, "sender": sender, "recipient": recipient, "amount": 1.0}
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = TransactionIndex(
+        str(tmp_path / "tx.sqlite3"),
+        max_addresses=2,
+        resolve_address=lambda address: {"bc1qvanjska": "bc1qbazen"}.get(address, address),
+    )
+    yield index
+    index.close()
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor((840000, TXID))) == (840000, TXID)
+    assert decode_cursor(f"5:{TXID.upper()}") == (5, TXID)
+
+
+@pytest.mark.parametrize("cursor", ["", "840000", "840000:abc", f"x:{TXID}", "1:" + "zz" * 32])
+def test_bad_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError, match="^Neispravan kursor"):
+        decode_cursor(cursor)
+
+
+def test_block_transactions_reach_aliased_address(index):
+    index.track("bc1qvanjska")
+    index.add_block(10, "h10", [_tx(TXID, 10, "bc1qbazen", "bc1qdrugi")])
+
+    rows = index.address_page_raw("bc1qvanjska", 10, None, 0)
+    assert [(height, txid) for height, txid, _ in rows] == [(10, TXID)]
+    assert b'"sender":"bc1qvanjska"' in rows[0][2]
+
+
+def test_least_recently_used_address_is_evicted(index):
+    index.track("bc1qa")
+    index.track("bc1qb")
+    index.track("bc1qa")
+    index.track("bc1qc")
+
+    assert index.stats()["evicted_addresses"] == 1
+    index.add_block(10, "h10", [_tx(TXID, 10, "bc1qb", "bc1qa")])
+    assert index.address_page_raw("bc1qb", 10, None, 0) == []
+    assert len(index.address_page_raw("bc1qa", 10, None, 0)) == 1
+    # Zakašnjelo popunjavanje uklonjene adrese se ne sprema
+    index.add_address_transactions("bc1qb", [_tx("cd" * 32, 9, "bc1qb", "x")], 0)
+    assert index.covered_from("bc1qb") is None
+
+
+def test_has_all_txids_only_inside_ingested_range(index):
+    index.txid_retention = 100
+    for height in range(10, 13):
+        index.add_block(height, f"h{height}", [])
+    assert index.has_all_txids(11)
+    assert not index.has_all_txids(9)
+    assert not index.has_all_txids(13)
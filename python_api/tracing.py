@@ -0,0 +1,295 @@
+import asyncio
+import contextvars
+import functools
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+
+from fastapi.routing import APIRoute
+
+# Zaglavlje i parametar upita koji uključuju profiliranje jednog zahtjeva
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY_PARAM = "profile"
+
+
+class RequestTrace:
+    """
+    Vremenski odsječci (spanovi) jednog HTTP zahtjeva
+
+    Odsječci istog imena se zbrajaju (npr. više provjera statusa) pa
+    Server-Timing zaglavlje ostaje kratko. Dijelovi koji se izvršavaju
+    istovremeno (npr. cijena i status) zbrajaju se pa zbroj može biti veći od
+    ukupnog trajanja zahtjeva.
+    """
+
+    __slots__ = ("started", "spans")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: List[Tuple[str, float, Optional[str]]] = []
+
+    def add(self, name: str, duration: float, description: Optional[str] = None) -> None:
+        self.spans.append((name, duration, description))
+
+    def duration(self, name: str) -> float:
+        return sum(d for n, d, _ in self.spans if n == name)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """{ime: {"dur_ms": ..., "count": ..., "desc": ...}} redom prvog pojavljivanja"""
+        summary: Dict[str, Dict[str, Any]] = {}
+        for name, duration, description in self.spans:
+            entry = summary.setdefault(name, {"dur_ms": 0.0, "count": 0, "desc": None})
+            entry["dur_ms"] += duration * 1000
+            entry["count"] += 1
+            if description:
+                entry["desc"] = description
+        return summary
+
+    def server_timing(self, total: float) -> str:
+        entries = []
+        for name, entry in self.summary().items():
+            value = f"{name};dur={entry['dur_ms']:.1f}"
+            description = entry["desc"] or (f"{entry['count']}x" if entry["count"] > 1 else None)
+            if description:
+                value += f';desc="{description}"'
+            entries.append(value)
+        entries.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(entries)
+
+
+_current_trace: contextvars.ContextVar[Optional[RequestTrace]] = contextvars.ContextVar("request_trace", default=None)
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str, description: Optional[str] = None) -> Iterator[None]:
+    """Mjeri blok koda i bilježi ga u trag trenutnog zahtjeva (bez traga ne radi ništa)"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, time.perf_counter() - start, description)
+
+
+def mark(name: str, description: Optional[str] = None) -> None:
+    """Događaj bez trajanja (npr. pogodak priručne memorije)"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(name, 0.0, description)
+
+
+class TraceLog:
+    """
+    Strukturirani zapisi tragova (JSON po retku) u datoteci
+
+    Zapisivanje ide u pozadinskoj dretvi pa ne usporava zahtjeve.
+    """
+
+    def __init__(self, path: str):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._closed = False
+        self._worker = threading.Thread(target=self._write_loop, name="request-trace-log", daemon=True)
+        self._worker.start()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        # Zahtjevi koji završe nakon zatvaranja se ne zapisuju
+        if not self._closed:
+            self._queue.put(record)
+
+    def close(self) -> None:
+        """Zapisuje tragove iz reda i zatvara datoteku"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._worker.join()
+
+    def _write_loop(self) -> None:
+        with open(self.path, "a") as f:
+            while True:
+                record = self._queue.get()
+                if record is None:
+                    return
+                try:
+                    f.write(json.dumps(record, separators=(",", ":")) + "\n")
+                    if self._queue.empty():
+                        f.flush()
+                except (OSError, TypeError, ValueError) as e:
+                    print(f"Greška pri zapisivanju traga zahtjeva: {str(e)}")
+
+
+class SamplingProfiler:
+    """
+    Jednostavan profiler uzorkovanjem stoga jedne dretve
+
+    Pozadinska dretva svakih interval sekundi bilježi stog ciljne dretve
+    (npr. event loopa), a rezultat je u "folded" formatu za flamegraph alate.
+    """
+
+    def __init__(self, thread_id: Optional[int] = None, interval: float = 0.002):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+def _wants_profile(scope: Dict[str, Any]) -> bool:
+    for name, value in scope.get("headers", []):
+        if name.decode("latin-1") == PROFILE_HEADER and value not in (b"", b"0"):
+            return True
+    query = scope.get("query_string", b"").decode("latin-1")
+    return any(part in (PROFILE_QUERY_PARAM, f"{PROFILE_QUERY_PARAM}=1", f"{PROFILE_QUERY_PARAM}=true") for part in query.split("&"))
+
+
+class TimingMiddleware:
+    """
+    ASGI middleware koji bilježi vremenske odsječke zahtjeva
+
+    Odsječci (submit, poll, results, parse, endpoint, validate...) šalju se u
+    Server-Timing zaglavlju, a uz trace_log i kao JSON zapis. Ako je
+    profiliranje dopušteno, zaglavlje X-Profile ili ?profile=1 uključuje
+    profiler uzorkovanjem za taj zahtjev; profil se sprema u profile_dir, a
+    ime datoteke vraća u zaglavlju X-Profile.
+    """
+
+    def __init__(self, app, trace_log: Optional[TraceLog] = None, profile_dir: Optional[str] = None, profiling_enabled: bool = False):
+        self.app = app
+        self.trace_log = trace_log
+        self.profile_dir = profile_dir
+        self.profiling_enabled = profiling_enabled and bool(profile_dir)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace()
+        token = _current_trace.set(trace)
+        status = 500
+
+        profiler = None
+        profile_name = None
+        if self.profiling_enabled and _wants_profile(scope):
+            profile_name = f"{time.strftime('%Y%m%d-%H%M%S')}-{int(trace.started * 1e6) % 1000000:06d}.folded"
+            profiler = SamplingProfiler().start()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", trace.server_timing(time.perf_counter() - trace.started).encode("latin-1")))
+                if profile_name:
+                    headers.append((b"x-profile", profile_name.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            total = time.perf_counter() - trace.started
+            _current_trace.reset(token)
+            if profiler is not None:
+                profiler.stop()
+                self._save_profile(profile_name, profiler)
+            if self.trace_log is not None:
+                self.trace_log.write({
+                    "timestamp": time.time(),
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status,
+                    "duration_ms": round(total * 1000, 3),
+                    "spans": {name: {**entry, "dur_ms": round(entry["dur_ms"], 3)} for name, entry in trace.summary().items()},
+                })
+
+    def _save_profile(self, name: str, profiler: SamplingProfiler) -> None:
+        try:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            with open(os.path.join(self.profile_dir, name), "w") as f:
+                f.write(profiler.folded())
+        except OSError as e:
+            print(f"Greška pri spremanju profila: {str(e)}")
+
+
+def _timed_endpoint(endpoint: Callable) -> Callable:
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def timed(*args, **kwargs):
+            with span("endpoint"):
+                return await endpoint(*args, **kwargs)
+    else:
+        @functools.wraps(endpoint)
+        def timed(*args, **kwargs):
+            with span("endpoint"):
+                return endpoint(*args, **kwargs)
+    return timed
+
+
+class TimedRoute(APIRoute):
+    """
+    Ruta koja odvaja vrijeme same funkcije rute (endpoint) od ostatka obrade
+
+    "validate" je vrijeme rješavanja ovisnosti, validacije response_modela
+    (Pydantic) i JSON serijalizacije odgovora.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            trace = _current_trace.get()
+            if trace is None:
+                return await handler(request)
+            start = time.perf_counter()
+            before = trace.duration("endpoint")
+            response = await handler(request)
+            endpoint_time = trace.duration("endpoint") - before
+            trace.add("validate", max(0.0, time.perf_counter() - start - endpoint_time))
+            return response
+
+        return timed_handler
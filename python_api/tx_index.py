@@ -0,0 +1,542 @@
+import asyncio
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Any, Iterable, List, Optional, Set, Tuple
+
+from json_response import dumps, loads
+from block_index import BlockIndex, MAX_REORG_DEPTH
+from bloom_filter import BloomFilter
+
+# Koliko transakcija adrese se dohvaća odjednom pri popunjavanju indeksa
+DEFAULT_BACKFILL_BATCH = 100
+# Koliko blokova se čuvaju txid-ovi transakcija koje ne pripadaju praćenim adresama (jedan dan)
+DEFAULT_TXID_RETENTION = 144
+# Najmanji kapacitet filtra txid-ova (oko 600 KB uz 1 % lažno pozitivnih)
+DEFAULT_FILTER_CAPACITY = 500_000
+# Najveći broj praćenih adresa (najdulje nekorištene se uklanjaju iz indeksa)
+DEFAULT_MAX_ADDRESSES = 10_000
+
+# fetch(visina) vraća sve transakcije bloka
+BlockTransactionsFetcher = Callable[[int], Awaitable[List[Dict[str, Any]]]]
+# fetch(adresa, limit, before_height) vraća transakcije adrese od najnovije prema starijima
+AddressTransactionsFetcher = Callable[[str, int, Optional[int]], Awaitable[List[Dict[str, Any]]]]
+Normalizer = Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]
+# resolve(adresa) vraća adresu pod kojom se transakcije adrese pojavljuju u blokovima
+AddressResolver = Callable[[str], str]
+
+_NO_ADDRESSES: frozenset = frozenset()
+
+# Pozicija transakcije u indeksu adrese: (visina bloka, txid)
+Cursor = Tuple[int, str]
+
+
+def encode_cursor(position: Cursor) -> str:
+    return f"{position[0]}:{position[1]}"
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """Kursor iz zaglavlja X-Next-Cursor (ValueError ako nije ispravan)"""
+    height, _, txid = cursor.partition(":")
+    try:
+        if len(txid) != 64:
+            raise ValueError
+        int(txid, 16)
+        return int(height), txid.lower()
+    except ValueError:
+        raise ValueError(f"Neispravan kursor: {cursor}") from None
+
+
+class TransactionIndex:
+    """
+    Lokalni indeks Bitcoin transakcija po adresi (SQLite)
+
+    Invertirani indeks adresa -> transakcije sortiran po visini bloka (pa
+    txid-u) čuva i kodiranu transakciju, pa je stranica transakcija adrese
+    jedan raspon B-stabla bez dodatnih dohvata. Adresa se popunjava pri
+    prvom upitu (jedan dohvat najnovijih transakcija; starije tek kad ih
+    stranica zatraži), a novi blokovi (sync) zatim dodaju njene nove
+    transakcije. Za svaku adresu pamti se najniža visina od koje indeks
+    sadrži sve njene transakcije (covered_from). Prati se najviše
+    max_addresses adresa; najdulje nekorištena se pri dodavanju nove briše
+    iz indeksa zajedno sa svojim transakcijama (redoslijed korištenja se
+    ne pamti između pokretanja, pa se tada uklanjaju najranije dodane).
+
+    Sintetički lanac adrese izvan svog skupa preslikava na adrese iz skupa
+    (resolve_address), pa se transakcije bloka takvoj adresi pridružuju po
+    zamjenskoj adresi, kao i u popisu transakcija adrese.
+
+    Sve lokalno spremljene transakcije indeksirane su i po txid-u, a Bloom
+    filtar u memoriji ispred tog indeksa odbija nepoznate txid-ove bez
+    pristupa bazi (vidi get_transaction). Transakcije praćenih adresa se
+    čuvaju trajno, a ostale txid_retention blokova.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        backfill_batch: int = DEFAULT_BACKFILL_BATCH,
+        txid_retention: int = DEFAULT_TXID_RETENTION,
+        filter_error_rate: float = 0.01,
+        max_addresses: int = DEFAULT_MAX_ADDRESSES,
+        resolve_address: Optional[AddressResolver] = None,
+    ):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.backfill_batch = backfill_batch
+        self.txid_retention = txid_retention
+        self.filter_error_rate = filter_error_rate
+        self.max_addresses = max(1, max_addresses)
+        self.resolve_address = resolve_address or (lambda address: address)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS address_transactions (
+                address TEXT NOT NULL,
+                block_height INTEGER NOT NULL,
+                txid TEXT NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (address, block_height, txid)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS addresses (
+                address TEXT PRIMARY KEY,
+                covered_from INTEGER,
+                info BLOB
+            );
+            CREATE TABLE IF NOT EXISTS ingested_blocks (
+                height INTEGER PRIMARY KEY,
+                hash TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS txids (
+                txid TEXT PRIMARY KEY,
+                block_height INTEGER NOT NULL,
+                pinned INTEGER NOT NULL,
+                data BLOB NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS txids_block_height ON txids (block_height);
+            """
+        )
+        # Praćene adrese (od najdulje nekorištene) -> adresa u blokovima, i obrnuto
+        self._tracked: "OrderedDict[str, str]" = OrderedDict()
+        self._by_block_address: Dict[str, Set[str]] = {}
+        with self._lock:
+            addresses = [row[0] for row in self._conn.execute("SELECT address FROM addresses ORDER BY rowid")]
+            self._lowest, self._tip = self._conn.execute("SELECT MIN(height), MAX(height) FROM ingested_blocks").fetchone()
+        for address in addresses:
+            self._remember(address)
+        self._backfills: Dict[str, asyncio.Task] = {}
+
+        self.txid_filter: BloomFilter
+        # Obrisani txid-ovi ostaju u filtru dok se filtar ponovno ne izgradi
+        self._filter_stale = 0
+        self.rebuild_filter()
+
+        self.ingested_blocks = 0
+        self.backfills = 0
+        self.pages = 0
+        self.txid_hits = 0
+        self.txid_filtered = 0
+        self.txid_false_positives = 0
+        self.evicted_addresses = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @property
+    def tip_height(self) -> Optional[int]:
+        """Zadnji blok čije su transakcije obrađene (None ako još nijedan)"""
+        return self._tip
+
+    # Adrese
+
+    def _remember(self, address: str) -> None:
+        block_address = self.resolve_address(address)
+        self._tracked[address] = block_address
+        self._by_block_address.setdefault(block_address, set()).add(address)
+
+    def track(self, address: str) -> None:
+        """Novi blokovi od sada dodaju transakcije adrese u indeks (i adresa postaje zadnja korištena)"""
+        if address in self._tracked:
+            self._tracked.move_to_end(address)
+            return
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO addresses (address) VALUES (?)", (address,))
+        self._remember(address)
+        while len(self._tracked) > self.max_addresses:
+            self.untrack(next(iter(self._tracked)))
+
+    def untrack(self, address: str) -> None:
+        """Briše adresu i njene transakcije iz indeksa (txid-ovi ostaju do isteka txid_retention)"""
+        block_address = self._tracked.pop(address, None)
+        if block_address is None:
+            return
+        aliases = self._by_block_address[block_address]
+        aliases.discard(address)
+        if not aliases:
+            del self._by_block_address[block_address]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "UPDATE txids SET pinned = 0 WHERE txid IN"
+                    " (SELECT txid FROM address_transactions WHERE address = ?)", (address,)
+                )
+                self._conn.execute("DELETE FROM address_transactions WHERE address = ?", (address,))
+                self._conn.execute("DELETE FROM addresses WHERE address = ?", (address,))
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+        self.evicted_addresses += 1
+
+    def covered_from(self, address: str) -> Optional[int]:
+        """Visina od koje indeks sadrži sve transakcije adrese (None ako adresa još nije popunjena)"""
+        with self._lock:
+            row = self._conn.execute("SELECT covered_from FROM addresses WHERE address = ?", (address,)).fetchone()
+        return row[0] if row else None
+
+    def add_address_transactions(self, address: str, transactions: List[Dict[str, Any]], covered_from: int) -> None:
+        if address not in self._tracked:
+            # Adresa je uklonjena iz indeksa za vrijeme dohvata
+            return
+        rows = [(address, tx["block_height"], tx["txid"], dumps(tx)) for tx in transactions]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("INSERT OR REPLACE INTO address_transactions VALUES (?, ?, ?, ?)", rows)
+                # Postojeći zapis (iz bloka) ostaje, samo se više ne briše nakon txid_retention blokova
+                self._conn.executemany(
+                    "INSERT INTO txids VALUES (?, ?, 1, ?) ON CONFLICT (txid) DO UPDATE SET pinned = 1",
+                    [(txid, height, data) for _, height, txid, data in rows]
+                )
+                # Pokrivenost se samo širi (istovremena popunjavanja ne smiju je suziti)
+                self._conn.execute(
+                    "UPDATE addresses SET covered_from = MIN(COALESCE(covered_from, ?), ?) WHERE address = ?",
+                    (covered_from, covered_from, address)
+                )
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+        self._add_to_filter(row[2] for row in rows)
+
+    def address_page_raw(self, address: str, limit: int, cursor: Optional[Cursor], covered_from: int) -> List[Tuple[int, str, bytes]]:
+        """(visina, txid, kodirana transakcija) od najnovije prema starijima, ispod kursora"""
+        with self._lock:
+            if cursor is None:
+                return self._conn.execute(
+                    "SELECT block_height, txid, data FROM address_transactions"
+                    " WHERE address = ? AND block_height >= ?"
+                    " ORDER BY block_height DESC, txid DESC LIMIT ?",
+                    (address, covered_from, limit)
+                ).fetchall()
+            return self._conn.execute(
+                "SELECT block_height, txid, data FROM address_transactions"
+                " WHERE address = ? AND block_height >= ? AND (block_height, txid) < (?, ?)"
+                " ORDER BY block_height DESC, txid DESC LIMIT ?",
+                (address, covered_from, cursor[0], cursor[1], limit)
+            ).fetchall()
+
+    async def address_page(
+        self,
+        address: str,
+        limit: int,
+        cursor: Optional[Cursor],
+        fetch: AddressTransactionsFetcher,
+        normalize: Optional[Normalizer] = None,
+        chain_tip: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Stranica transakcija adrese i kursor sljedeće stranice
+
+        Ako indeks nema dovoljno transakcija adrese, starije se dohvaćaju s
+        fetch i spremaju (jednom po adresi i rasponu). Potvrde (confirmations)
+        računaju se prema chain_tip pri čitanju.
+        """
+        self.track(address)
+        covered_from = self.covered_from(address)
+        if covered_from is None:
+            await self._extend(address, None, max(limit, self.backfill_batch), fetch, normalize)
+            covered_from = self.covered_from(address)
+
+        rows = self.address_page_raw(address, limit, cursor, covered_from)
+        while len(rows) < limit and covered_from > 0:
+            await self._extend(address, covered_from, max(limit - len(rows), self.backfill_batch), fetch, normalize)
+            covered_from = self.covered_from(address)
+            rows = self.address_page_raw(address, limit, cursor, covered_from)
+        self.pages += 1
+
+        transactions = [loads(data) for _, _, data in rows]
+        if chain_tip is not None:
+            for tx in transactions:
+                tx["confirmations"] = chain_tip - tx["block_height"] + 1
+        next_cursor = encode_cursor(rows[-1][:2]) if rows and len(rows) == limit else None
+        return transactions, next_cursor
+
+    async def _extend(
+        self,
+        address: str,
+        before_height: Optional[int],
+        count: int,
+        fetch: AddressTransactionsFetcher,
+        normalize: Optional[Normalizer],
+    ) -> None:
+        """Jedno popunjavanje po adresi (istovremeni zahtjevi čekaju isto)"""
+        task = self._backfills.get(address)
+        if task is None:
+            task = asyncio.ensure_future(self._backfill(address, before_height, count, fetch, normalize))
+            self._backfills[address] = task
+            task.add_done_callback(lambda done: self._backfills.pop(address, None) if self._backfills.get(address) is done else None)
+        await asyncio.shield(task)
+
+    async def _backfill(
+        self,
+        address: str,
+        before_height: Optional[int],
+        count: int,
+        fetch: AddressTransactionsFetcher,
+        normalize: Optional[Normalizer],
+    ) -> None:
+        self.backfills += 1
+        transactions = await fetch(address, count, before_height)
+        if normalize is not None:
+            transactions = normalize(transactions)
+
+        if len(transactions) < count:
+            # Dohvaćene su sve transakcije adrese ispod before_height
+            covered_from = 0
+        else:
+            lowest = min(tx["block_height"] for tx in transactions)
+            # Iz najnižeg bloka možda nisu dohvaćene sve transakcije adrese
+            covered_from = lowest + 1 if before_height is None or lowest + 1 < before_height else lowest
+        self.add_address_transactions(address, transactions, covered_from)
+
+    def address_info_raw(self, address: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute("SELECT info FROM addresses WHERE address = ?", (address,)).fetchone()
+        return row[0] if row else None
+
+    def set_address_info(self, address: str, info: Dict[str, Any], tip_height: Optional[int]) -> None:
+        """
+        Sprema sažetak adrese dohvaćen dok je vrh indeksa bio tip_height
+
+        Sažetak vrijedi dok novi blok ne doda transakciju adrese (sync ga
+        tada briše); ako je blok obrađen za vrijeme dohvata, ne sprema se.
+        """
+        self.track(address)
+        if tip_height != self._tip:
+            return
+        with self._lock:
+            self._conn.execute("UPDATE addresses SET info = ? WHERE address = ?", (dumps(info), address))
+
+    # Txid indeks
+
+    def get_transaction(self, txid: str, chain_tip: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Transakcija po txid-u ili None ako nije u lokalnom indeksu
+
+        Nepoznate txid-ove odbija filtar (nekoliko mikrosekundi, bez
+        pristupa bazi); baza se čita samo za txid-ove koje filtar možda
+        sadrži.
+        """
+        txid = txid.lower()
+        if txid not in self.txid_filter:
+            self.txid_filtered += 1
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM txids WHERE txid = ?", (txid,)).fetchone()
+        if row is None:
+            # Lažno pozitivan odgovor filtra (ili txid obrisan nakon izgradnje filtra)
+            self.txid_false_positives += 1
+            return None
+        self.txid_hits += 1
+        transaction = loads(row[0])
+        if chain_tip is not None:
+            transaction["confirmations"] = chain_tip - transaction["block_height"] + 1
+        return transaction
+
+    def has_all_txids(self, height: int) -> bool:
+        """
+        Sadrži li indeks txid-ove svih transakcija bloka na zadanoj visini
+
+        To vrijedi za obrađene blokove unutar zadnjih txid_retention blokova;
+        txid iz takvog bloka kojeg nema u indeksu ne postoji.
+        """
+        if self._tip is None:
+            return False
+        return max(self._lowest, self._tip - self.txid_retention + 1) <= height <= self._tip
+
+    def _add_to_filter(self, txids: Iterable[str]) -> None:
+        txid_filter = self.txid_filter
+        for txid in txids:
+            txid_filter.add(txid)
+        if txid_filter.count > txid_filter.capacity:
+            # Iznad kapaciteta raste udio lažno pozitivnih odgovora
+            self.rebuild_filter()
+
+    def rebuild_filter(self) -> None:
+        """Gradi filtar iz txid indeksa (s kapacitetom za dvostruko više txid-ova)"""
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM txids").fetchone()[0]
+            txid_filter = BloomFilter(max(DEFAULT_FILTER_CAPACITY, 2 * count), self.filter_error_rate)
+            for (txid,) in self._conn.execute("SELECT txid FROM txids"):
+                txid_filter.add(txid)
+        self.txid_filter = txid_filter
+        self._filter_stale = 0
+
+    def _removed_from_index(self, count: int) -> None:
+        self._filter_stale += count
+        if self._filter_stale > self.txid_filter.count // 2:
+            self.rebuild_filter()
+
+    def prune_txids(self) -> int:
+        """Briše txid-ove starije od txid_retention blokova koji ne pripadaju praćenim adresama"""
+        if self._tip is None:
+            return 0
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM txids WHERE pinned = 0 AND block_height <= ?", (self._tip - self.txid_retention,)
+            )
+        if cursor.rowcount:
+            self._removed_from_index(cursor.rowcount)
+        return cursor.rowcount
+
+    # Sinkronizacija s indeksom blokova
+
+    def _ingested_hash(self, height: int) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT hash FROM ingested_blocks WHERE height = ?", (height,)).fetchone()
+        return row[0] if row else None
+
+    def _as_address(self, tx: Dict[str, Any], address: str) -> Dict[str, Any]:
+        """Transakcija kako je vidi adresa koja se u blokovima pojavljuje pod zamjenskom adresom"""
+        block_address = self._tracked[address]
+        tx = dict(tx)
+        if tx["sender"] == block_address:
+            tx["sender"] = address
+        if tx["recipient"] == block_address:
+            tx["recipient"] = address
+        return tx
+
+    def add_block(self, height: int, block_hash: str, transactions: List[Dict[str, Any]]) -> int:
+        """Dodaje transakcije bloka u txid indeks i praćenim adresama; vraća broj zapisa adresa"""
+        rows = []
+        txid_rows = []
+        touched = set()
+        by_block_address = self._by_block_address
+        for tx in transactions:
+            data = dumps(tx)
+            sender, recipient = tx["sender"], tx["recipient"]
+            addresses = by_block_address.get(sender, _NO_ADDRESSES)
+            if recipient in by_block_address:
+                addresses = addresses | by_block_address[recipient]
+            for address in addresses:
+                tx_data = data if address == sender or address == recipient else dumps(self._as_address(tx, address))
+                rows.append((address, height, tx["txid"], tx_data))
+                touched.add(address)
+            txid_rows.append((tx["txid"], height, 1 if addresses else 0, data))
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("INSERT OR REPLACE INTO address_transactions VALUES (?, ?, ?, ?)", rows)
+                self._conn.executemany(
+                    "INSERT INTO txids VALUES (?, ?, ?, ?) ON CONFLICT (txid) DO UPDATE SET"
+                    " block_height = excluded.block_height, data = excluded.data, pinned = MAX(pinned, excluded.pinned)",
+                    txid_rows
+                )
+                self._conn.executemany("UPDATE addresses SET info = NULL WHERE address = ?", [(a,) for a in touched])
+                self._conn.execute("INSERT OR REPLACE INTO ingested_blocks VALUES (?, ?)", (height, block_hash))
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+        self._tip = height if self._tip is None else max(self._tip, height)
+        self._lowest = height if self._lowest is None else min(self._lowest, height)
+        self._add_to_filter(row[0] for row in txid_rows)
+        return len(rows)
+
+    def remove_above(self, height: int) -> None:
+        """Briše transakcije iz blokova iznad zadane visine (reorganizacija lanca)"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("DELETE FROM address_transactions WHERE block_height > ?", (height,))
+                removed = self._conn.execute("DELETE FROM txids WHERE block_height > ?", (height,)).rowcount
+                self._conn.execute("DELETE FROM ingested_blocks WHERE height > ?", (height,))
+                self._conn.execute("UPDATE addresses SET info = NULL")
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._lowest, self._tip = self._conn.execute("SELECT MIN(height), MAX(height) FROM ingested_blocks").fetchone()
+        self._removed_from_index(removed)
+
+    async def sync(self, block_index: BlockIndex, fetch: BlockTransactionsFetcher, normalize: Optional[Normalizer] = None) -> int:
+        """
+        Obrađuje transakcije blokova od zadnjeg obrađenog do vrha indeksa blokova
+
+        Pri prvoj sinkronizaciji obrađuje se samo vrh (starije transakcije
+        adresa dohvaćaju se pri popunjavanju). Ako se hash obrađenog bloka
+        razlikuje od hasha u indeksu blokova, transakcije iznad zajedničkog
+        bloka se brišu i ponovno obrađuju. Vraća broj obrađenih blokova.
+        """
+        target = block_index.tip_height
+        if target is None:
+            return 0
+        if self._tip is not None:
+            self._rewind_to_common(block_index)
+        start = target if self._tip is None else self._tip + 1
+
+        for height in range(start, target + 1):
+            transactions = await fetch(height)
+            if normalize is not None:
+                transactions = normalize(transactions)
+            self.add_block(height, block_index.hash_at(height), transactions)
+            # Ustupi event loop između blokova
+            await asyncio.sleep(0)
+
+        added = max(0, target - start + 1)
+        self.ingested_blocks += added
+        if added:
+            self.prune_txids()
+        return added
+
+    def _rewind_to_common(self, block_index: BlockIndex) -> None:
+        height = self._tip
+        lowest = max(0, height - MAX_REORG_DEPTH)
+        while height >= lowest and self._ingested_hash(height) != block_index.hash_at(height):
+            height -= 1
+        if height != self._tip:
+            print(f"Reorganizacija lanca: indeks transakcija se vraća na blok {height}")
+            self.remove_above(height)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM address_transactions").fetchone()[0]
+            txids = self._conn.execute("SELECT COUNT(*) FROM txids").fetchone()[0]
+        # Izmjereni udio lažno pozitivnih: od txid-ova kojih nema u indeksu, koliko ih je filtar propustio
+        misses = self.txid_filtered + self.txid_false_positives
+        return {
+            "addresses": len(self._tracked),
+            "evicted_addresses": self.evicted_addresses,
+            "entries": entries,
+            "tip_height": self._tip,
+            "ingested_blocks": self.ingested_blocks,
+            "backfills": self.backfills,
+            "pages": self.pages,
+            "txids": txids,
+            "txid_hits": self.txid_hits,
+            "txid_filtered": self.txid_filtered,
+            "txid_false_positives": self.txid_false_positives,
+            "txid_filter": {
+                **self.txid_filter.stats(),
+                "observed_error_rate": round(self.txid_false_positives / misses, 6) if misses else 0.0,
+            },
+        }
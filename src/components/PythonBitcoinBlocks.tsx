@@ -1,8 +1,8 @@
 "use client";
 
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import { FaCubes, FaHashtag, FaClock } from 'react-icons/fa';
-import { getBitcoinBlocks, BitcoinBlock } from '@/services/pythonBitcoinService';
+import { getBitcoinBlocks, subscribeBitcoinLive, BitcoinBlock } from '@/services/pythonBitcoinService';
 
 interface PythonBitcoinBlocksProps {
   limit?: number;
@@ -14,45 +14,53 @@ export default function PythonBitcoinBlocks({ limit = 5 }: PythonBitcoinBlocksPr
   const [error, setError] = useState<string | null>(null);
   const [newBlocks, setNewBlocks] = useState<string[]>([]);
 
-  // Funkcija za dohvaćanje blokova
-  const fetchBlocks = useCallback(async () => {
-    try {
-      const data = await getBitcoinBlocks(limit);
-      
-      if (data && data.length > 0) {
-        // Provjeravamo ima li novih blokova
-        const currentBlockHashes = blocks.map(block => block.hash);
-        const newBlockHashes = data.filter(block => !currentBlockHashes.includes(block.hash)).map(block => block.hash);
-        
-        setNewBlocks(newBlockHashes);
-        setBlocks(data);
-        
-        // Resetiramo animaciju nakon 3 sekunde
-        if (newBlockHashes.length > 0) {
-          setTimeout(() => {
-            setNewBlocks([]);
-          }, 3000);
-        }
-      }
-      
-      setIsLoading(false);
-    } catch (err) {
-      console.error('Greška:', err);
-      setError('Greška pri dohvaćanju Bitcoin blokova');
-      setIsLoading(false);
+  const blocksRef = useRef<BitcoinBlock[]>([]);
+
+  // Spaja nove blokove s prikazanima (blok na istoj visini se zamjenjuje) i označava nove
+  const showBlocks = useCallback((data: BitcoinBlock[]) => {
+    if (data.length === 0) return;
+    
+    const current = blocksRef.current;
+    const byHeight = new Map(current.map(block => [block.height, block]));
+    data.forEach(block => byHeight.set(block.height, block));
+    const merged = Array.from(byHeight.values()).sort((a, b) => b.height - a.height).slice(0, limit);
+    
+    // Provjeravamo ima li novih blokova
+    const currentBlockHashes = current.map(block => block.hash);
+    const newBlockHashes = merged.filter(block => !currentBlockHashes.includes(block.hash)).map(block => block.hash);
+    
+    blocksRef.current = merged;
+    setNewBlocks(newBlockHashes);
+    setBlocks(merged);
+    setError(null);
+    setIsLoading(false);
+    
+    // Resetiramo animaciju nakon 3 sekunde
+    if (newBlockHashes.length > 0) {
+      setTimeout(() => {
+        setNewBlocks([]);
+      }, 3000);
     }
-  }, [blocks, limit]);
+  }, [limit]);
   
-  // Dohvaćamo podatke pri učitavanju komponente i svakih 10 sekundi
+  // Prva stranica se dohvaća jednom (kanal uživo šalje samo zadnjih nekoliko blokova), a novi blokovi stižu uživo
   useEffect(() => {
-    fetchBlocks();
-    
-    const interval = setInterval(() => {
-      fetchBlocks();
-    }, 10000);
+    blocksRef.current = [];
+    getBitcoinBlocks(limit)
+      .then(showBlocks)
+      .catch((err) => console.error('Greška:', err));
     
-    return () => clearInterval(interval);
-  }, [fetchBlocks]);
+    return subscribeBitcoinLive(
+      () => {},
+      showBlocks,
+      () => {
+        if (blocksRef.current.length === 0) {
+          setError('Greška pri dohvaćanju Bitcoin blokova');
+          setIsLoading(false);
+        }
+      }
+    );
+  }, [limit, showBlocks]);
   
   // Funkcija za formatiranje vremena
   const formatTime = (timestamp: number) => {
@@ -1,25 +1,19 @@
 "use client";
 
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect } from 'react';
 import { FaBitcoin } from 'react-icons/fa';
-import { getBitcoinStatus } from '@/services/pythonBitcoinService';
+import { subscribeBitcoinLive } from '@/services/pythonBitcoinService';
 
-interface PythonBitcoinPriceProps {
-  refreshInterval?: number; // u milisekundama
-}
-
-export default function PythonBitcoinPrice({ refreshInterval = 60000 }: PythonBitcoinPriceProps) {
+export default function PythonBitcoinPrice() {
   const [price, setPrice] = useState<number>(0);
   const [isLoading, setIsLoading] = useState<boolean>(true);
   const [error, setError] = useState<string | null>(null);
   const [lastUpdated, setLastUpdated] = useState<string>("");
 
-  // Funkcija za dohvaćanje cijene Bitcoina
-  const fetchBitcoinPrice = useCallback(async () => {
-    try {
-      const data = await getBitcoinStatus();
-      
-      if (data) {
+  // Cijena stiže uživo (Server-Sent Events) čim se promijeni; veza se sama obnavlja
+  useEffect(() => {
+    return subscribeBitcoinLive(
+      (data) => {
         setPrice(data.price);
         
         // Postavljamo vrijeme zadnjeg osvježavanja
@@ -27,27 +21,17 @@ export default function PythonBitcoinPrice({ refreshInterval = 60000 }: PythonBi
         setLastUpdated(
           `${now.getHours().toString().padStart(2, '0')}:${now.getMinutes().toString().padStart(2, '0')}:${now.getSeconds().toString().padStart(2, '0')}`
         );
+        setError(null);
+        setIsLoading(false);
+      },
+      undefined,
+      () => {
+        setError('Greška pri dohvaćanju cijene Bitcoina');
+        setIsLoading(false);
       }
-      
-      setIsLoading(false);
-    } catch (err) {
-      console.error('Greška pri dohvaćanju cijene Bitcoina:', err);
-      setError('Greška pri dohvaćanju cijene Bitcoina');
-      setIsLoading(false);
-    }
+    );
   }, []);
 
-  // Dohvaćamo podatke pri učitavanju komponente i svakih X sekundi
-  useEffect(() => {
-    fetchBitcoinPrice();
-    
-    const interval = setInterval(() => {
-      fetchBitcoinPrice();
-    }, refreshInterval);
-    
-    return () => clearInterval(interval);
-  }, [fetchBitcoinPrice, refreshInterval]);
-
   if (isLoading) {
     return (
       <div className="bg-white dark:bg-gray-800 rounded-lg shadow-md p-6 text-center">
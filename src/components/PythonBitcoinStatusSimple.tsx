@@ -1,8 +1,8 @@
 "use client";
 
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect } from 'react';
 import { FaBitcoin, FaNetworkWired, FaCubes, FaExchangeAlt } from 'react-icons/fa';
-import { getBitcoinStatus } from '@/services/pythonBitcoinService';
+import { subscribeBitcoinLive } from '@/services/pythonBitcoinService';
 
 export default function PythonBitcoinStatusSimple() {
   const [lastBlock, setLastBlock] = useState(0);
@@ -12,36 +12,25 @@ export default function PythonBitcoinStatusSimple() {
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   
-  // Funkcija za dohvaćanje podataka o Bitcoin mreži
-  const fetchBitcoinStatus = useCallback(async () => {
-    try {
-      const data = await getBitcoinStatus();
-      
-      if (data) {
+  // Stanje mreže stiže uživo (Server-Sent Events) čim se promijeni; veza se sama obnavlja
+  useEffect(() => {
+    return subscribeBitcoinLive(
+      (data) => {
         setLastBlock(data.last_block);
         setFeeRate(data.fee_rate);
         setBtcPrice(data.price);
         setTransactionCount(data.transactions_count);
+        setError(null);
+        setIsLoading(false);
+      },
+      undefined,
+      () => {
+        setError('Greška pri dohvaćanju statusa Bitcoin mreže');
         setIsLoading(false);
       }
-    } catch (err) {
-      console.error('Greška:', err);
-      setError('Greška pri dohvaćanju statusa Bitcoin mreže');
-      setIsLoading(false);
-    }
+    );
   }, []);
   
-  // Dohvaćamo podatke pri učitavanju komponente i svakih 10 sekundi
-  useEffect(() => {
-    fetchBitcoinStatus();
-    
-    const interval = setInterval(() => {
-      fetchBitcoinStatus();
-    }, 10000);
-    
-    return () => clearInterval(interval);
-  }, [fetchBitcoinStatus]);
-  
   // Funkcija za formatiranje fee rate
   const formatFeeRate = (fee: number) => {
     return `${fee.toFixed(2)} sat/vB`;
@@ -1,8 +1,8 @@
 "use client";
 
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect } from 'react';
 import { FaEthereum, FaGasPump, FaCubes, FaExchangeAlt } from 'react-icons/fa';
-import { getEthereumStatus } from '@/services/pythonDuneService';
+import { subscribeEthereumLive } from '@/services/pythonDuneService';
 
 export default function PythonEthereumStatusSimple() {
   const [latestBlock, setLatestBlock] = useState(0);
@@ -12,36 +12,24 @@ export default function PythonEthereumStatusSimple() {
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   
-  // Funkcija za dohvaćanje podataka o Ethereum mreži
-  const fetchEthereumStatus = useCallback(async () => {
-    try {
-      const data = await getEthereumStatus();
-      
-      if (data) {
+  // Stanje mreže stiže uživo (Server-Sent Events) čim se promijeni; veza se sama obnavlja
+  useEffect(() => {
+    return subscribeEthereumLive(
+      (data) => {
         setLatestBlock(data.last_block);
         setGasPrice(data.gas_price);
         setEthPrice(data.price);
         setTransactionCount(data.transactions_count);
+        setError(null);
+        setIsLoading(false);
+      },
+      () => {
+        setError('Greška pri dohvaćanju statusa Ethereum mreže');
         setIsLoading(false);
       }
-    } catch (err) {
-      console.error('Greška:', err);
-      setError('Greška pri dohvaćanju statusa Ethereum mreže');
-      setIsLoading(false);
-    }
+    );
   }, []);
   
-  // Dohvaćamo podatke pri učitavanju komponente i svakih 10 sekundi
-  useEffect(() => {
-    fetchEthereumStatus();
-    
-    const interval = setInterval(() => {
-      fetchEthereumStatus();
-    }, 10000);
-    
-    return () => clearInterval(interval);
-  }, [fetchEthereumStatus]);
-  
   // Funkcija za formatiranje cijene plina
   const formatGasPrice = (gasPrice: number) => {
     return `${gasPrice.toFixed(2)} Gwei`;
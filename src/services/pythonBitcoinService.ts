@@ -47,6 +47,10 @@ export interface BitcoinStatus {
   transactions_count: number;
   difficulty: number;
   hashrate: number;
+  stale?: boolean;
+  stale_parts?: string[];
+  stale_age?: number | null;
+  unavailable_parts?: string[];
 }
 
 export interface BitcoinPriceHistory {
@@ -119,11 +123,12 @@ export async function getBitcoinAddressTransactions(address: string, limit: numb
 }
 
 /**
- * Dohvaća zadnje Bitcoin blokove
+ * Dohvaća zadnje Bitcoin blokove (ili blokove ispod visine before)
  */
-export async function getBitcoinBlocks(limit: number = 5): Promise<BitcoinBlock[]> {
+export async function getBitcoinBlocks(limit: number = 5, before?: number): Promise<BitcoinBlock[]> {
   try {
-    const response = await fetch(`${PYTHON_API_BASE_URL}/blocks?limit=${limit}`);
+    const beforeParam = before !== undefined ? `&before=${before}` : '';
+    const response = await fetch(`${PYTHON_API_BASE_URL}/blocks?limit=${limit}${beforeParam}`);
     
     if (!response.ok) {
       throw new Error(`HTTP greška: ${response.status}`);
@@ -136,6 +141,28 @@ export async function getBitcoinBlocks(limit: number = 5): Promise<BitcoinBlock[
   }
 }
 
+/**
+ * Dohvaća Bitcoin blok prema visini ili hash-u
+ */
+export async function getBitcoinBlock(blockId: string | number): Promise<BitcoinBlock | null> {
+  try {
+    const response = await fetch(`${PYTHON_API_BASE_URL}/block/${blockId}`);
+    
+    if (!response.ok) {
+      if (response.status === 404) {
+        console.error('Bitcoin blok nije pronađen');
+        return null;
+      }
+      throw new Error(`HTTP greška: ${response.status}`);
+    }
+    
+    return await response.json();
+  } catch (error) {
+    console.error('Greška pri dohvaćanju Bitcoin bloka:', error);
+    return null;
+  }
+}
+
 /**
  * Dohvaća informacije o Bitcoin adresi
  */
@@ -193,3 +220,27 @@ export async function getBitcoinTransaction(txid: string): Promise<BitcoinTransa
     return null;
   }
 }
+
+/**
+ * Pretplata na stanje mreže, cijenu i nove blokove uživo (Server-Sent Events)
+ * umjesto periodičkog dohvaćanja; vraća funkciju za odjavu
+ */
+export function subscribeBitcoinLive(
+  onStatus: (status: BitcoinStatus) => void,
+  onBlocks?: (blocks: BitcoinBlock[]) => void,
+  onError?: () => void
+): () => void {
+  const source = new EventSource(`${PYTHON_API_BASE_URL.replace(/\/bitcoin$/, '')}/stream/bitcoin`);
+
+  source.addEventListener('status', (event) => onStatus(JSON.parse((event as MessageEvent).data)));
+  if (onBlocks) {
+    source.addEventListener('blocks', (event) => onBlocks(JSON.parse((event as MessageEvent).data)));
+  }
+  // EventSource se sam ponovno spaja nakon prekida veze
+  source.onerror = () => {
+    console.error('Prekinuta veza s Bitcoin kanalom uživo, ponovno spajanje...');
+    onError?.();
+  };
+
+  return () => source.close();
+}
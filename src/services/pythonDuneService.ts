@@ -27,6 +27,10 @@ export interface EthereumStatus {
   last_block: number;
   gas_price: number;
   transactions_count: number;
+  stale?: boolean;
+  stale_parts?: string[];
+  stale_age?: number | null;
+  unavailable_parts?: string[];
 }
 
 // Bazni URL za Python API
@@ -90,3 +94,20 @@ export async function getEthereumStatus(): Promise<EthereumStatus> {
     };
   }
 }
+
+/**
+ * Pretplata na stanje Ethereum mreže i cijenu uživo (Server-Sent Events)
+ * umjesto periodičkog dohvaćanja; vraća funkciju za odjavu
+ */
+export function subscribeEthereumLive(onStatus: (status: EthereumStatus) => void, onError?: () => void): () => void {
+  const source = new EventSource(`${PYTHON_API_BASE_URL}/stream/ethereum`);
+
+  source.addEventListener('status', (event) => onStatus(JSON.parse((event as MessageEvent).data)));
+  // EventSource se sam ponovno spaja nakon prekida veze
+  source.onerror = () => {
+    console.error('Prekinuta veza s Ethereum kanalom uživo, ponovno spajanje...');
+    onError?.();
+  };
+
+  return () => source.close();
+}